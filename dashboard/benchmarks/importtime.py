@@ -0,0 +1,103 @@
+"""대시보드 시작 시 import 시간 프로파일
+
+main.py가 첫 화면 전에 import하는 모듈(STARTUP_MODULES)을 새 인터프리터에서
+`python -X importtime`으로 불러와 모듈별 self / cumulative 시간을 집계한다.
+    - 전체 시간이 STARTUP_BUDGET_SECONDS를 넘거나
+    - 시작 시 불러오면 안 되는 무거운 패키지(DEFERRED_PACKAGES)가 import되면
+예산 위반으로 표시한다. (streamlit 자체 import 시간은 제외)
+
+사용법 (dashboard/ 에서):
+    python -m benchmarks.importtime [--top 20] [--budget 2.0]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+DASHBOARD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_MODULES = (
+    'utils.dataloader',
+    'utils.decimate',
+    'utils.figcache',
+    'utils.metrics',
+    'utils.perf',
+)
+# 뷰/원격 접근이 실제로 필요할 때까지 미뤄야 하는 패키지
+DEFERRED_PACKAGES = ('plotly', 'boto3', 'botocore', 'scipy', 'sklearn', 'tabs')
+STARTUP_BUDGET_SECONDS = 2.0
+
+
+def parse_importtime(stderr):
+    """`import time: self [us] | cumulative | name` 줄 → [{module, self_s, cumulative_s, depth}]"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        entries.append({
+            'module': name.strip(),
+            'self_s': int(self_us) / 1e6,
+            'cumulative_s': int(cumulative_us) / 1e6,
+            # 들여쓰기 2칸 = 한 단계 아래 (다른 모듈이 불러온 모듈)
+            'depth': (len(name) - len(name.lstrip())) // 2,
+        })
+    return entries
+
+
+def profile(modules=STARTUP_MODULES, preload=('streamlit',)):
+    """새 인터프리터에서 modules import 프로파일 (preload 모듈은 먼저 불러와 집계에서 제외)"""
+    statements = [f'import {name}' for name in preload + tuple(modules)]
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', '; '.join(statements)],
+                            capture_output=True, text=True, cwd=DASHBOARD_DIR)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import 실패")
+
+    entries = parse_importtime(result.stderr)
+    # preload 모듈이 끌어온 하위 모듈은 그 모듈의 최상위 항목보다 앞에 기록됨 → 해당 구간 제외
+    last_preload = max((i for i, e in enumerate(entries) if e['depth'] == 0 and e['module'] in preload),
+                       default=-1)
+    return entries[last_preload + 1:]
+
+
+def summarize(entries, budget=STARTUP_BUDGET_SECONDS, deferred=DEFERRED_PACKAGES):
+    """{total_s, budget_s, over_budget, deferred_loaded, entries}"""
+    total = sum(e['cumulative_s'] for e in entries if e['depth'] == 0)
+    loaded = sorted({e['module'] for e in entries
+                     if e['module'].split('.', 1)[0] in deferred})
+    return {
+        'total_s': total,
+        'budget_s': budget,
+        'over_budget': total > budget,
+        'deferred_loaded': loaded,
+        'entries': entries,
+    }
+
+
+def report(summary, top=20):
+    """self 시간 기준 상위 top개 모듈 표 문자열"""
+    lines = [f"{'self ms':>9} {'cumul ms':>9}  module"]
+    for e in sorted(summary['entries'], key=lambda e: e['self_s'], reverse=True)[:top]:
+        lines.append(f"{e['self_s'] * 1000:9.1f} {e['cumulative_s'] * 1000:9.1f}  {'  ' * e['depth']}{e['module']}")
+    lines.append(f"\n시작 import 합계 {summary['total_s'] * 1000:.1f} ms (예산 {summary['budget_s'] * 1000:.0f} ms)")
+    if summary['over_budget']:
+        lines.append("⚠️ 시작 예산 초과")
+    if summary['deferred_loaded']:
+        lines.append("⚠️ 시작 시 불러오면 안 되는 모듈: " + ", ".join(summary['deferred_loaded']))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 시작 import 시간 프로파일")
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET_SECONDS)
+    args = parser.parse_args()
+
+    summary = summarize(profile(), args.budget)
+    print(report(summary, args.top))
+    if summary['over_budget'] or summary['deferred_loaded']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+"""대시보드 로더/탭 렌더링 벤치마크
+
+합성 데이터셋(benchmarks.synthetic)으로 각 load_* 함수와 각 탭 render를
+Streamlit bare 모드(streamlit run 없이 직접 호출)에서 측정한다.
+    cold_s : 아티팩트/figure 캐시를 비운 뒤 실행 시간 (repeat회 중 최소)
+    warm_s : 캐시가 채워진 상태의 실행 시간 (repeat회 중 최소)
+    peak_mb: cold 실행 한 번의 tracemalloc 최대 메모리
+시작 import 시간(benchmarks.importtime)도 크기와 무관하게 한 번 측정해 예산과 비교한다 (size 0).
+결과는 JSONL 이력에 추가되고, 직전 실행과 비교해 회귀를 표시한다.
+
+사용법 (dashboard/ 에서):
+    python -m benchmarks.run [--sizes 170 10000] [--data-dir DIR] [--repeat 3] [--only startup] [--fail-on-regression]
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import uuid
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_DIR = os.path.join(BENCH_DIR, 'data')
+DEFAULT_HISTORY = os.path.join(BENCH_DIR, 'results.jsonl')
+# 직전 실행 대비 이 비율 이상 느려지면 회귀로 표시
+REGRESSION_TOLERANCE = 0.20
+# 이보다 짧은 측정은 잡음이 커서 회귀 판정에서 제외 (초)
+MIN_COMPARABLE_SECONDS = 0.005
+
+MODEL_TYPE = "LOF"
+PREPROCESSING = "LOWESS"
+
+
+def _loader_cases(battery_id):
+    from utils import dataloader as dl
+
+    return [
+        ('load_discharge_summary', lambda: dl.load_discharge_summary(battery_id)),
+        ('load_feature_importance', lambda: dl.load_feature_importance(battery_id, PREPROCESSING)),
+        ('load_anomaly_results', lambda: dl.load_anomaly_results(battery_id, "Anomaly Transformer", PREPROCESSING)),
+        ('load_shap_data', lambda: dl.load_shap_data(battery_id, PREPROCESSING)),
+        ('load_shap_importance', lambda: dl.load_shap_importance(battery_id, PREPROCESSING)),
+        ('load_lof_cycle_summary', lambda: dl.load_lof_cycle_summary(battery_id, PREPROCESSING)),
+        ('load_hi_analysis', lambda: dl.load_hi_analysis(battery_id, PREPROCESSING)),
+        ('load_correlation_data', lambda: dl.load_correlation_data(battery_id, MODEL_TYPE, PREPROCESSING)),
+    ]
+
+
+def _render_cases(battery_id):
+    from tabs import tab1, tab2, tab3, tab4, tab5
+    from utils.metrics import get_metrics
+
+    return [
+        ('header_metrics', lambda: get_metrics(MODEL_TYPE, PREPROCESSING, battery_id)),
+        ('tab1.render', lambda: tab1.render(battery_id)),
+        ('tab2.render[LOF]', lambda: tab2.render(battery_id, "LOF", PREPROCESSING)),
+        ('tab2.render[AT]', lambda: tab2.render(battery_id, "Anomaly Transformer", PREPROCESSING)),
+        ('tab3.render', lambda: tab3.render(battery_id, MODEL_TYPE, PREPROCESSING)),
+        ('tab4.render', lambda: tab4.render(battery_id, MODEL_TYPE, PREPROCESSING)),
+        ('tab5.render', lambda: tab5.render(battery_id, MODEL_TYPE, PREPROCESSING)),
+    ]
+
+
+def _clear_caches():
+    from utils.cache import clear_cache
+    from utils.figcache import figure_cache
+
+    clear_cache()
+    figure_cache.clear()
+
+
+def measure(func, repeat):
+    """(cold 최소 시간, warm 최소 시간, cold peak MB)"""
+    cold, warm = [], []
+    for _ in range(repeat):
+        _clear_caches()
+        started = time.perf_counter()
+        func()
+        cold.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        func()
+        warm.append(time.perf_counter() - started)
+
+    _clear_caches()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(cold), min(warm), peak / 1024 ** 2
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=BENCH_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def previous_results(history):
+    """마지막 실행의 (size, name) → 기록"""
+    if not history:
+        return {}
+    last_run = history[-1]['run_id']
+    return {(r['size'], r['name']): r for r in history if r['run_id'] == last_run}
+
+
+def compare(record, previous, tolerance=REGRESSION_TOLERANCE):
+    """직전 실행 대비 cold 시간 비율과 회귀 여부"""
+    prev = previous.get((record['size'], record['name']))
+    if prev is None or prev['cold_s'] <= 0:
+        return None, False
+    ratio = record['cold_s'] / prev['cold_s']
+    comparable = max(record['cold_s'], prev['cold_s']) >= MIN_COMPARABLE_SECONDS
+    return ratio, comparable and ratio > 1 + tolerance
+
+
+def _startup_record(meta, previous, tolerance):
+    """시작 import 프로파일 기록 (예산 초과나 지연 대상 모듈 import도 회귀로 취급)"""
+    from benchmarks.importtime import profile, summarize
+
+    summary = summarize(profile())
+    record = dict(meta, size=0, kind='startup', name='startup_import',
+                  cold_s=round(summary['total_s'], 6), warm_s=None, peak_mb=None,
+                  budget_s=summary['budget_s'], deferred_loaded=summary['deferred_loaded'])
+    ratio, regressed = compare(record, previous, tolerance)
+    regressed = regressed or summary['over_budget'] or bool(summary['deferred_loaded'])
+
+    change = f"{(ratio - 1) * 100:+6.1f}%" if ratio is not None else "   new"
+    flag = "  ⚠️ BUDGET" if summary['over_budget'] or summary['deferred_loaded'] else ""
+    flag += "  ⚠️ REGRESSION" if ratio is not None and ratio > 1 + tolerance else ""
+    print(f"{'startup':>9} {'import':<26} cold {summary['total_s'] * 1000:9.1f} ms  "
+          f"budget {summary['budget_s'] * 1000:6.0f} ms  {change}{flag}")
+    if summary['deferred_loaded']:
+        print("          시작 시 import됨: " + ", ".join(summary['deferred_loaded']))
+    return record, regressed
+
+
+def run(sizes, data_dir, repeat, history_path, tolerance, kinds=('startup', 'load', 'render')):
+    """벤치마크 실행 후 (기록 목록, 회귀 기록 목록) 반환"""
+    from benchmarks.synthetic import battery_name, generate_dataset
+    from utils.dataloader import DATASET_DIR_ENV
+
+    os.environ[DATASET_DIR_ENV] = data_dir
+    # bare 모드 경고 ("missing ScriptRunContext") 숨김
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    previous = previous_results(load_history(history_path))
+    run_id = uuid.uuid4().hex[:12]
+    meta = {
+        'run_id': run_id,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+    }
+
+    records, regressions = [], []
+    os.makedirs(os.path.dirname(os.path.abspath(history_path)), exist_ok=True)
+    with open(history_path, 'a') as history:
+        if 'startup' in kinds:
+            record, regressed = _startup_record(meta, previous, tolerance)
+            history.write(json.dumps(record) + '\n')
+            records.append(record)
+            if regressed:
+                regressions.append(record)
+
+        for size in sizes:
+            if not {'load', 'render'} & set(kinds):
+                break
+            battery_id = battery_name(size)
+            if not os.path.exists(os.path.join(data_dir, f'discharge_summary_{battery_id}.csv')):
+                print(f"합성 데이터 생성: {battery_id} ({size:,} cycles)")
+                generate_dataset(data_dir, size)
+
+            cases = []
+            if 'load' in kinds:
+                cases += [('load', name, func) for name, func in _loader_cases(battery_id)]
+            if 'render' in kinds:
+                cases += [('render', name, func) for name, func in _render_cases(battery_id)]
+
+            for kind, name, func in cases:
+                cold, warm, peak = measure(func, repeat)
+                record = dict(meta, size=size, kind=kind, name=name,
+                              cold_s=round(cold, 6), warm_s=round(warm, 6), peak_mb=round(peak, 3))
+                ratio, regressed = compare(record, previous, tolerance)
+                history.write(json.dumps(record) + '\n')
+                records.append(record)
+                if regressed:
+                    regressions.append(record)
+
+                change = f"{(ratio - 1) * 100:+6.1f}%" if ratio is not None else "   new"
+                flag = "  ⚠️ REGRESSION" if regressed else ""
+                print(f"{size:>9,} {name:<26} cold {cold * 1000:9.1f} ms  warm {warm * 1000:8.2f} ms  "
+                      f"peak {peak:8.1f} MB  {change}{flag}")
+    return records, regressions
+
+
+def main():
+    from benchmarks.synthetic import DEFAULT_SIZES
+
+    parser = argparse.ArgumentParser(description="대시보드 로더/렌더링 벤치마크")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help="합성 데이터셋 경로 (없으면 생성)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', choices=['startup', 'load', 'render'], help="시작 import, 로더, 렌더링 중 하나만 측정")
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help="결과 이력 JSONL")
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    kinds = (args.only,) if args.only else ('startup', 'load', 'render')
+    _, regressions = run(args.sizes, os.path.abspath(args.data_dir), args.repeat,
+                         args.history, args.tolerance, kinds)
+    print(f"\n결과 이력: {args.history}")
+    if regressions:
+        print(f"⚠️ {len(regressions)}개 항목이 직전 실행보다 {args.tolerance:.0%} 이상 느려졌거나 시작 예산을 넘었습니다.")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
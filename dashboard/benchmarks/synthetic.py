@@ -0,0 +1,161 @@
+"""NASA 배터리 아티팩트와 같은 스키마의 합성 데이터셋 생성기
+
+대시보드가 읽는 모든 아티팩트(방전 요약, LOF 사이클 요약 + 메타데이터, HI 분석,
+상관 CSV, SHAP npy, Anomaly Transformer 결과 pickle)를 지정한 사이클 수로 만든다.
+
+사용법 (dashboard/ 에서):
+    python -m benchmarks.synthetic OUT_DIR --cycles 170 10000 100000 1000000
+"""
+import argparse
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from utils.lof_engine import FEATURES
+
+# 벤치마크 기본 크기 (NASA B0005 = 168 사이클)
+DEFAULT_SIZES = (170, 10_000, 100_000, 1_000_000)
+# SHAP 설명 샘플 수 상한 (사이클 수와 같되 이 값을 넘지 않음)
+MAX_EXPLAIN_ROWS = 100_000
+SPLIT_FRACTIONS = (0.6, 0.8)
+PREPROCESSINGS = ("", "_lowess")
+
+
+def battery_name(n_cycles):
+    return f"SYN{n_cycles}"
+
+
+def _write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def _capacity(rng, n):
+    """완만한 열화 + 노이즈 + 간헐적 회복이 있는 용량 곡선"""
+    t = np.linspace(0.0, 1.0, n)
+    capacity = 1.86 - 0.45 * t - 0.15 * t ** 3 + rng.normal(0.0, 0.004, n)
+    recovery = rng.random(n) < 0.02
+    capacity[recovery] += rng.uniform(0.01, 0.04, recovery.sum())
+    return capacity
+
+
+def _split(n):
+    val_start, test_start = (int(n * f) for f in SPLIT_FRACTIONS)
+    split = np.full(n, 'train', dtype=object)
+    split[val_start:test_start] = 'val'
+    split[test_start:] = 'test'
+    return split, val_start, test_start
+
+
+def generate_dataset(out_dir, n_cycles, seed=0):
+    """out_dir에 battery_name(n_cycles) 배터리 하나의 전체 아티팩트 생성, 배터리 ID 반환"""
+    rng = np.random.default_rng(seed)
+    battery_id = battery_name(n_cycles)
+    for sub in ('tab2', 'tab3', 'tab4', 'tab5'):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+
+    cycles = np.arange(1, n_cycles + 1, dtype=np.int64)
+    capacity = _capacity(rng, n_cycles)
+    r_ohmic = 0.055 + 0.03 * (1.86 - capacity) + rng.normal(0.0, 0.0008, n_cycles)
+    split, val_start, test_start = _split(n_cycles)
+
+    # 방전 요약
+    pd.DataFrame({
+        'cycle_idx': cycles,
+        'capacity': capacity,
+        'dis_volt_min': 2.7 - 0.2 * (1.86 - capacity) + rng.normal(0.0, 0.01, n_cycles),
+        'dis_temp_max': 38.0 + 4.0 * (1.86 - capacity) + rng.normal(0.0, 0.3, n_cycles),
+        'dis_time': 3600.0 * capacity / 1.86 + rng.normal(0.0, 20.0, n_cycles),
+    }).to_csv(os.path.join(out_dir, f'discharge_summary_{battery_id}.csv'), index=False)
+
+    for suffix in PREPROCESSINGS:
+        # 열화가 진행될수록 커지는 이상 점수
+        degradation = (1.86 - capacity) / 0.6
+        lof_score = 1.0 + 0.4 * degradation + np.abs(rng.normal(0.0, 0.08, n_cycles))
+        at_score = 0.2 * degradation + np.abs(rng.normal(0.0, 0.05, n_cycles))
+        lof_threshold = float(np.quantile(lof_score[:val_start], 0.99))
+        at_threshold = float(np.quantile(at_score, 0.99))
+
+        # tab2: LOF 사이클 요약 + 메타데이터, Anomaly Transformer 결과 pickle
+        pd.DataFrame({
+            'cycle_idx': cycles,
+            'mean_score': lof_score,
+            'split': split,
+            'has_anom': lof_score > lof_threshold,
+        }).to_csv(os.path.join(out_dir, 'tab2', f'lof_{battery_id}_cycle_summary{suffix}.csv'), index=False)
+        _write_json(os.path.join(out_dir, 'tab2', f'lof_{battery_id}_metadata{suffix}.json'),
+                    {'threshold': lof_threshold})
+        with open(os.path.join(out_dir, 'tab2', f'test_results_{battery_id}{suffix}.pkl'), 'wb') as f:
+            pickle.dump({'cycle_scores': dict(zip(cycles.tolist(), at_score.tolist())),
+                         'threshold': at_threshold}, f)
+
+        # tab3: 피처 중요도, SHAP 값, 설명 샘플
+        n_explain = min(n_cycles, MAX_EXPLAIN_ROWS)
+        X_explain = rng.normal(0.0, 1.0, (n_explain, len(FEATURES)))
+        weights = np.linspace(1.0, 0.1, len(FEATURES))
+        shap_values = X_explain * weights * 0.05 + rng.normal(0.0, 0.005, X_explain.shape)
+        np.save(os.path.join(out_dir, 'tab3', f'shap_values_{battery_id}{suffix}.npy'), shap_values)
+        pd.DataFrame(X_explain, columns=FEATURES).to_csv(
+            os.path.join(out_dir, 'tab3', f'X_test_explain_{battery_id}{suffix}.csv'), index=False)
+        importance = np.abs(shap_values).mean(axis=0)
+        order = np.argsort(-importance)
+        pd.DataFrame({'feature': np.array(FEATURES)[order], 'importance': importance[order]}).to_csv(
+            os.path.join(out_dir, 'tab3', f'lof_{battery_id}_feature_importance{suffix}.csv'), index=False)
+
+        # tab4: HI 분석 (val/test 구간) + 메타데이터
+        hi_ema = pd.Series(capacity).ewm(span=10).mean().to_numpy()
+        slope_std = pd.Series(np.diff(hi_ema, prepend=hi_ema[0])).rolling(5).std().to_numpy()
+        std_ma = pd.Series(slope_std).rolling(5).mean().to_numpy()
+        stable_threshold = float(np.nanmean(slope_std[val_start:test_start]) + 3 * np.nanstd(slope_std[val_start:test_start]))
+        above = np.flatnonzero(std_ma[test_start:] > stable_threshold)
+        pd.DataFrame({
+            'cycle_idx': cycles[val_start:],
+            'HI_ema': hi_ema[val_start:],
+            'HI_abs_change': np.abs(hi_ema - hi_ema[0])[val_start:],
+            'HI_slope_rollstd': slope_std[val_start:],
+            'HI_std_ma': std_ma[val_start:],
+        }).to_csv(os.path.join(out_dir, 'tab4', f'{battery_id}_hi_analysis{suffix}.csv'), index=False)
+        _write_json(os.path.join(out_dir, 'tab4', f'{battery_id}_hi_metadata{suffix}.json'), {
+            'val_start': int(cycles[val_start]),
+            'test_start': int(cycles[test_start]),
+            'stable_threshold': stable_threshold,
+            'early_hi_mean': float(np.nanmean(slope_std[val_start:test_start])),
+            'late_hi_mean': float(np.nanmean(slope_std[test_start:])),
+            'first_event': int(cycles[test_start + above[0]]) if len(above) else None,
+        })
+
+        # tab5: 모델별 상관 분석 데이터 + 메타데이터
+        for model_name, score in (('lof', lof_score), ('at', at_score)):
+            pd.DataFrame({
+                'cycle_idx': cycles,
+                'mean_score': score,
+                'Capacity': capacity,
+                'R_ohmic': r_ohmic,
+            }).to_csv(os.path.join(out_dir, 'tab5', f'{battery_id}_correlation_{model_name}{suffix}.csv'), index=False)
+            _write_json(os.path.join(out_dir, 'tab5', f'{battery_id}_correlation_metadata_{model_name}{suffix}.json'), {
+                'pearson_cap': float(np.corrcoef(score, capacity)[0, 1]),
+                'p_p_cap': 0.0,
+                'pearson_rohm': float(np.corrcoef(score, r_ohmic)[0, 1]),
+                'p_p_rohm': 0.0,
+            })
+
+    return battery_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 배터리 데이터셋 생성")
+    parser.add_argument('out_dir')
+    parser.add_argument('--cycles', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for n_cycles in args.cycles:
+        battery_id = generate_dataset(args.out_dir, n_cycles, args.seed)
+        print(f"{battery_id}: {n_cycles:,} cycles → {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
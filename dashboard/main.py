@@ -1,5 +1,6 @@
 # main.py
 import streamlit as st
+import importlib
 import sys
 import os
 
@@ -8,11 +9,12 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 if BASE_DIR not in sys.path:
     sys.path.insert(0, BASE_DIR)
 
-from tabs import tab1 as tab1_module
-from tabs import tab2 as tab2_module
-from tabs import tab3 as tab3_module
-from tabs import tab4 as tab4_module
-from tabs import tab5 as tab5_module
+from utils.cache import cache_stats, resident_bytes
+from utils.dataloader import discover_batteries, prefetch_in_background
+from utils.decimate import DEFAULT_POINT_BUDGET
+from utils.figcache import figure_cache_stats
+from utils.metrics import get_metrics
+from utils.perf import begin_run, current_run, jsonl_text, prometheus_text, span, stage_stats
 
 # Page config
 st.set_page_config(
@@ -21,13 +23,17 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# 이번 rerun의 단계별 시간/bytes/행 수 기록 시작
+begin_run()
+
 # Sidebar
 with st.sidebar:
     st.title("⚡ Battery Anomaly Detection")
     
     battery_id = st.selectbox(
         "Select Battery",
-        ["B0005", "B0006", "B0007"]
+        discover_batteries(),
+        key="battery_id"
     )
     
     st.markdown("---")
@@ -47,152 +53,41 @@ with st.sidebar:
     
     st.markdown("---")
     
+    with st.expander("⚙️ Chart Settings"):
+        point_budget = st.number_input(
+            "Max points per series",
+            min_value=500, max_value=200000,
+            value=DEFAULT_POINT_BUDGET, step=500,
+            help="이 값을 넘는 시리즈는 LTTB로 줄여서 표시합니다."
+        )
+        fig_stats = figure_cache_stats()
+        st.caption(
+            f"Figure cache: {fig_stats['hits']} hits / {fig_stats['misses']} misses · "
+            f"{fig_stats['saved_seconds']:.2f}s render time saved"
+        )
+    
+    live_mode = st.toggle(
+        "🔴 Live tail",
+        help="Overview / Anomaly Scores 그래프를 주기적으로 갱신하며 새로 추가된 사이클만 읽습니다."
+    )
+    
+    st.markdown("---")
+    
     if st.button("🔄 Refresh Analysis", use_container_width=True):
         st.rerun()
+    
+    # 화면 렌더링이 끝난 뒤 채움 (이번 rerun 기록 포함)
+    perf_panel = st.container()
 
 # Main title
 st.title("🔋 Battery Health Monitoring Dashboard")
 st.markdown(f"**Dataset:** NASA PCoE Battery Dataset - {battery_id}")
 
-def get_metrics(model_type, preprocessing, battery_id):
-    """모델/전처리에 따른 메트릭 반환"""
-    
-    if model_type == "Anomaly Transformer" and preprocessing == "LOWESS" and battery_id == "B0005":
-        return {
-            'capacity_corr': "-0.747",
-            'rohmic_corr': "+0.641",
-            'anomaly_cycle': "Cycle 485",
-            'capacity_delta': "-22.9% vs baseline",
-            'rohmic_delta': "-32.7% vs baseline",
-            'p_value': "< 0.01",
-            'confidence': 'High Confidence'
-        }
-    elif model_type == "Anomaly Transformer" and preprocessing == "Raw Data" and battery_id == "B0005":
-        return {
-            'capacity_corr': "-0.423",
-            'rohmic_corr': "+0.312",
-            'anomaly_cycle': "Cycle 485",
-            'capacity_delta': "-49.9% vs baseline",
-            'rohmic_delta': "-62.9% vs baseline",
-            'p_value': "> 0.05",
-            'confidence': 'Low Confidence'
-        }
-    elif model_type == "LOF" and preprocessing == "LOWESS" and battery_id == "B0005":
-        return {
-            'capacity_corr': "-0.973",
-            'rohmic_corr': "+0.952",
-            'anomaly_cycle': "Cycle 437",
-            'capacity_delta': "baseline",
-            'rohmic_delta': "baseline",
-            'p_value': "< 0.01",
-            'confidence': 'High Confidence'
-        }
-    elif model_type == "LOF" and preprocessing == "Raw Data" and battery_id == "B0005":
-        return {
-            'capacity_corr': "-0.845",
-            'rohmic_corr': "+0.844",
-            'anomaly_cycle': "Cycle 589",
-            'capacity_delta': "baseline",
-            'rohmic_delta': "baseline",
-            'p_value': "< 0.01",
-            'confidence': 'High Confidence'
-        }
-    elif model_type == "Anomaly Transformer" and preprocessing == "LOWESS" and battery_id == "B0006":
-        return {
-            'capacity_corr': "-0.536",
-            'rohmic_corr': "+0.331",
-            'anomaly_cycle': "Cycle 485",
-            'capacity_delta': "% vs baseline",
-            'rohmic_delta': "% vs baseline",
-            'p_value': "< 0.01",
-            'confidence': 'High Confidence'
-        }
-    elif model_type == "Anomaly Transformer" and preprocessing == "Raw Data" and battery_id == "B0006":
-        return {
-            'capacity_corr': "-0.643",
-            'rohmic_corr': "+0.741",
-            'anomaly_cycle': "Cycle 485",
-            'capacity_delta': "% vs baseline",
-            'rohmic_delta': "% vs baseline",
-            'p_value': "> 0.05",
-            'confidence': 'Low Confidence'
-        }
-    elif model_type == "LOF" and preprocessing == "LOWESS" and battery_id == "B0006":
-        return {
-            'capacity_corr': "-0.912",
-            'rohmic_corr': "+0.854",
-            'anomaly_cycle': "Cycle 437",
-            'capacity_delta': "baseline",
-            'rohmic_delta': "baseline",
-            'p_value': "< 0.01",
-            'confidence': 'High Confidence'
-        }
-    elif model_type == "LOF" and preprocessing == "Raw Data" and battery_id == "B0006":
-        return {
-            'capacity_corr': "-0.789",
-            'rohmic_corr': "+0.712",
-            'anomaly_cycle': "Cycle 589",
-            'capacity_delta': "baseline",
-            'rohmic_delta': "baseline",
-            'p_value': "< 0.05",
-            'confidence': 'Medium Confidence'
-        }
-    elif model_type == "Anomaly Transformer" and preprocessing == "LOWESS" and battery_id == "B0007":
-        return {
-            'capacity_corr': "-0.738",
-            'rohmic_corr': "+0.674",
-            'anomaly_cycle': "Cycle 485",
-            'capacity_delta': "% vs baseline",
-            'rohmic_delta': "% vs baseline",
-            'p_value': "< 0.01",
-            'confidence': 'High Confidence'
-        }
-    elif model_type == "Anomaly Transformer" and preprocessing == "Raw Data" and battery_id == "B0007":
-        return {
-            'capacity_corr': "+0.220",
-            'rohmic_corr': "-0.01",
-            'anomaly_cycle': "Cycle 485",
-            'capacity_delta': "% vs baseline",
-            'rohmic_delta': "% vs baseline",
-            'p_value': "> 0.05",
-            'confidence': 'Low Confidence'
-        }
-    elif model_type == "LOF" and preprocessing == "LOWESS" and battery_id == "B0007":
-        return {
-            'capacity_corr': "-0.887",
-            'rohmic_corr': "+0.799",
-            'anomaly_cycle': "Cycle 437",
-            'capacity_delta': "baseline",
-            'rohmic_delta': "baseline",
-            'p_value': "< 0.01",
-            'confidence': 'High Confidence'
-        }
-    elif model_type == "LOF" and preprocessing == "Raw Data" and battery_id == "B0007":
-        return {
-            'capacity_corr': "-0.765",
-            'rohmic_corr': "+0.689",
-            'anomaly_cycle': "Cycle 589",
-            'capacity_delta': "baseline",
-            'rohmic_delta': "baseline",
-            'p_value': "< 0.05",
-            'confidence': 'Medium Confidence'
-        }
-    else:
-        # 기본값 반환
-        return {
-            'capacity_corr': "N/A",
-            'rohmic_corr': "N/A",
-            'anomaly_cycle': "N/A",
-            'capacity_delta': "No data",
-            'rohmic_delta': "No data",
-            'p_value': "N/A",
-            'confidence': 'No data'
-        }
-
 # Metrics row
 col1, col2, col3, col4 = st.columns(4)
 
-metrics = get_metrics(model_type, preprocessing, battery_id)
+with span("header.metrics"):
+    metrics = get_metrics(model_type, preprocessing, battery_id)
 
 with col1:
     st.metric(
@@ -225,20 +120,64 @@ with col4:
 st.markdown("---")
 
 # Main visualization area
-overview_tab, anomaly_tab, feature_tab, health_tab, corr_tab = st.tabs(["📊 Overview", "🎯 Anomaly Scores", "🧩 Feature Importance", "💚 Health Indicator", "🔬 Correlation Analysis"])
-
-
-with overview_tab:
-    tab1_module.render(battery_id)
-
-with anomaly_tab:
-    tab2_module.render(battery_id, model_type, preprocessing)
-
-with feature_tab:
-    tab3_module.render(battery_id, model_type, preprocessing)
-
-with health_tab:
-    tab4_module.render(battery_id, model_type, preprocessing)
+# 선택된 뷰의 render만 실행 (다른 뷰의 데이터 로드/figure 생성은 건너뜀)
+# 탭 모듈(plotly 등)은 뷰가 처음 선택될 때 import → 첫 화면 시작 시간 단축
+def tab(name):
+    return importlib.import_module(f"tabs.{name}")
+
+VIEWS = {
+    "📊 Overview": lambda: tab("tab1").render(battery_id, point_budget, live_mode),
+    "🎯 Anomaly Scores": lambda: tab("tab2").render(battery_id, model_type, preprocessing, point_budget, live_mode),
+    "🧩 Feature Importance": lambda: tab("tab3").render(battery_id, model_type, preprocessing),
+    "💚 Health Indicator": lambda: tab("tab4").render(battery_id, model_type, preprocessing, point_budget),
+    "🔬 Correlation Analysis": lambda: tab("tab5").render(battery_id, model_type, preprocessing, point_budget),
+    "🗂️ Fleet Overview": lambda: tab("tab6").render(model_type, preprocessing, "📊 Overview"),
+}
+
+active_view = st.radio(
+    "View",
+    list(VIEWS),
+    horizontal=True,
+    key="active_view",
+    label_visibility="collapsed"
+)
 
-with corr_tab:
-    tab5_module.render(battery_id, model_type, preprocessing)
\ No newline at end of file
+# 단계 이름은 아이콘을 뺀 뷰 이름 (예: render.Overview)
+with span(f"render.{active_view.split(' ', 1)[-1]}"):
+    VIEWS[active_view]()
+
+# 다른 뷰로 전환할 때 바로 보이도록 나머지 아티팩트는 백그라운드에서 미리 받아둠 (lazy 모드)
+prefetch_in_background(battery_id, model_type, preprocessing)
+
+# Performance 패널 (이번 rerun + 최근 p50/p95)
+with perf_panel:
+    with st.expander("⏱️ Performance"):
+        run = current_run()
+        st.caption(f"이번 rerun: {len(run)}개 단계")
+        st.dataframe(
+            [{'stage': e['stage'], 'ms': round(e['seconds'] * 1000, 1), 'bytes': e['bytes'],
+              'rows': e['rows'], 'cache': e.get('cache', '')} for e in run],
+            hide_index=True, use_container_width=True
+        )
+        st.caption("최근 기록 기준 단계별 p50 / p95 (ms)")
+        st.dataframe(
+            [{'stage': stage, 'count': s['count'], 'p50': round(s['p50'] * 1000, 1),
+              'p95': round(s['p95'] * 1000, 1)} for stage, s in stage_stats().items()],
+            hide_index=True, use_container_width=True
+        )
+        cache = cache_stats()
+        st.caption(
+            f"아티팩트 캐시 (프로세스 공유): {cache['bytes'] / 1024 ** 2:.1f} / "
+            f"{cache['max_bytes'] / 1024 ** 2:.0f} MB · {cache['hits']} hits / {cache['misses']} misses / "
+            f"{cache['waits']} waits"
+        )
+        st.dataframe(
+            [{'artifact': name, 'entries': r['entries'], 'MB': round(r['bytes'] / 1024 ** 2, 2),
+              'mapped MB': round(r['mapped_bytes'] / 1024 ** 2, 2)} for name, r in resident_bytes().items()],
+            hide_index=True, use_container_width=True
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("JSONL", jsonl_text(run), file_name="perf.jsonl", use_container_width=True)
+        with col2:
+            st.download_button("Prometheus", prometheus_text(), file_name="perf.prom", use_container_width=True)
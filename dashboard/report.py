@@ -0,0 +1,274 @@
+"""전체 배터리 × 모델 × 전처리 조합의 정적 HTML 리포트 (브라우저/Streamlit 서버 없이)
+
+각 탭의 build_* 함수(st.* 호출과 분리된 figure 생성)를 그대로 사용해
+배터리마다 HTML 파일 하나를 만든다. 배터리 단위로 프로세스 풀에 분산하며,
+plotly.js는 파일마다 한 번만 넣거나 (--plotlyjs inline, 기본)
+출력 폴더에 한 번 써 두고 모든 리포트가 공유한다 (--plotlyjs shared).
+
+입력 파일과 리포트 코드의 내용 해시가 직전 실행과 같으면 해당 배터리는 건너뛴다.
+(mtime/size 서명이 그대로면 해시 계산도 생략)
+
+사용법 (dashboard/ 에서):
+    python report.py OUT_DIR [--batteries B0005 B0006] [--workers 4] [--force]
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from utils.cache import file_signature
+from utils.dataloader import (
+    discover_batteries,
+    load_anomaly_results,
+    load_correlation_data,
+    load_discharge_summary,
+    load_feature_importance,
+    load_hi_analysis,
+    load_lof_cycle_summary,
+    load_shap_data,
+)
+from utils.decimate import DEFAULT_POINT_BUDGET
+
+MODEL_TYPES = ("Anomaly Transformer", "LOF")
+PREPROCESSINGS = ("LOWESS", "Raw Data")
+REPORT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+MANIFEST_NAME = ".report_manifest.json"
+PLOTLY_JS_NAME = "plotly.min.js"
+# 이 파일들이 바뀌면 입력이 같아도 리포트를 다시 만든다
+CODE_FILES = ('report.py', 'tabs/tab1.py', 'tabs/tab2.py', 'tabs/tab3.py', 'tabs/tab4.py', 'tabs/tab5.py')
+
+
+def input_paths(battery_id):
+    """배터리 리포트가 읽는 모든 아티팩트 경로 (중복 제거, 정렬)"""
+    paths = set(load_discharge_summary.paths(battery_id))
+    for preprocessing in PREPROCESSINGS:
+        paths |= set(load_lof_cycle_summary.paths(battery_id, preprocessing))
+        paths |= set(load_feature_importance.paths(battery_id, preprocessing))
+        paths |= set(load_shap_data.paths(battery_id, preprocessing))
+        paths |= set(load_hi_analysis.paths(battery_id, preprocessing))
+        for model_type in MODEL_TYPES:
+            paths |= set(load_anomaly_results.paths(battery_id, model_type, preprocessing))
+            paths |= set(load_correlation_data.paths(battery_id, model_type, preprocessing))
+    return sorted(str(p) for p in paths)
+
+
+def _signature(paths):
+    """경로별 (mtime, size) — 없는 파일은 None"""
+    return {path: (list(sig[0][1:]) if sig else None) for path, sig in ((p, file_signature([p])) for p in paths)}
+
+
+def content_hash(paths, options):
+    """입력 파일 내용 + 리포트 코드 + 옵션의 SHA-256"""
+    digest = hashlib.sha256(json.dumps(options, sort_keys=True).encode())
+    for path in list(paths) + [os.path.join(BASE_DIR, name) for name in CODE_FILES]:
+        digest.update(path.encode() + b'\0')
+        if not os.path.exists(path):
+            digest.update(b'<missing>')
+            continue
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_sections(battery_id, point_budget):
+    """(제목, figure 또는 None, 요약 dict 또는 오류 문자열) 목록 — 없는 아티팩트는 오류로 표시"""
+    from tabs import tab1, tab2, tab3, tab4, tab5
+
+    sections = []
+
+    def add(title, build):
+        try:
+            fig, summary = build()
+        except (FileNotFoundError, KeyError, ValueError) as e:
+            sections.append((title, None, f"{type(e).__name__}: {e}"))
+            return
+        sections.append((title, fig, summary))
+
+    add("Overview", lambda: (tab1.build_figure(battery_id, point_budget), {}))
+
+    for preprocessing in PREPROCESSINGS:
+        for model_type in MODEL_TYPES:
+            label = f"{model_type} · {preprocessing}"
+
+            def anomaly():
+                if model_type == "LOF":
+                    figures = tab2.build_lof_figures(battery_id, preprocessing, point_budget)
+                else:
+                    figures = tab2.build_transformer_figures(battery_id, model_type, preprocessing, point_budget)
+                top_5 = ", ".join(f"{int(c)} ({s:.4f})" for c, s in figures['top_5'])
+                return figures['fig'], {'Threshold': f"{figures['threshold']:.4f}", 'Top 5 cycles': top_5}
+
+            add(f"Anomaly Scores — {label}", anomaly)
+            add(f"Correlation Analysis — {label}",
+                lambda: (tab5.build_figure(battery_id, model_type, preprocessing, point_budget), {}))
+
+        # Feature Importance / HI는 LOF 모델 전용 (탭과 동일)
+        def importance():
+            feature_importance, _ = tab3.load_importance(battery_id, preprocessing)
+            features = feature_importance['feature'].tolist()
+            scores = feature_importance['importance'].tolist()
+            fig = tab3.build_importance_figure(features, scores, len(features))
+            return fig, {'Most Important': features[0], 'Importance Score': f"{scores[0]:.4f}"}
+
+        def swarm():
+            feature_importance, _ = tab3.load_importance(battery_id, preprocessing)
+            figures = tab3.build_swarm_figure(battery_id, preprocessing, feature_importance)
+            return figures['fig'], {'Points': f"{figures['shown']:,} / {figures['total']:,}"}
+
+        def health():
+            figures = tab4.build_figures(battery_id, preprocessing, point_budget)
+            return figures['fig'], {name: "N/A" if value is None else f"{value:.6f}"
+                                    for name, value in figures['summary'].items()}
+
+        add(f"Feature Importance — LOF · {preprocessing}", importance)
+        add(f"SHAP Value Analysis — LOF · {preprocessing}", swarm)
+        add(f"Health Indicator — LOF · {preprocessing}", health)
+
+    return sections
+
+
+def render_html(battery_id, sections, plotlyjs):
+    """섹션 목록을 HTML 문서로 (plotly.js는 문서당 한 번, shared면 외부 파일 참조)"""
+    import plotly.io as pio
+    from plotly.offline import get_plotlyjs
+
+    if plotlyjs == 'shared':
+        script = f'<script src="{PLOTLY_JS_NAME}"></script>'
+    else:
+        script = f'<script type="text/javascript">{get_plotlyjs()}</script>'
+
+    body = []
+    for i, (title, fig, summary) in enumerate(sections):
+        body.append(f'<section><h2>{html.escape(title)}</h2>')
+        if fig is None:
+            body.append(f'<p class="missing">⚠️ {html.escape(summary)}</p></section>')
+            continue
+        if summary:
+            rows = ''.join(f'<tr><th>{html.escape(str(k))}</th><td>{html.escape(str(v))}</td></tr>'
+                           for k, v in summary.items())
+            body.append(f'<table>{rows}</table>')
+        body.append(pio.to_html(fig, full_html=False, include_plotlyjs=False, div_id=f'fig{i}'))
+        body.append('</section>')
+
+    return (
+        '<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+        f'<title>{html.escape(battery_id)} Battery Report</title>{script}'
+        '<style>body{font-family:sans-serif;margin:2em}section{margin-bottom:3em}'
+        'th{text-align:left;padding-right:1em}.missing{color:#888}</style></head><body>'
+        f'<h1>{html.escape(battery_id)} Battery Report</h1>'
+        + ''.join(body) + '</body></html>\n'
+    )
+
+
+def render_battery(battery_id, out_dir, point_budget, plotlyjs, previous=None, force=False):
+    """배터리 하나의 리포트 생성 (입력이 그대로면 건너뜀), manifest 항목 반환"""
+    started = time.perf_counter()
+    out_path = os.path.join(out_dir, f'{battery_id}.html')
+    options = {'point_budget': point_budget, 'plotlyjs': plotlyjs}
+    paths = input_paths(battery_id)
+    signature = _signature(paths)
+    previous = previous or {}
+
+    if not force and os.path.exists(out_path) and previous.get('options') == options:
+        if previous.get('signature') == signature and previous.get('code') == content_hash([], options):
+            return dict(previous, status='unchanged', seconds=time.perf_counter() - started)
+        digest = content_hash(paths, options)
+        if previous.get('hash') == digest:
+            return dict(previous, signature=signature, status='unchanged',
+                        seconds=time.perf_counter() - started)
+
+    sections = build_sections(battery_id, point_budget)
+    document = render_html(battery_id, sections, plotlyjs)
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(document)
+    os.replace(tmp_path, out_path)
+
+    # 로딩 중 파일을 받아왔거나 Raw Data HI를 갱신했을 수 있으므로 빌드 후 해시
+    paths = input_paths(battery_id)
+    return {
+        'battery_id': battery_id,
+        'options': options,
+        'signature': _signature(paths),
+        'hash': content_hash(paths, options),
+        'code': content_hash([], options),
+        'sections': len(sections),
+        'missing': sum(fig is None for _, fig, _ in sections),
+        'bytes': len(document.encode('utf-8')),
+        'status': 'built',
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def build_reports(out_dir, batteries=None, point_budget=DEFAULT_POINT_BUDGET, plotlyjs='inline',
+                  max_workers=REPORT_MAX_WORKERS, force=False):
+    """배터리별 리포트를 프로세스 풀에서 생성, 배터리별 manifest 항목 목록 반환"""
+    os.makedirs(out_dir, exist_ok=True)
+    batteries = list(batteries or discover_batteries())
+    if not batteries:
+        return []
+    manifest = _load_manifest(out_dir)
+
+    if plotlyjs == 'shared':
+        from plotly.offline import get_plotlyjs
+
+        with open(os.path.join(out_dir, PLOTLY_JS_NAME), 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+
+    workers = max(1, min(max_workers, len(batteries)))
+    args = [(b, out_dir, point_budget, plotlyjs, manifest.get(b), force) for b in batteries]
+    if workers == 1:
+        results = [render_battery(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(render_battery, *zip(*args)))
+
+    manifest.update({r['battery_id']: {k: v for k, v in r.items() if k not in ('status', 'seconds')}
+                     for r in results})
+    tmp_path = os.path.join(out_dir, MANIFEST_NAME + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, os.path.join(out_dir, MANIFEST_NAME))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배터리별 정적 HTML 분석 리포트 생성")
+    parser.add_argument('out_dir')
+    parser.add_argument('--batteries', nargs='+', help="기본: dataset의 모든 배터리")
+    parser.add_argument('--point-budget', type=int, default=DEFAULT_POINT_BUDGET)
+    parser.add_argument('--plotlyjs', choices=['inline', 'shared'], default='inline',
+                        help="inline: 파일마다 한 번 포함 / shared: 출력 폴더의 plotly.min.js 공유")
+    parser.add_argument('--workers', type=int, default=REPORT_MAX_WORKERS)
+    parser.add_argument('--force', action='store_true', help="입력이 그대로여도 다시 생성")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = build_reports(args.out_dir, args.batteries, args.point_budget, args.plotlyjs,
+                            args.workers, args.force)
+    for r in results:
+        note = f"{r['sections']}개 섹션, {r['missing']}개 데이터 없음" if r['status'] == 'built' else "변경 없음"
+        print(f"{r['battery_id']:<12} {r['status']:<10} {r['seconds']:7.2f}s  {note}")
+    built = sum(r['status'] == 'built' for r in results)
+    print(f"{len(results)}개 배터리 ({built}개 생성) → {args.out_dir} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,21 @@
 import streamlit as st
-import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from utils.dataloader import load_discharge_summary
+from utils.decimate import DEFAULT_POINT_BUDGET, series_trace
+from utils.figcache import cached_figures
+from utils.perf import begin_run, plotly_chart
+from utils.tail import LIVE_REFRESH_SECONDS, tail_discharge_summary
 
+# 이 탭에서 사용하는 컬럼
+COLUMNS = ('cycle_idx', 'capacity', 'dis_volt_min', 'dis_temp_max', 'dis_time')
 
-def render(battery_id):
-    discharge_summary = load_discharge_summary(battery_id)
-    
-    st.subheader(f"{battery_id} Battery Overview")
-    
+def build_figure(battery_id, point_budget=DEFAULT_POINT_BUDGET):
+    """방전 요약 2x2 figure 생성"""
+    discharge_summary = load_discharge_summary(battery_id, columns=COLUMNS)
+    return build_figure_from(discharge_summary, point_budget)
+
+def build_figure_from(discharge_summary, point_budget=DEFAULT_POINT_BUDGET):
+    """로드된 방전 요약 DataFrame으로 2x2 figure 생성"""
     fig = make_subplots(
         rows=2, cols=2,
         subplot_titles=('Capacity', 'Min Voltage', 'Max Temp', 'Discharge Time'),
@@ -18,33 +25,33 @@ def render(battery_id):
     
     # 용량
     fig.add_trace(
-        go.Scatter(x=discharge_summary['cycle_idx'], y=discharge_summary['capacity'],
-                   mode='lines+markers', name='Capacity',
-                   line=dict(color='blue', width=2), marker=dict(size=4)),
+        series_trace(discharge_summary['cycle_idx'], discharge_summary['capacity'], point_budget,
+                     mode='lines+markers', name='Capacity',
+                     line=dict(color='blue', width=2), marker=dict(size=4)),
         row=1, col=1
     )
     
     # 방전 전압
     fig.add_trace(
-        go.Scatter(x=discharge_summary['cycle_idx'], y=discharge_summary['dis_volt_min'],
-                   mode='lines+markers', name='Min Voltage',
-                   line=dict(color='green', width=2), marker=dict(size=4)),
+        series_trace(discharge_summary['cycle_idx'], discharge_summary['dis_volt_min'], point_budget,
+                     mode='lines+markers', name='Min Voltage',
+                     line=dict(color='green', width=2), marker=dict(size=4)),
         row=1, col=2
     )
     
     # 온도
     fig.add_trace(
-        go.Scatter(x=discharge_summary['cycle_idx'], y=discharge_summary['dis_temp_max'],
-                   mode='lines+markers', name='Max Temp',
-                   line=dict(color='red', width=2), marker=dict(size=4)),
+        series_trace(discharge_summary['cycle_idx'], discharge_summary['dis_temp_max'], point_budget,
+                     mode='lines+markers', name='Max Temp',
+                     line=dict(color='red', width=2), marker=dict(size=4)),
         row=2, col=1
     )
     
     # 방전 시간
     fig.add_trace(
-        go.Scatter(x=discharge_summary['cycle_idx'], y=discharge_summary['dis_time'],
-                   mode='lines+markers', name='Discharge Time',
-                   line=dict(color='orange', width=2), marker=dict(size=4)),
+        series_trace(discharge_summary['cycle_idx'], discharge_summary['dis_time'], point_budget,
+                     mode='lines+markers', name='Discharge Time',
+                     line=dict(color='orange', width=2), marker=dict(size=4)),
         row=2, col=2
     )
     
@@ -67,4 +74,30 @@ def render(battery_id):
         title_font_size=20
     )
     
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    return fig
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_live(battery_id, point_budget=DEFAULT_POINT_BUDGET):
+    """새로 추가된 사이클만 읽어 주기적으로 갱신 (전체 재로드 없음)"""
+    begin_run()  # fragment rerun마다 기록을 새로 시작 (rerun 기록이 쌓이지 않도록)
+    tail, new_rows = tail_discharge_summary(battery_id, columns=COLUMNS)
+    # 시리즈별 축소 결과의 합집합만 figure로 (파일은 새 행만 읽고, 축소는 메모리 버퍼에서)
+    discharge_summary = tail.sample('cycle_idx', COLUMNS[1:], point_budget)
+    plotly_chart(build_figure_from(discharge_summary, point_budget), use_container_width=True)
+    st.caption(f"🔴 Live · {len(tail)} cycles (+{len(new_rows)} new) · "
+               f"{LIVE_REFRESH_SECONDS}s마다 갱신")
+
+def render(battery_id, point_budget=DEFAULT_POINT_BUDGET, live=False):
+    st.subheader(f"{battery_id} Battery Overview")
+    
+    if live:
+        render_live(battery_id, point_budget)
+        return
+    
+    figures = cached_figures(
+        ("overview", battery_id, point_budget),
+        load_discharge_summary.paths(battery_id),
+        lambda: {'fig': build_figure(battery_id, point_budget)}
+    )
+    
+    plotly_chart(figures['fig'], use_container_width=True)
\ No newline at end of file
@@ -1,7 +1,32 @@
 import streamlit as st
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
+from plotly.subplots import make_subplots
 from utils.dataloader import load_anomaly_results, load_lof_cycle_summary
+from utils.decimate import DEFAULT_POINT_BUDGET, decimate, scatter_cls, series_trace
+from utils.figcache import cached_figures
+from utils.perf import begin_run, plotly_chart
+from utils.score_index import (
+    CRITICAL_FACTOR,
+    cycles_above,
+    load_score_index,
+    plot_positions,
+    risk_levels,
+    threshold_summary,
+    top_k,
+)
+from utils.tail import LIVE_REFRESH_SECONDS, tail_lof_cycle_summary
+from utils.waveform import has_waveforms, load_cycle, load_waveform_store, reference_cycle
+
+# LOF 사이클 요약에서 사용하는 컬럼
+LOF_COLUMNS = ('cycle_idx', 'mean_score', 'split', 'has_anom')
+# threshold를 넘는 사이클 목록 표시 최대 행 수
+CYCLE_LIST_LIMIT = 500
+# 위험도 코드 (Normal, Warning, Critical) → 색
+RISK_COLORS = np.array(['lightgray', 'orange', 'darkred'])
+# 드릴다운 파형 채널 → 서브플롯 y축 제목
+WAVEFORM_CHANNELS = {'voltage': 'Voltage (V)', 'current': 'Current (A)', 'temperature': 'Temperature (℃)'}
 
 def get_risk_level(score, threshold):
     """위험도 분류"""
@@ -45,73 +70,133 @@ def render_top5_section(top_5, threshold, key_prefix):
     
     with col3:
         st.markdown("### Anomaly Scores (Horizontal)")
-        
-        fig_bar = go.Figure()
-        
-        colors = ['darkred' if s > threshold * 1.5 else 'orange' if s > threshold else 'gray' 
-                 for _, s in top_5[::-1]]
-        
-        fig_bar.add_trace(go.Bar(
-            y=[f"Cycle {int(c)}" for c, _ in top_5][::-1],
-            x=[s for _, s in top_5][::-1],
-            orientation='h',
-            marker=dict(color=colors),
-            text=[f"{s:.4f}" for _, s in top_5][::-1],
-            textposition='outside'
-        ))
-        
-        fig_bar.add_vline(x=threshold, line_dash="dash", line_color="red",
-                         annotation_text="Threshold")
-        
-        fig_bar.update_layout(
-            xaxis_title="Anomaly Score",
-            yaxis_title="",
-            height=500,
-            showlegend=False,
-            margin=dict(l=0, r=50, t=10, b=30)
-        )
-        
-        st.plotly_chart(fig_bar, use_container_width=True)
+        plotly_chart(build_top5_figure(top_5, threshold), use_container_width=True)
 
-def render(battery_id, model_type, preprocessing):
-    st.subheader("Anomaly Score Analysis")
+def build_top5_figure(top_5, threshold):
+    """Top 5 가로 막대 figure 생성"""
+    fig_bar = go.Figure()
     
-    if model_type == "LOF":
-        cycle_summary, threshold = load_lof_cycle_summary(battery_id, preprocessing)
-        
-        # 전체 그래프
-        fig = px.scatter(cycle_summary, x='cycle_idx', y='mean_score', 
-                        color='split', symbol='has_anom',
-                        title='Cycle-wise LOF Anomaly (mean score per cycle)')
-        fig.add_hline(y=threshold, line_dash='dash', line_color='red')
-        fig.add_annotation(x=0.95, xref='paper', y=threshold,
-                          text=f'Threshold: {threshold:.4f}',
-                          showarrow=False, bgcolor='rgba(255,255,255,0.8)')
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Top 5 추출
-        top_5 = cycle_summary.nlargest(5, 'mean_score')[['cycle_idx', 'mean_score']].values.tolist()
-        render_top5_section(top_5, threshold, "lof_check")
+    colors = ['darkred' if s > threshold * 1.5 else 'orange' if s > threshold else 'gray' 
+             for _, s in top_5[::-1]]
+    
+    fig_bar.add_trace(go.Bar(
+        y=[f"Cycle {int(c)}" for c, _ in top_5][::-1],
+        x=[s for _, s in top_5][::-1],
+        orientation='h',
+        marker=dict(color=colors),
+        text=[f"{s:.4f}" for _, s in top_5][::-1],
+        textposition='outside'
+    ))
+    
+    fig_bar.add_vline(x=threshold, line_dash="dash", line_color="red",
+                     annotation_text="Threshold")
+    
+    fig_bar.update_layout(
+        xaxis_title="Anomaly Score",
+        yaxis_title="",
+        height=500,
+        showlegend=False,
+        margin=dict(l=0, r=50, t=10, b=30)
+    )
+    
+    return fig_bar
+
+def build_waveform_figure(flagged, reference, flagged_cycle, ref_cycle, point_budget=DEFAULT_POINT_BUDGET):
+    """선택한 사이클의 방전 파형을 정상 기준 사이클 위에 겹친 3단 figure"""
+    fig = make_subplots(rows=len(WAVEFORM_CHANNELS), cols=1, shared_xaxes=True, vertical_spacing=0.06)
+    for row, (channel, title) in enumerate(WAVEFORM_CHANNELS.items(), 1):
+        fig.add_trace(series_trace(reference['time'], reference[channel], point_budget, mode='lines',
+                                   name=f'Reference (Cycle {ref_cycle})', legendgroup='reference',
+                                   showlegend=row == 1, line=dict(color='gray', width=2)),
+                      row=row, col=1)
+        fig.add_trace(series_trace(flagged['time'], flagged[channel], point_budget, mode='lines',
+                                   name=f'Cycle {flagged_cycle}', legendgroup='flagged',
+                                   showlegend=row == 1, line=dict(color='red', width=2)),
+                      row=row, col=1)
+        fig.update_yaxes(title_text=title, row=row, col=1)
+    fig.update_xaxes(title_text="Time (sec)", row=len(WAVEFORM_CHANNELS), col=1)
+    fig.update_layout(height=650, hovermode='x unified',
+                      title_text=f'Cycle {flagged_cycle} vs Reference Cycle {ref_cycle}')
+    return fig
+
+def render_waveform_drilldown(battery_id, top_5, index, key_prefix, point_budget=DEFAULT_POINT_BUDGET):
+    """Top 5 중 선택한 사이클의 원시 파형만 읽어 정상 기준 사이클과 비교"""
+    st.markdown("### Cycle Waveform Drill-down")
+    if not has_waveforms(battery_id):
+        st.caption("원시 파형 저장소가 없습니다. `python -m utils.waveform build RAW_DIR`로 생성할 수 있습니다.")
+        return
+    
+    try:
+        store = load_waveform_store(battery_id)
+    except ValueError as e:
+        st.warning(str(e))
+        return
+    ref_cycle = reference_cycle(index, store)
+    if ref_cycle is None:
+        st.info("점수 사이클과 겹치는 파형 사이클이 없습니다. 파형 저장소를 현재 cycle 번호로 다시 생성해주세요.")
+        return
+    cycle = st.selectbox(
+        "Flagged Cycle",
+        [int(c) for c, _ in top_5],
+        format_func=lambda c: f"Cycle {c}",
+        key=f"{key_prefix}_waveform_{battery_id}"
+    )
+    if cycle is None:
         return
     
-    # Anomaly Transformer
+    try:
+        flagged, reference = load_cycle(battery_id, cycle), load_cycle(battery_id, ref_cycle)
+    except KeyError as e:
+        st.info(e.args[0])
+        return
+    plotly_chart(build_waveform_figure(flagged, reference, cycle, ref_cycle, point_budget),
+                 use_container_width=True)
+    st.caption(f"기준 사이클: Cycle {ref_cycle} (파형이 있는 사이클 중 이상 점수가 가장 낮음)")
+
+def build_lof_figures(battery_id, preprocessing, point_budget=DEFAULT_POINT_BUDGET):
+    """LOF 전체 그래프 + Top 5 목록"""
+    cycle_summary, threshold = load_lof_cycle_summary(battery_id, preprocessing, columns=LOF_COLUMNS)
+    return build_lof_figures_from(cycle_summary, threshold, point_budget)
+
+def build_lof_figures_from(cycle_summary, threshold, point_budget=DEFAULT_POINT_BUDGET):
+    """로드된 LOF 사이클 요약으로 전체 그래프 + Top 5 목록 생성"""
+    # Top 5 위치 (nlargest와 같은 순서)
+    top_pos = np.argsort(-cycle_summary['mean_score'].to_numpy(), kind='stable')[:5]
+    
+    # 전체 그래프 (point budget 초과 시 Top 5는 남기고 줄임)
+    plot_idx = decimate(cycle_summary['cycle_idx'].to_numpy(), cycle_summary['mean_score'].to_numpy(),
+                        point_budget, keep=top_pos)
+    fig = px.scatter(cycle_summary.iloc[plot_idx], x='cycle_idx', y='mean_score', 
+                    color='split', symbol='has_anom',
+                    title='Cycle-wise LOF Anomaly (mean score per cycle)')
+    fig.add_hline(y=threshold, line_dash='dash', line_color='red')
+    fig.add_annotation(x=0.95, xref='paper', y=threshold,
+                      text=f'Threshold: {threshold:.4f}',
+                      showarrow=False, bgcolor='rgba(255,255,255,0.8)')
+    
+    # Top 5 추출
+    top_5 = cycle_summary.iloc[top_pos][['cycle_idx', 'mean_score']].values.tolist()
+    return {'fig': fig, 'top_5': top_5, 'threshold': float(threshold)}
+
+def build_transformer_figures(battery_id, model_type, preprocessing, point_budget=DEFAULT_POINT_BUDGET):
+    """Anomaly Transformer 전체 그래프 + Top 5 목록"""
     results = load_anomaly_results(battery_id, model_type, preprocessing)
-    cycle_scores = results['cycle_scores']
+    cycles = results['cycles']  # cycle 오름차순
+    scores = results['scores']
     threshold = results['threshold']
     
-    cycles = sorted(cycle_scores.keys())
-    scores = [cycle_scores[c] for c in cycles]
+    top_idx = np.argsort(-scores, kind='stable')[:5]
     
-    # 전체 그래프
+    # 전체 그래프 (point budget 초과 시 Top 5는 남기고 줄임)
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=cycles, y=scores, mode='lines',
-                             name='Anomaly Score', line=dict(color='blue', width=2)))
+    fig.add_trace(series_trace(cycles, scores, point_budget, keep=top_idx, mode='lines',
+                               name='Anomaly Score', line=dict(color='blue', width=2)))
     fig.add_hline(y=threshold, line_dash='dash', line_color='red')
     
     # Top 5 표시
-    top_5 = sorted(cycle_scores.items(), key=lambda x: x[1], reverse=True)[:5]
-    top_cycles = [c for c, s in top_5]
-    top_scores = [cycle_scores[c] for c in top_cycles]
+    top_cycles = cycles[top_idx]
+    top_scores = scores[top_idx]
+    top_5 = list(zip(top_cycles.tolist(), top_scores.tolist()))
     
     fig.add_trace(go.Scatter(x=top_cycles, y=top_scores, mode='markers+text',
                              name='Top 5 Anomalies', marker=dict(color='red', size=10),
@@ -119,6 +204,107 @@ def render(battery_id, model_type, preprocessing):
     
     fig.update_layout(title='Cycle-wise Anomaly Score', xaxis_title='Cycle',
                      yaxis_title='Anomaly Score', height=500, hovermode='x')
-    st.plotly_chart(fig, use_container_width=True)
+    return {'fig': fig, 'top_5': top_5, 'threshold': threshold}
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_lof_live(battery_id, preprocessing, point_budget=DEFAULT_POINT_BUDGET):
+    """LOF 사이클 요약에 새로 추가된 행만 읽어 주기적으로 갱신"""
+    begin_run()  # fragment rerun마다 기록을 새로 시작 (rerun 기록이 쌓이지 않도록)
+    tail, new_rows, threshold = tail_lof_cycle_summary(battery_id, preprocessing, columns=LOF_COLUMNS)
+    # 축소 결과 + 상위 5행만 figure로 (Top 5는 전체 누적 행 기준과 같음)
+    cycle_summary = tail.sample('cycle_idx', ('mean_score',), point_budget, top='mean_score')
+    figures = build_lof_figures_from(cycle_summary, threshold, point_budget)
+    plotly_chart(figures['fig'], use_container_width=True)
+    st.caption(f"🔴 Live · {len(tail)} cycles (+{len(new_rows)} new) · "
+               f"{LIVE_REFRESH_SECONDS}s마다 갱신")
+    render_top5_section(figures['top_5'], figures['threshold'], "lof_check")
+    render_waveform_drilldown(battery_id, figures['top_5'], load_score_index(battery_id, "LOF", preprocessing),
+                              "lof_check", point_budget)
+
+def render_threshold_slider(index, battery_id, model_type, preprocessing):
+    """what-if threshold 슬라이더 (기본값: 메타데이터 threshold)"""
+    lo = float(index['sorted_scores'][0]) if len(index['sorted_scores']) else 0.0
+    hi = float(index['sorted_scores'][-1]) if len(index['sorted_scores']) else 1.0
+    threshold = index['threshold']
+    lo, hi = min(lo, threshold), max(hi, threshold)
+    if hi <= lo:
+        return threshold
+    return st.slider(
+        "What-if Threshold",
+        min_value=lo, max_value=hi, value=threshold,
+        step=(hi - lo) / 1000, format="%.4f",
+        key=f"threshold_{battery_id}_{model_type}_{preprocessing}",
+        help="threshold를 바꿔 넘는 사이클 수와 위험도를 바로 확인합니다."
+    )
+
+def add_threshold_overlay(fig, index, threshold, point_budget=DEFAULT_POINT_BUDGET):
+    """what-if threshold 선과 위험도별로 다시 칠한 전체 시리즈 추가"""
+    pos = plot_positions(index, point_budget)
+    colors = RISK_COLORS[risk_levels(index['scores'][pos], threshold)]
+    fig.add_trace(scatter_cls(len(pos))(
+        x=index['cycles'][pos], y=index['scores'][pos], mode='markers',
+        name='What-if Risk', marker=dict(color=colors, size=6),
+        hovertemplate="Cycle %{x}<br>Score %{y:.4f}<extra></extra>"
+    ))
+    fig.add_hline(y=threshold, line_dash='dot', line_color='orange',
+                  annotation_text=f'What-if: {threshold:.4f}', annotation_position='bottom right')
+
+def render_threshold_summary(index, threshold):
+    """threshold, 1.5 × threshold를 넘는 사이클 수와 목록"""
+    summary = threshold_summary(index, threshold)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Cycles > Threshold", f"{summary['above']:,}")
+    with col2:
+        st.metric(f"Critical (> {CRITICAL_FACTOR}× Threshold)", f"{summary['critical']:,}")
+    with col3:
+        st.metric("Scored Cycles", f"{summary['total']:,}")
+    
+    if summary['above']:
+        with st.expander(f"Threshold를 넘는 사이클 ({summary['above']:,})"):
+            cycles, scores = cycles_above(index, threshold, limit=CYCLE_LIST_LIMIT)
+            st.dataframe({'cycle': cycles, 'score': scores}, hide_index=True, use_container_width=True)
+            if summary['above'] > CYCLE_LIST_LIMIT:
+                st.caption(f"점수 상위 {CYCLE_LIST_LIMIT}개만 표시합니다.")
+
+def render(battery_id, model_type, preprocessing, point_budget=DEFAULT_POINT_BUDGET, live=False):
+    st.subheader("Anomaly Score Analysis")
+    
+    if model_type == "LOF" and live:
+        render_lof_live(battery_id, preprocessing, point_budget)
+        return
+    
+    if model_type == "LOF":
+        figures = cached_figures(
+            ("anomaly", battery_id, model_type, preprocessing, point_budget),
+            load_lof_cycle_summary.paths(battery_id, preprocessing),
+            lambda: build_lof_figures(battery_id, preprocessing, point_budget)
+        )
+        key_prefix = "lof_check"
+    else:
+        # Anomaly Transformer (결과가 고정 크기 배열이라 live tail 대상 아님)
+        if live:
+            st.caption("Live 모드는 LOF 사이클 요약에만 적용됩니다.")
+        figures = cached_figures(
+            ("anomaly", battery_id, model_type, preprocessing, point_budget),
+            load_anomaly_results.paths(battery_id, model_type, preprocessing),
+            lambda: build_transformer_figures(battery_id, model_type, preprocessing, point_budget)
+        )
+        key_prefix = "check"
+    
+    # 정렬 인덱스로 what-if threshold 질의 (슬라이더 이동 시 재정렬/재스캔 없음)
+    index = load_score_index(battery_id, model_type, preprocessing)
+    threshold = render_threshold_slider(index, battery_id, model_type, preprocessing)
+    
+    fig = figures['fig']
+    if threshold != index['threshold']:
+        add_threshold_overlay(fig, index, threshold, point_budget)
+    plotly_chart(fig, use_container_width=True)
+    
+    render_threshold_summary(index, threshold)
     
-    render_top5_section(top_5, threshold, "check")
\ No newline at end of file
+    top_pos = top_k(index, 5)
+    top_5 = list(zip(index['cycles'][top_pos].tolist(), index['scores'][top_pos].tolist()))
+    render_top5_section(top_5, threshold, key_prefix)
+    render_waveform_drilldown(battery_id, top_5, index, key_prefix, point_budget)
@@ -1,7 +1,111 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
-from utils.dataloader import load_feature_importance, load_shap_data
+from utils.dataloader import load_feature_importance, load_shap_data, load_shap_importance
+from utils.figcache import cached_figures
+from utils.perf import plotly_chart
+
+# SHAP 분포에 표시할 상위 피처 수와 최대 포인트 수
+SWARM_TOP_N = 10
+SWARM_POINT_BUDGET = 20000
+# 밀도 추정 구간 수와 최대 jitter 폭 (y 간격 1 기준)
+SWARM_DENSITY_BINS = 50
+SWARM_JITTER = 0.4
+
+def build_importance_figure(features, importance_scores, top_n):
+    """Feature Importance 가로 막대 figure 생성"""
+    # 색상 그라데이션
+    threshold_high = np.percentile(importance_scores[:top_n], 66)
+    threshold_mid = np.percentile(importance_scores[:top_n], 33)
+    
+    colors = ['darkred' if s > threshold_high else 'orange' if s > threshold_mid else 'steelblue' 
+              for s in importance_scores[:top_n]]
+    
+    fig_importance = go.Figure()
+    fig_importance.add_trace(go.Bar(
+        y=features[:top_n][::-1],
+        x=importance_scores[:top_n][::-1],
+        orientation='h',
+        marker=dict(color=colors[::-1]),
+        text=[f"{s:.4f}" for s in importance_scores[:top_n][::-1]],
+        textposition='outside'
+    ))
+    
+    fig_importance.update_layout(
+        xaxis_title="Importance Score (mean |SHAP value|)",
+        yaxis_title="",
+        height=max(400, top_n * 40),
+        showlegend=False,
+        margin=dict(l=0, r=50, t=10, b=30)
+    )
+    
+    return fig_importance
+
+def build_swarm_figure(battery_id, preprocessing, feature_importance, point_budget=SWARM_POINT_BUDGET):
+    """SHAP 분포 figure 생성 (전체 피처를 Scattergl 하나로, point budget 초과 시 행 샘플링)"""
+    top = feature_importance.head(SWARM_TOP_N)
+    shap_values, X_explain = load_shap_data(battery_id, preprocessing, columns=tuple(top['feature']))
+    top = top[top['feature'].isin(X_explain.columns)]
+    features = top['feature'].tolist()
+    n_feat = len(features)
+    total = len(X_explain) * n_feat
+    
+    # 같은 행 집합을 모든 피처에 사용 (피처 간 비교 가능)
+    rng = np.random.default_rng(0)
+    rows = np.arange(len(X_explain))
+    if total > point_budget and n_feat:
+        rows = np.sort(rng.choice(len(X_explain), max(point_budget // n_feat, 1), replace=False))
+    values = X_explain[features].to_numpy(dtype=float)[rows]
+    shap_vals = np.asarray(shap_values[np.ix_(rows, top['column'].to_numpy())], dtype=float)
+    
+    # 값 밀도에 비례한 jitter (피처별 히스토그램, 벡터화)
+    lo = np.nanmin(values, axis=0) if len(rows) else np.zeros(n_feat)
+    span = (np.nanmax(values, axis=0) - lo) if len(rows) else np.ones(n_feat)
+    span[~(span > 0)] = 1.0
+    bins = np.clip((np.nan_to_num((values - lo) / span) * SWARM_DENSITY_BINS).astype(np.int64),
+                   0, SWARM_DENSITY_BINS - 1)
+    counts = np.bincount((bins + np.arange(n_feat) * SWARM_DENSITY_BINS).ravel(),
+                         minlength=n_feat * SWARM_DENSITY_BINS).reshape(n_feat, SWARM_DENSITY_BINS)
+    density = counts / np.maximum(counts.max(axis=1, keepdims=True), 1)
+    width = SWARM_JITTER * density[np.arange(n_feat), bins]
+    y = np.arange(n_feat) + rng.uniform(-1.0, 1.0, size=values.shape) * width
+    
+    fig_swarm = go.Figure(go.Scattergl(
+        x=values.ravel(),
+        y=y.ravel(),
+        mode='markers',
+        marker=dict(
+            color=shap_vals.ravel(),
+            colorscale='RdBu_r',
+            size=8,
+            opacity=0.6,
+            showscale=True,
+            colorbar=dict(title="SHAP value")
+        ),
+        hovertemplate="Feature Value: %{x:.4f}<br>SHAP value: %{marker.color:.4f}<extra></extra>",
+        showlegend=False
+    ))
+    
+    fig_swarm.update_layout(
+        xaxis_title="Feature Value",
+        yaxis=dict(title="", tickvals=list(range(n_feat)), ticktext=features,
+                   range=[-0.5, n_feat - 0.5]),
+        height=500,
+        hovermode='closest'
+    )
+    
+    return {'fig': fig_swarm, 'shown': int(values.size), 'total': int(total)}
+
+def load_importance(battery_id, preprocessing):
+    """(중요도 DataFrame, 의존 파일 목록) — shap_values에서 계산, 없으면 기존 CSV"""
+    try:
+        return (load_shap_importance(battery_id, preprocessing),
+                load_shap_importance.paths(battery_id, preprocessing))
+    except (FileNotFoundError, ValueError):
+        feature_importance = load_feature_importance(battery_id, preprocessing)
+        # CSV 순서를 shap_values 열 순서로 간주 (기존 동작)
+        feature_importance = feature_importance.assign(column=np.arange(len(feature_importance)))
+        return feature_importance, load_feature_importance.paths(battery_id, preprocessing)
 
 def render(battery_id, model_type, preprocessing):
     if model_type != "LOF":
@@ -12,9 +116,7 @@ def render(battery_id, model_type, preprocessing):
     st.subheader("Feature Importance & Interpretability")
     
     # 데이터 로드 (함수 사용)
-    feature_importance = load_feature_importance(battery_id, preprocessing)
-    shap_values, X_explain = load_shap_data(battery_id, preprocessing)
-    
+    feature_importance, importance_paths = load_importance(battery_id, preprocessing)
     features = feature_importance['feature'].tolist()
     importance_scores = feature_importance['importance'].tolist()
     
@@ -33,72 +135,26 @@ def render(battery_id, model_type, preprocessing):
     with col2:
         top_n = st.selectbox("Show Top N Features", [5, 10, len(features)], index=1)
     
-    # 색상 그라데이션
-    threshold_high = np.percentile(importance_scores[:top_n], 66)
-    threshold_mid = np.percentile(importance_scores[:top_n], 33)
-    
-    colors = ['darkred' if s > threshold_high else 'orange' if s > threshold_mid else 'steelblue' 
-              for s in importance_scores[:top_n]]
-    
-    fig_importance = go.Figure()
-    fig_importance.add_trace(go.Bar(
-        y=features[:top_n][::-1],
-        x=importance_scores[:top_n][::-1],
-        orientation='h',
-        marker=dict(color=colors[::-1]),
-        text=[f"{s:.4f}" for s in importance_scores[:top_n][::-1]],
-        textposition='outside'
-    ))
-    
-    fig_importance.update_layout(
-        xaxis_title="Importance Score (mean |SHAP value|)",
-        yaxis_title="",
-        height=max(400, top_n * 40),
-        showlegend=False,
-        margin=dict(l=0, r=50, t=10, b=30)
+    figures = cached_figures(
+        ("importance", battery_id, model_type, preprocessing, top_n),
+        importance_paths,
+        lambda: {'fig': build_importance_figure(features, importance_scores, top_n)}
     )
-    
-    st.plotly_chart(fig_importance, use_container_width=True)
+    plotly_chart(figures['fig'], use_container_width=True)
     
     st.markdown("---")
     
     # 2. SHAP Value Distribution
     st.markdown("### SHAP Value Analysis")
     
-    top_features_for_swarm = features[:10]
-    
-    fig_swarm = go.Figure()
-    
-    for i, feat in enumerate(top_features_for_swarm):
-        if feat in X_explain.columns:
-            feature_values = X_explain[feat].values
-            feat_idx = features.index(feat)
-            shap_vals = shap_values[:, feat_idx]
-            
-            fig_swarm.add_trace(go.Scatter(
-                x=feature_values,
-                y=[feat] * len(feature_values),
-                mode='markers',
-                name=feat,
-                marker=dict(
-                    color=shap_vals,
-                    colorscale='RdBu_r',
-                    size=8,
-                    opacity=0.6,
-                    showscale=(i == 0),
-                    colorbar=dict(title="SHAP value") if i == 0 else None
-                ),
-                showlegend=False
-            ))
-    
-    fig_swarm.update_layout(
-        xaxis_title="Feature Value",
-        yaxis_title="",
-        height=500,
-        hovermode='closest'
+    figures = cached_figures(
+        ("shap_swarm", battery_id, model_type, preprocessing),
+        importance_paths + load_shap_data.paths(battery_id, preprocessing),
+        lambda: build_swarm_figure(battery_id, preprocessing, feature_importance)
     )
-    
-    st.plotly_chart(fig_swarm, use_container_width=True)
+    plotly_chart(figures['fig'], use_container_width=True)
+    if figures['shown'] < figures['total']:
+        st.caption(f"{figures['shown']:,} / {figures['total']:,} points (random sample)")
     
     # Feature 설명
     with st.expander("📖 Feature 설명"):
@@ -1,22 +1,17 @@
 import streamlit as st
-import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from utils.dataloader import load_hi_analysis
+from utils.decimate import DEFAULT_POINT_BUDGET, series_trace
+from utils.figcache import cached_figures
+from utils.perf import plotly_chart
 
-def render(battery_id, model_type, preprocessing):
+# 이 탭에서 사용하는 컬럼
+COLUMNS = ('cycle_idx', 'HI_ema', 'HI_abs_change', 'HI_slope_rollstd', 'HI_std_ma')
 
-    if model_type != "LOF":
-        st.warning("⚠️ HI 지표는 LOF 모델에서만 제공됩니다.")
-        st.info("왼쪽 사이드바에서 **LOF** 모델을 선택해주세요.")
-        return  # stop() → return
-    
-    if preprocessing == "Raw Data":
-        st.warning("⚠️ HI 지표는 Lowess 데이터에서만 제공됩니다.")
-        st.info("왼쪽 사이드바에서 **Lowess** 데이터를 선택해주세요.")
-        return  # stop() → return
-    
+def build_figures(battery_id, preprocessing, point_budget=DEFAULT_POINT_BUDGET):
+    """HI 3단 figure + 통계 요약"""
     # 데이터 로드
-    val_test_df, metadata = load_hi_analysis(battery_id, preprocessing)
+    val_test_df, metadata = load_hi_analysis(battery_id, preprocessing, columns=COLUMNS)
     
     # 메타데이터 추출
     val_start = metadata['val_start']
@@ -24,22 +19,6 @@ def render(battery_id, model_type, preprocessing):
     stable_threshold = metadata['stable_threshold']
     first_event = metadata.get('first_event')
 
-    # 통계 요약
-    st.subheader("Statistical Summary")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric("Stable Threshold", f"{metadata['stable_threshold']:.6f}")
-    with col2:
-        st.metric("Early Phase HI Volatility", f"{metadata['early_hi_mean']:.6f}")
-    with col3:
-        st.metric("Late Phase HI Volatility", f"{metadata['late_hi_mean']:.6f}")
-
-    st.markdown("---")
-    
-    st.subheader("Health Indicator Variability Analysis")
-
     # 시각화
     fig = make_subplots(
         rows=3, cols=1,
@@ -53,27 +32,27 @@ def render(battery_id, model_type, preprocessing):
     
     # Row 1: HI_ema
     fig.add_trace(
-        go.Scatter(x=val_test_df['cycle_idx'], y=val_test_df['HI_ema'],
-                   name='HI_ema', line=dict(color='blue', width=2)),
+        series_trace(val_test_df['cycle_idx'], val_test_df['HI_ema'], point_budget,
+                     name='HI_ema', line=dict(color='blue', width=2)),
         row=1, col=1
     )
     
     # Row 2: HI 절댓값
     fig.add_trace(
-        go.Scatter(x=val_test_df['cycle_idx'], y=val_test_df['HI_abs_change'],
-                   name='HI Absolute Change', line=dict(color='purple', width=2)),
+        series_trace(val_test_df['cycle_idx'], val_test_df['HI_abs_change'], point_budget,
+                     name='HI Absolute Change', line=dict(color='purple', width=2)),
         row=2, col=1
     )
     
     # Row 3: HI 변동성
     fig.add_trace(
-        go.Scatter(x=val_test_df['cycle_idx'], y=val_test_df['HI_slope_rollstd'],
-                   name='HI Volatility', line=dict(color='orange', width=2)),
+        series_trace(val_test_df['cycle_idx'], val_test_df['HI_slope_rollstd'], point_budget,
+                     name='HI Volatility', line=dict(color='orange', width=2)),
         row=3, col=1
     )
     fig.add_trace(
-        go.Scatter(x=val_test_df['cycle_idx'], y=val_test_df['HI_std_ma'],
-                   name='HI Volatility MA', line=dict(color='brown', width=1, dash='dash')),
+        series_trace(val_test_df['cycle_idx'], val_test_df['HI_std_ma'], point_budget,
+                     name='HI Volatility MA', line=dict(color='brown', width=1, dash='dash')),
         row=3, col=1
     )
     fig.add_hline(y=stable_threshold, line=dict(color='gray', dash='dot'),
@@ -92,6 +71,41 @@ def render(battery_id, model_type, preprocessing):
     fig.update_xaxes(title_text="Cycle", row=3, col=1)
     fig.update_layout(height=900, showlegend=True)
     
-    st.plotly_chart(fig, use_container_width=True)
+    summary = {k: metadata[k] for k in ('stable_threshold', 'early_hi_mean', 'late_hi_mean')}
+    return {'fig': fig, 'summary': summary}
+
+def render(battery_id, model_type, preprocessing, point_budget=DEFAULT_POINT_BUDGET):
+
+    if model_type != "LOF":
+        st.warning("⚠️ HI 지표는 LOF 모델에서만 제공됩니다.")
+        st.info("왼쪽 사이드바에서 **LOF** 모델을 선택해주세요.")
+        return  # stop() → return
+    
+    if preprocessing == "Raw Data":
+        st.warning("⚠️ HI 지표는 Lowess 데이터에서만 제공됩니다.")
+        st.info("왼쪽 사이드바에서 **Lowess** 데이터를 선택해주세요.")
+        return  # stop() → return
+    
+    figures = cached_figures(
+        ("health", battery_id, model_type, preprocessing, point_budget),
+        load_hi_analysis.paths(battery_id, preprocessing),
+        lambda: build_figures(battery_id, preprocessing, point_budget)
+    )
+    summary = figures['summary']
+
+    # 통계 요약
+    st.subheader("Statistical Summary")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Stable Threshold", f"{summary['stable_threshold']:.6f}")
+    with col2:
+        st.metric("Early Phase HI Volatility", f"{summary['early_hi_mean']:.6f}")
+    with col3:
+        st.metric("Late Phase HI Volatility", f"{summary['late_hi_mean']:.6f}")
+
+    st.markdown("---")
     
-    
\ No newline at end of file
+    st.subheader("Health Indicator Variability Analysis")
+    plotly_chart(figures['fig'], use_container_width=True)
@@ -2,19 +2,28 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from utils.correlation import CONFIDENCE, load_correlation_summary
 from utils.dataloader import load_correlation_data
+from utils.decimate import DEFAULT_POINT_BUDGET, scatter_cls, series_trace
+from utils.figcache import cached_figures
+from utils.perf import plotly_chart
 
-def render(battery_id, model_type, preprocessing):
-    st.subheader("Correlation Analysis")
-    
+# 이 탭에서 사용하는 컬럼
+COLUMNS = ('cycle', 'mean_score', 'Capacity', 'R_ohmic')
+
+def _corr_label(corr):
+    """서브플롯 제목용 상관계수 + 신뢰구간 (bootstrap / 대용량의 Fisher z 근사 구분 표시)"""
+    method = 'Fisher z' if corr.get('ci_method') == 'fisher' else 'bootstrap'
+    suffix = f' ({int(CONFIDENCE * 100)}% {method} CI)'
+    return (f"Pearson r={corr['pearson']:.3f} [{corr['pearson_ci'][0]:.3f}, {corr['pearson_ci'][1]:.3f}] · "
+            f"Spearman ρ={corr['spearman']:.3f} [{corr['spearman_ci'][0]:.3f}, {corr['spearman_ci'][1]:.3f}]{suffix}")
+
+def build_figure(battery_id, model_type, preprocessing, point_budget=DEFAULT_POINT_BUDGET):
+    """상관관계 figure 생성 (2x2 + rolling 상관)"""
     # 데이터 로드
-    df_merged, metadata = load_correlation_data(battery_id, model_type, preprocessing)
-    
-    # 메타데이터 추출
-    pearson_cap = metadata['pearson_cap']
-    p_p_cap = metadata['p_p_cap']
-    pearson_rohm = metadata['pearson_rohm']
-    p_p_rohm = metadata['p_p_rohm']
+    df_merged, _ = load_correlation_data(battery_id, model_type, preprocessing, columns=COLUMNS)
+    summary = load_correlation_summary(battery_id, model_type, preprocessing)
+    cap, rohm = summary['Capacity'], summary['R_ohmic']
     
     
     # # 상관계수 요약
@@ -34,27 +43,29 @@ def render(battery_id, model_type, preprocessing):
     
     # st.markdown("---")
 
-    # 2x2 서브플롯 생성
+    # 2x2 + rolling 상관 서브플롯 생성
     fig = make_subplots(
-        rows=2, cols=2,
+        rows=3, cols=2,
         subplot_titles=(
-            f'Anomaly Score vs Capacity<br>Pearson r={pearson_cap:.3f}',
-            f'Anomaly Score vs R_ohmic<br>Pearson r={pearson_rohm:.3f}',
+            f'Anomaly Score vs Capacity<br>{_corr_label(cap)}',
+            f'Anomaly Score vs R_ohmic<br>{_corr_label(rohm)}',
             'Anomaly Score & Capacity Over Cycles',
-            'Anomaly Score & R_ohmic Over Cycles'
+            'Anomaly Score & R_ohmic Over Cycles',
+            f'Rolling Pearson r (window={summary["window"]} cycles) · red: Capacity, green: R_ohmic'
         ),
         specs=[
             [{"type": "scatter"}, {"type": "scatter"}],
-            [{"secondary_y": True}, {"secondary_y": True}]
+            [{"secondary_y": True}, {"secondary_y": True}],
+            [{"colspan": 2}, None]
         ],
-        vertical_spacing=0.20,
+        vertical_spacing=0.12,
         horizontal_spacing=0.15
     )
     
     # 1) Scatter: Anomaly Score vs Capacity
     fig.add_trace(
-        go.Scatter(
-            x=df_merged['mean_score'], 
+        scatter_cls(len(df_merged))(
+            x=df_merged['mean_score'],
             y=df_merged['Capacity'],
             mode='markers',
             marker=dict(size=8, color='blue', opacity=0.6, line=dict(color='black', width=0.5)),
@@ -64,14 +75,12 @@ def render(battery_id, model_type, preprocessing):
         row=1, col=1
     )
     
-    # 회귀선
-    z1 = np.polyfit(df_merged['mean_score'], df_merged['Capacity'], 1)
-    p1 = np.poly1d(z1)
+    # 회귀선 (상관 엔진의 최소제곱 직선)
     x_line1 = np.linspace(df_merged['mean_score'].min(), df_merged['mean_score'].max(), 100)
     fig.add_trace(
         go.Scatter(
             x=x_line1, 
-            y=p1(x_line1),
+            y=cap['slope'] * x_line1 + cap['intercept'],
             mode='lines',
             line=dict(color='red', dash='dash', width=2),
             name='Regression',
@@ -82,8 +91,8 @@ def render(battery_id, model_type, preprocessing):
     
     # 2) Scatter: Anomaly Score vs R_ohmic
     fig.add_trace(
-        go.Scatter(
-            x=df_merged['mean_score'], 
+        scatter_cls(len(df_merged))(
+            x=df_merged['mean_score'],
             y=df_merged['R_ohmic'],
             mode='markers',
             marker=dict(size=8, color='green', opacity=0.6, line=dict(color='black', width=0.5)),
@@ -94,12 +103,10 @@ def render(battery_id, model_type, preprocessing):
     )
     
     # 회귀선
-    z2 = np.polyfit(df_merged['mean_score'], df_merged['R_ohmic'], 1)
-    p2 = np.poly1d(z2)
     fig.add_trace(
         go.Scatter(
             x=x_line1, 
-            y=p2(x_line1),
+            y=rohm['slope'] * x_line1 + rohm['intercept'],
             mode='lines',
             line=dict(color='red', dash='dash', width=2),
             name='Regression',
@@ -110,9 +117,10 @@ def render(battery_id, model_type, preprocessing):
     
     # 3) Time series: Anomaly Score & Capacity
     fig.add_trace(
-        go.Scatter(
-            x=df_merged['cycle'], 
-            y=df_merged['mean_score'],
+        series_trace(
+            df_merged['cycle'],
+            df_merged['mean_score'],
+            point_budget,
             mode='lines+markers',
             line=dict(color='blue', width=2),
             marker=dict(size=4),
@@ -122,9 +130,10 @@ def render(battery_id, model_type, preprocessing):
     )
     
     fig.add_trace(
-        go.Scatter(
-            x=df_merged['cycle'], 
-            y=df_merged['Capacity'],
+        series_trace(
+            df_merged['cycle'],
+            df_merged['Capacity'],
+            point_budget,
             mode='lines+markers',
             line=dict(color='red', width=2),
             marker=dict(size=4, symbol='square'),
@@ -135,9 +144,10 @@ def render(battery_id, model_type, preprocessing):
     
     # 4) Time series: Anomaly Score & R_ohmic
     fig.add_trace(
-        go.Scatter(
-            x=df_merged['cycle'], 
-            y=df_merged['mean_score'],
+        series_trace(
+            df_merged['cycle'],
+            df_merged['mean_score'],
+            point_budget,
             mode='lines+markers',
             line=dict(color='blue', width=2),
             marker=dict(size=4),
@@ -148,9 +158,10 @@ def render(battery_id, model_type, preprocessing):
     )
     
     fig.add_trace(
-        go.Scatter(
-            x=df_merged['cycle'], 
-            y=df_merged['R_ohmic'],
+        series_trace(
+            df_merged['cycle'],
+            df_merged['R_ohmic'],
+            point_budget,
             mode='lines+markers',
             line=dict(color='green', width=2),
             marker=dict(size=4, symbol='square'),
@@ -159,11 +170,28 @@ def render(battery_id, model_type, preprocessing):
         row=2, col=2, secondary_y=True
     )
     
+    # 5) Rolling 상관: 수명에 따른 관계 변화
+    for name, color in (('Capacity', 'red'), ('R_ohmic', 'green')):
+        fig.add_trace(
+            series_trace(
+                summary['cycles'],
+                summary[name]['rolling'],
+                point_budget,
+                mode='lines',
+                line=dict(color=color, width=2),
+                name=f'Rolling r ({name})',
+                showlegend=False
+            ),
+            row=3, col=1
+        )
+    fig.add_hline(y=0, line=dict(color='gray', dash='dot', width=1), row=3, col=1)
+    
     # 축 레이블
     fig.update_xaxes(title_text="Anomaly Score", row=1, col=1)
     fig.update_xaxes(title_text="Anomaly Score", row=1, col=2)
     fig.update_xaxes(title_text="Cycle", row=2, col=1)
     fig.update_xaxes(title_text="Cycle", row=2, col=2)
+    fig.update_xaxes(title_text="Cycle", row=3, col=1)
     
     fig.update_yaxes(title_text="Capacity (Ah)", row=1, col=1)
     fig.update_yaxes(title_text="R_ohmic (Ω)", row=1, col=2)
@@ -171,11 +199,22 @@ def render(battery_id, model_type, preprocessing):
     fig.update_yaxes(title_text="Capacity (Ah)", secondary_y=True, row=2, col=1)
     fig.update_yaxes(title_text="Anomaly Score", secondary_y=False, row=2, col=2)
     fig.update_yaxes(title_text="R_ohmic (Ω)", secondary_y=True, row=2, col=2)
+    fig.update_yaxes(title_text="Pearson r", range=[-1.05, 1.05], row=3, col=1)
 
     fig.update_layout(
-        height=1000,
+        height=1350,
         showlegend=False,
         hovermode='x unified',
     )
     
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    return fig
+
+def render(battery_id, model_type, preprocessing, point_budget=DEFAULT_POINT_BUDGET):
+    st.subheader("Correlation Analysis")
+    
+    figures = cached_figures(
+        ("correlation", battery_id, model_type, preprocessing, point_budget),
+        load_correlation_data.paths(battery_id, model_type, preprocessing),
+        lambda: {'fig': build_figure(battery_id, model_type, preprocessing, point_budget)}
+    )
+    plotly_chart(figures['fig'], use_container_width=True)
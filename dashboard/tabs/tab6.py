@@ -0,0 +1,51 @@
+import functools
+import streamlit as st
+from utils.dataloader import discover_batteries
+from utils.fleet import load_fleet
+
+def _open_battery(drill_down_view):
+    """선택한 배터리의 상세 뷰로 이동 (st.dataframe on_select 콜백)"""
+    rows = st.session_state["fleet_table"].selection.rows
+    if rows:
+        st.session_state["battery_id"] = st.session_state["fleet_batteries"][rows[0]]
+        st.session_state["active_view"] = drill_down_view
+
+def render(model_type, preprocessing, drill_down_view):
+    st.subheader("Fleet Overview")
+
+    batteries = discover_batteries()
+    with st.spinner(f"📥 {len(batteries)}개 배터리 로드 중..."):
+        fleet, elapsed = load_fleet(batteries, model_type, preprocessing)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Batteries", len(fleet))
+    with col2:
+        st.metric("Over Threshold", int((fleet['cycles_over_threshold'] > 0).sum()))
+    with col3:
+        st.metric("Load Time", f"{elapsed:.2f}s")
+
+    st.markdown("---")
+
+    # 콜백에서 선택한 행 → 배터리 ID로 변환
+    st.session_state["fleet_batteries"] = fleet['battery_id'].tolist()
+
+    st.dataframe(
+        fleet,
+        key="fleet_table",
+        on_select=functools.partial(_open_battery, drill_down_view),
+        selection_mode="single-row",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'battery_id': st.column_config.TextColumn("Battery"),
+            'cycles': st.column_config.NumberColumn("Cycles", format="%d"),
+            'current_capacity': st.column_config.NumberColumn("Current Capacity (Ah)", format="%.3f"),
+            'capacity_fade_pct': st.column_config.NumberColumn("Capacity Fade (%)", format="%.1f"),
+            'max_anomaly_score': st.column_config.NumberColumn("Max Anomaly Score", format="%.4f"),
+            'threshold': st.column_config.NumberColumn("Threshold", format="%.4f"),
+            'cycles_over_threshold': st.column_config.NumberColumn("Cycles > Threshold", format="%d"),
+            'status': st.column_config.TextColumn("Status"),
+        }
+    )
+    st.caption("행을 선택하면 해당 배터리의 상세 분석으로 이동합니다.")
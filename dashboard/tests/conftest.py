@@ -0,0 +1,7 @@
+import os
+import sys
+
+# dashboard/ 를 import 경로에 추가 (main.py와 같은 방식)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
@@ -0,0 +1,71 @@
+"""Anomaly Transformer 배치 추론 테스트 (청크 스트리밍 결과를 전체 배열 계산과 비교)"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.at_inference import iter_file_chunks, run_inference, run_inference_chunks
+
+
+def step_model(batch):
+    """시점별 점수 모델 (윈도우 안 위치에 따라 값이 달라 겹침 처리를 확인할 수 있음)"""
+    return batch.sum(axis=2) * (1.0 + np.arange(batch.shape[1]) / batch.shape[1])
+
+
+def window_model(batch):
+    return batch.mean(axis=(1, 2))
+
+
+def _reference(features, cycles, model, window, stride):
+    n = len(features)
+    starts = list(range(0, n - window + 1, stride))
+    if starts[-1] + window < n:
+        starts.append(n - window)
+    score_sum, counts = np.zeros(n), np.zeros(n)
+    for s in starts:
+        out = np.asarray(model(features[None, s:s + window].astype(np.float32)), dtype=float)
+        out = np.repeat(out[:, None], window, axis=1) if out.ndim == 1 else out
+        score_sum[s:s + window] += out[0]
+        counts[s:s + window] += 1
+    step = score_sum / counts
+    df = pd.DataFrame({'cycle': cycles, 'score': step}).groupby('cycle')['score'].mean()
+    return df.index.to_numpy(), df.to_numpy(), len(starts)
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    n = 1037
+    features = rng.normal(size=(n, 3)).astype(np.float32)
+    cycles = np.repeat(np.arange(n // 25 + 1), 25)[:n]
+    return features, cycles
+
+
+@pytest.mark.parametrize('model', [step_model, window_model])
+@pytest.mark.parametrize('window,stride,chunk_rows', [(100, 100, 64), (100, 30, 250), (50, 50, 5000), (40, 7, 41)])
+def test_chunked_matches_full(series, model, window, stride, chunk_rows):
+    features, cycles = series
+    expected_cycles, expected_scores, n_windows = _reference(features, cycles, model, window, stride)
+    got_cycles, got_scores, stats = run_inference(features, cycles, model, window=window, stride=stride,
+                                                  batch_size=16, chunk_rows=chunk_rows)
+    np.testing.assert_array_equal(got_cycles, expected_cycles)
+    np.testing.assert_allclose(got_scores, expected_scores, rtol=1e-6)
+    assert stats['windows'] == n_windows and stats['steps'] == len(features)
+
+
+def test_workers_and_file_input(series, tmp_path):
+    features, cycles = series
+    path = tmp_path / 'features.parquet'
+    df = pd.DataFrame(features, columns=['a', 'b', 'c'])
+    df['cycle_idx'] = cycles
+    df.to_parquet(path, row_group_size=100)
+    expected = _reference(features, cycles, step_model, 100, 30)
+    got_cycles, got_scores, _ = run_inference_chunks(iter_file_chunks(path, chunk_rows=128), step_model,
+                                                     window=100, stride=30, batch_size=8, workers=2)
+    np.testing.assert_array_equal(got_cycles, expected[0])
+    np.testing.assert_allclose(got_scores, expected[1], rtol=1e-6)
+
+
+def test_short_series_raises(series):
+    features, cycles = series
+    with pytest.raises(ValueError):
+        run_inference(features[:10], cycles[:10], step_model, window=100)
@@ -0,0 +1,119 @@
+"""공유 아티팩트 캐시 테스트"""
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cache import ArtifactCache, cached_artifact, estimate_nbytes
+
+
+class Rerun(BaseException):
+    """Streamlit RerunException 같은 제어 흐름 예외"""
+
+
+def _run_concurrently(cache, leader_load, waiter_load):
+    """리더가 로드 중일 때 같은 키를 요청한 waiter의 (결과, 예외)"""
+    started, release = threading.Event(), threading.Event()
+    result = {}
+
+    def leader():
+        def load():
+            started.set()
+            release.wait(5)
+            return leader_load()
+        try:
+            cache.get_or_load('k', None, load)
+        except BaseException as e:
+            result['leader'] = e
+
+    def waiter():
+        try:
+            result['waiter'] = cache.get_or_load('k', None, waiter_load)
+        except BaseException as e:
+            result['waiter'] = e
+
+    t1 = threading.Thread(target=leader)
+    t1.start()
+    started.wait(5)
+    t2 = threading.Thread(target=waiter)
+    t2.start()
+    # waiter가 flight를 기다리기 시작할 때까지 대기
+    while cache.stats()['waits'] == 0:
+        pass
+    release.set()
+    t1.join(5)
+    t2.join(5)
+    return result
+
+
+def test_waiter_takes_over_after_control_flow_exception():
+    cache = ArtifactCache()
+
+    def interrupted():
+        raise Rerun()
+    result = _run_concurrently(cache, interrupted, lambda: ('fresh', None))
+    assert isinstance(result['leader'], Rerun)
+    assert result['waiter'] == ('fresh', 'miss')
+
+
+def test_waiter_gets_load_error():
+    cache = ArtifactCache()
+
+    def failing():
+        raise FileNotFoundError('missing')
+    result = _run_concurrently(cache, failing, lambda: pytest.fail("waiter should not load"))
+    assert isinstance(result['leader'], FileNotFoundError)
+    assert result['waiter'] is result['leader']
+
+
+def test_lru_eviction_by_byte_budget():
+    item = np.zeros(100)
+    cache = ArtifactCache(max_bytes=int(estimate_nbytes(item) * 2.5))
+    for key in ('a', 'b'):
+        cache.put(key, (), np.zeros(100))
+    assert cache.get('a', ()) is not None  # 'a'를 최근 사용으로
+    cache.put('c', (), np.zeros(100))
+    assert cache.get('b', ()) is None
+    assert cache.get('a', ()) is not None and cache.get('c', ()) is not None
+    assert cache.stats()['evictions'] == 1
+    # 예산보다 큰 항목은 저장하지 않음
+    cache.put('big', (), np.zeros(1000))
+    assert cache.get('big', ()) is None
+
+
+def test_reload_when_file_changes(tmp_path):
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'x': [1, 2]}).to_csv(path, index=False)
+    calls = []
+
+    @cached_artifact("test_reload", lambda: [path])
+    def load():
+        calls.append(1)
+        return pd.read_csv(path)
+
+    assert len(load()) == 2 and len(load()) == 2
+    assert len(calls) == 1
+    pd.DataFrame({'x': [1, 2, 3]}).to_csv(path, index=False)
+    assert len(load()) == 3
+    assert len(calls) == 2
+
+
+def test_shared_values_cannot_change_the_cache(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('x\n1\n')
+
+    @cached_artifact("test_shared", lambda: [path])
+    def load():
+        return {'df': pd.DataFrame({'x': [1.0, 2.0]}), 'scores': np.array([0.1, 0.2])}
+
+    first = load()
+    with pytest.raises(ValueError):
+        first['scores'][0] = 1.0
+    with pytest.raises(TypeError):
+        first['extra'] = 1
+    first['df'].loc[0, 'x'] = 99.0
+    first['df']['y'] = 0
+    second = load()
+    assert second['df']['x'].tolist() == [1.0, 2.0]
+    assert list(second['df'].columns) == ['x']
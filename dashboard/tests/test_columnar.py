@@ -0,0 +1,65 @@
+"""Parquet 변환/컬럼 선택 로딩 테스트"""
+import os
+
+import pandas as pd
+import pytest
+
+from utils.columnar import columnar_path, convert_dataset, read_table, resolve_table_path, table_columns
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    (tmp_path / 'tab2').mkdir()
+    pd.DataFrame({
+        'cycle_idx': [0, 1, 2],
+        'capacity': [2.0, 1.9, 1.8],
+        'dis_volt_min': [2.7, 2.6, 2.5],
+        'dis_temp_max': [38, 39, 40],  # 스키마에 있지만 CSV에서는 정수로 읽힘
+        'dis_time': [3600.0, 3500.0, 3400.0],
+        'extra': [1, 2, 3],  # 스키마 밖의 숫자 컬럼
+    }).to_csv(tmp_path / 'discharge_summary_B0005.csv', index=False)
+    pd.DataFrame({
+        'cycle_idx': [0, 1],
+        'mean_score': [0.5, 1.5],
+        'split': ['train', 'test'],
+        'has_anom': [False, True],
+    }).to_csv(tmp_path / 'tab2' / 'lof_B0005_cycle_summary.csv', index=False)
+    return tmp_path
+
+
+def test_round_trip_dtypes(dataset):
+    converted = convert_dataset(str(dataset))
+    assert len(converted) == 2
+    df = read_table(converted[0])
+    assert df['cycle_idx'].dtype == 'int64'
+    assert df['dis_temp_max'].dtype == 'float64' and df['extra'].dtype == 'float64'
+    pd.testing.assert_frame_equal(df, pd.read_csv(dataset / 'discharge_summary_B0005.csv'), check_dtype=False)
+
+    summary = read_table(columnar_path(dataset / 'tab2' / 'lof_B0005_cycle_summary.csv'))
+    assert isinstance(summary['split'].dtype, pd.CategoricalDtype)
+    assert summary['has_anom'].dtype == 'bool' and summary['has_anom'].tolist() == [False, True]
+    # 이미 최신이면 다시 변환하지 않음
+    assert convert_dataset(str(dataset)) == []
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.parquet'])
+def test_column_projection(dataset, suffix):
+    convert_dataset(str(dataset))
+    path = str(dataset / f'discharge_summary_B0005{suffix}')
+    df = read_table(path, columns=('cycle_idx', 'capacity', 'missing'))
+    assert list(df.columns) == ['cycle_idx', 'capacity']
+    assert 'extra' in table_columns(path)
+
+
+def test_newer_csv_wins_until_reconverted(dataset):
+    csv_path = str(dataset / 'discharge_summary_B0005.csv')
+    assert resolve_table_path(csv_path) == csv_path  # Parquet 없음
+    convert_dataset(str(dataset))
+    assert resolve_table_path(csv_path) == columnar_path(csv_path)
+
+    # CSV를 다시 생성한 상황 (Parquet이 더 오래됨)
+    stat = os.stat(csv_path)
+    os.utime(columnar_path(csv_path), ns=(stat.st_atime_ns, stat.st_mtime_ns - 10_000_000_000))
+    assert resolve_table_path(csv_path) == csv_path
+    convert_dataset(str(dataset))
+    assert resolve_table_path(csv_path) == columnar_path(csv_path)
@@ -0,0 +1,48 @@
+"""상관 엔진 테스트"""
+import numpy as np
+import pandas as pd
+
+from utils.correlation import rolling_pearson
+
+
+def _pandas_rolling(x, y, window):
+    both = ~(np.isnan(x) | np.isnan(y))
+    xs, ys = pd.Series(np.where(both, x, np.nan)), pd.Series(np.where(both, y, np.nan))
+    return xs.rolling(window, min_periods=2).corr(ys).to_numpy()
+
+
+def test_rolling_pearson_matches_pandas():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=200)
+    y = x + rng.normal(size=200)
+    r = rolling_pearson(x, y, 30)
+    assert np.isnan(r[:29]).all()
+    np.testing.assert_allclose(r[29:], _pandas_rolling(x, y, 30)[29:], atol=1e-12)
+
+
+def test_rolling_pearson_skips_nan_pairs():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=200)
+    y = x + rng.normal(size=200)
+    x[50] = np.nan
+    y[120] = np.nan
+    r = rolling_pearson(x, y, 30)
+    # NaN 하나가 전체 시리즈를 NaN으로 만들지 않음
+    assert np.isfinite(r[29:]).all()
+    np.testing.assert_allclose(r[29:], _pandas_rolling(x, y, 30)[29:], atol=1e-12)
+
+
+def test_large_n_uses_fisher_ci(monkeypatch):
+    import utils.correlation as correlation
+
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=400)
+    y = x + rng.normal(size=400)
+    cycles = np.arange(len(x))
+    small = correlation.analyze(cycles, x, {'y': y}, n_resamples=2000)['y']
+    monkeypatch.setattr(correlation, 'BOOTSTRAP_MAX_N', 100)
+    large = correlation.analyze(cycles, x, {'y': y}, n_resamples=2000)['y']
+    assert small['ci_method'] == 'bootstrap' and large['ci_method'] == 'fisher'
+    # 근사 구간은 bootstrap 구간과 거의 같아야 함
+    np.testing.assert_allclose(large['pearson_ci'], small['pearson_ci'], atol=0.03)
+    np.testing.assert_allclose(large['spearman_ci'], small['spearman_ci'], atol=0.03)
@@ -0,0 +1,47 @@
+"""시계열 축소 테스트"""
+import numpy as np
+import pytest
+
+from utils.decimate import StreamingLTTB, decimate, lttb, minmax
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_000, dtype=float)
+    y = np.cumsum(rng.normal(size=len(x)))
+    y[100:400] = np.nan  # 결측 구간 (rolling 지표 시작부 등)
+    return x, y
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+@pytest.mark.parametrize('budget', [4, 5, 50, 2000, 9_999])
+def test_budget_endpoints_and_keep(series, method, budget):
+    x, y = series
+    keep = np.array([7, 3_333, 3_333, 9_998])
+    idx = decimate(x, y, budget, method, keep=keep)
+    assert len(idx) <= max(budget, len(np.unique(keep)) + 2)
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert set(keep.tolist()) <= set(idx.tolist())
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_budget_not_exceeded_without_keep(series):
+    x, y = series
+    for budget in (4, 7, 101, 2000):
+        assert len(lttb(x, y, budget)) == budget
+        assert len(minmax(x, y, budget)) <= budget
+
+
+def test_small_series_is_untouched(series):
+    x, y = series
+    assert decimate(x[:50], y[:50], 2000).tolist() == list(range(50))
+
+
+def test_streaming_matches_one_shot_after_appends(series):
+    x, y = series
+    decimator = StreamingLTTB(500)
+    for n in (300, 500, 501, 2_000, 2_000, 7_531, 10_000):
+        idx = decimator.update(x[:n], y[:n])
+        expected = np.arange(n) if n <= 500 else lttb(x[:n], y[:n], 500)
+        assert idx.tolist() == expected.tolist()
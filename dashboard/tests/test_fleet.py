@@ -0,0 +1,47 @@
+"""fleet 테이블 테스트 (캐시, 손상된 배터리 파일)"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.fleet as fleet
+from utils import dataloader
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    monkeypatch.setenv('BATTERY_DATASET_DIR', str(tmp_path))
+    monkeypatch.setattr(dataloader, '_remote_missing', set())
+    (tmp_path / 'tab2').mkdir()
+    for i, battery_id in enumerate(['B0005', 'B0006']):
+        cycles = np.arange(20)
+        pd.DataFrame({'cycle_idx': cycles, 'capacity': 2.0 - 0.01 * cycles}).to_csv(
+            tmp_path / f'discharge_summary_{battery_id}.csv', index=False)
+        pd.DataFrame({'cycle_idx': cycles, 'mean_score': np.linspace(0, 1 + i, 20)}).to_csv(
+            tmp_path / 'tab2' / f'lof_{battery_id}_cycle_summary.csv', index=False)
+        (tmp_path / 'tab2' / f'lof_{battery_id}_metadata.json').write_text('{"threshold": 0.9}')
+    return tmp_path
+
+
+def test_fleet_table_is_cached_until_inputs_change(dataset, monkeypatch):
+    calls = []
+    summarize = fleet.summarize_battery
+    monkeypatch.setattr(fleet, 'summarize_battery', lambda *args: calls.append(args[0]) or summarize(*args))
+
+    table, _ = fleet.load_fleet(['B0005', 'B0006'], "LOF", "Raw Data")
+    assert table['battery_id'].tolist() == ['B0006', 'B0005']
+    fleet.load_fleet(['B0005', 'B0006'], "LOF", "Raw Data")
+    assert len(calls) == 2
+
+    path = dataset / 'discharge_summary_B0005.csv'
+    pd.read_csv(path).iloc[:10].to_csv(path, index=False)
+    table, _ = fleet.load_fleet(['B0005', 'B0006'], "LOF", "Raw Data")
+    assert len(calls) == 4
+    assert table.set_index('battery_id').loc['B0005', 'cycles'] == 10
+
+
+def test_corrupt_battery_does_not_fail_the_table(dataset):
+    (dataset / 'tab2' / 'lof_B0006_metadata.json').write_text('{not json')
+    table = fleet.summarize_fleet(['B0005', 'B0006'], "LOF", "Raw Data").set_index('battery_id')
+    assert table.loc['B0005', 'status'] == "OK"
+    assert table.loc['B0006', 'status'] == "Unreadable anomaly scores"
+    assert table.loc['B0006', 'cycles'] == 20
@@ -0,0 +1,57 @@
+"""KD-tree LOF 엔진 테스트 (sklearn LocalOutlierFactor와 비교)"""
+import numpy as np
+import pytest
+from sklearn.neighbors import LocalOutlierFactor
+
+from utils.lof_engine import LOFIndex
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    # 피처마다 스케일이 크게 다름 (표준화하면 sklearn과 달라짐)
+    scale = np.array([1.0, 100.0, 0.01, 5.0])
+    train = rng.normal(size=(500, 4)) * scale
+    train[:10] = train[10:20]  # 중복 포인트
+    test = np.vstack([rng.normal(size=(200, 4)), rng.normal(scale=4.0, size=(20, 4))]) * scale
+    return train, test
+
+
+def test_scores_match_sklearn(data):
+    train, test = data
+    lof = LocalOutlierFactor(n_neighbors=20, novelty=True).fit(train)
+    index = LOFIndex(train, n_neighbors=20)
+    np.testing.assert_allclose(index.train_scores, -lof.negative_outlier_factor_, rtol=1e-9)
+    np.testing.assert_allclose(index.score(test, batch_size=64), -lof.score_samples(test), rtol=1e-9)
+
+
+def test_small_training_set_clamps_neighbors(data):
+    train, test = data
+    lof = LocalOutlierFactor(n_neighbors=20, novelty=True).fit(train[:8])
+    index = LOFIndex(train[:8], n_neighbors=20)
+    assert index.n_neighbors == 7
+    np.testing.assert_allclose(index.score(test), -lof.score_samples(test), rtol=1e-9)
+
+
+@pytest.mark.parametrize('convert', [False, True])
+def test_append_keeps_history_in_the_loaded_format(tmp_path, monkeypatch, convert):
+    import pandas as pd
+
+    from utils.columnar import convert_dataset, read_table
+    from utils.dataloader import lof_cycle_summary_paths
+    from utils.lof_engine import append_cycle_summary
+
+    monkeypatch.setenv('BATTERY_DATASET_DIR', str(tmp_path))
+    (tmp_path / 'tab2').mkdir()
+    history = pd.DataFrame({'cycle_idx': [0, 1], 'mean_score': [0.5, 1.5],
+                            'split': ['train', 'test'], 'has_anom': [False, True]})
+    history.to_csv(tmp_path / 'tab2' / 'lof_B0005_cycle_summary.csv', index=False)
+    if convert:
+        convert_dataset(str(tmp_path))
+        (tmp_path / 'tab2' / 'lof_B0005_cycle_summary.csv').unlink()  # Parquet만 있는 데이터셋
+
+    new = pd.DataFrame({'cycle_idx': [2], 'mean_score': [2.5], 'split': ['test'], 'has_anom': [True]})
+    written = append_cycle_summary('B0005', "Raw Data", new)
+    path, _ = lof_cycle_summary_paths('B0005', "Raw Data")
+    assert written == path and path.endswith('.parquet' if convert else '.csv')
+    assert read_table(path)['cycle_idx'].tolist() == [0, 1, 2]
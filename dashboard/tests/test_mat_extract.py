@@ -0,0 +1,65 @@
+"""방전 요약 추출 테스트"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.mat_extract as mat_extract
+
+
+def _discharge(n, capacity):
+    t = np.arange(n, dtype=float)
+    return {'type': 'discharge', 'data': {
+        'Voltage_measured': 4.2 - 0.01 * t, 'Current_measured': -2.0 + 0 * t,
+        'Temperature_measured': 24.0 + 0.1 * t, 'Time': 10.0 * t, 'Capacity': capacity}}
+
+
+def _cycles():
+    return [
+        {'type': 'charge', 'data': {}},
+        {'type': 'impedance', 'data': {'Re': 0.05}},
+        _discharge(50, 1.9),
+        {'type': 'charge', 'data': {}},
+        _discharge(0, 1.8),  # 샘플 없는 방전
+        _discharge(40, 1.7),
+        {'type': 'impedance', 'data': {'Re': 0.06}},
+        _discharge(30, 1.6),
+    ]
+
+
+@pytest.fixture
+def mat(tmp_path, monkeypatch):
+    cycles = _cycles()
+    monkeypatch.setattr(mat_extract, 'load_cycles', lambda path: cycles)
+    return cycles
+
+
+def test_summary_uses_raw_cycle_index_and_skips_empty(mat):
+    summary = mat_extract.summarize_discharges(mat)
+    assert summary['cycle_idx'].tolist() == [2, 5, 7]
+    np.testing.assert_allclose(summary['capacity'], [1.9, 1.7, 1.6])
+    np.testing.assert_allclose(summary['dis_volt_min'], [4.2 - 0.49, 4.2 - 0.39, 4.2 - 0.29])
+    np.testing.assert_allclose(summary['dis_time'], [490.0, 390.0, 290.0])
+    assert 'R_ohmic' not in summary.columns
+
+
+def test_resume_by_membership(mat, tmp_path):
+    path = mat_extract.summary_path('B0005', tmp_path)
+    # 중간 사이클만 빠진 기존 요약
+    mat_extract.summarize_discharges(mat, skip={5}).to_csv(path, index=False)
+    _, added, _ = mat_extract.extract_battery('B0005.mat', tmp_path)
+    assert added == 1
+    assert sorted(pd.read_csv(path)['cycle_idx']) == [2, 5, 7]
+    assert mat_extract.extract_battery('B0005.mat', tmp_path)[1] == 0
+
+
+def test_fills_correlation_ohmic(mat, tmp_path):
+    tab5 = tmp_path / 'tab5'
+    tab5.mkdir()
+    path = tab5 / 'B0005_correlation_lof.csv'
+    pd.DataFrame({'cycle_idx': [2, 5, 7], 'mean_score': [0.1, 0.2, 0.3], 'Capacity': [1.9, 1.8, 1.7],
+                  'R_ohmic': [0.01, np.nan, np.nan]}).to_csv(path, index=False)
+    (tab5 / 'B0005_correlation_metadata_lof.json').write_text('{}')
+
+    assert mat_extract.extract_battery('B0005.mat', tmp_path)[2] == 2
+    np.testing.assert_allclose(pd.read_csv(path)['R_ohmic'], [0.01, 0.05, 0.06])
+    assert mat_extract.extract_battery('B0005.mat', tmp_path)[2] == 0
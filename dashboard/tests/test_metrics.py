@@ -0,0 +1,96 @@
+"""헤더 메트릭 테스트"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.metrics as metrics
+from utils import dataloader
+from utils.s3sync import LocalDirClient
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    local = tmp_path / 'local'
+    remote = tmp_path / 'remote'
+    local.mkdir()
+    monkeypatch.setenv('BATTERY_DATASET_DIR', str(local))
+    monkeypatch.setattr(dataloader, 'get_s3_client', lambda: LocalDirClient(remote))
+    monkeypatch.setattr(dataloader, '_remote_missing', set())
+    return local, remote / dataloader.S3_BUCKET / dataloader.S3_PREFIX
+
+
+def _write_lof(dataset_dir):
+    rng = np.random.default_rng(0)
+    cycles = np.arange(50)
+    score = rng.random(50)
+    (dataset_dir / 'tab5').mkdir(parents=True)
+    (dataset_dir / 'tab2').mkdir(parents=True)
+    pd.DataFrame({'cycle_idx': cycles, 'mean_score': score, 'Capacity': -score + rng.normal(scale=0.1, size=50),
+                  'R_ohmic': score}).to_csv(dataset_dir / 'tab5' / 'B0005_correlation_lof.csv', index=False)
+    (dataset_dir / 'tab5' / 'B0005_correlation_metadata_lof.json').write_text('{}')
+    pd.DataFrame({'cycle_idx': cycles, 'mean_score': score}).to_csv(
+        dataset_dir / 'tab2' / 'lof_B0005_cycle_summary.csv', index=False)
+    (dataset_dir / 'tab2' / 'lof_B0005_metadata.json').write_text('{"threshold": 0.9}')
+
+
+def test_metrics_table_is_fetched_from_remote(dataset):
+    local, remote = dataset
+    remote.mkdir(parents=True)
+    pd.DataFrame([{'battery_id': 'B0005', 'model_type': 'LOF', 'preprocessing': 'Raw Data',
+                   'first_anomaly_cycle': 3, 'capacity_corr': -0.5, 'rohmic_corr': 0.4,
+                   'capacity_p': 0.001, 'rohmic_p': 0.01, 'n_cycles': 50,
+                   'capacity_delta_pct': 0.0, 'rohmic_delta_pct': 0.0}]).to_csv(remote / 'metrics.csv', index=False)
+    assert metrics.get_metrics('LOF', 'Raw Data', 'B0005')['anomaly_cycle'] == 'Cycle 3'
+    assert (local / 'metrics.csv').exists()
+
+
+def test_fallback_is_cached_until_inputs_change(dataset, monkeypatch):
+    local, _ = dataset
+    _write_lof(local)
+    calls = []
+    compute = metrics.compute_metrics
+    monkeypatch.setattr(metrics, 'compute_metrics', lambda combos: calls.append(combos) or compute(combos))
+
+    first = metrics.get_metrics('LOF', 'Raw Data', 'B0005')
+    assert metrics.get_metrics('LOF', 'Raw Data', 'B0005') == first
+    assert len(calls) == 1
+
+    path = local / 'tab5' / 'B0005_correlation_lof.csv'
+    df = pd.read_csv(path)
+    df['Capacity'] = df['mean_score']
+    df.to_csv(path, index=False)
+    assert metrics.get_metrics('LOF', 'Raw Data', 'B0005')['capacity_corr'] == '+1.000'
+    assert len(calls) == 2
+
+
+def test_missing_metrics_table_is_not_refetched_every_rerun(dataset, monkeypatch):
+    local, _ = dataset
+    _write_lof(local)
+    heads = []
+
+    class SpyClient(LocalDirClient):
+        def head_object(self, Bucket, Key):
+            heads.append(Key)
+            return super().head_object(Bucket=Bucket, Key=Key)
+
+    spy = SpyClient(local.parent / 'remote')
+    monkeypatch.setattr(dataloader, 'get_s3_client', lambda: spy)
+    metrics.get_metrics('LOF', 'Raw Data', 'B0005')
+    first = len(heads)
+    assert first
+    for _ in range(3):
+        assert metrics.get_metrics('LOF', 'Raw Data', 'B0005')['capacity_corr'] != 'N/A'
+    # 원격에도 없다는 것을 한 번 확인한 뒤에는 S3에 다시 묻지 않음
+    assert len(heads) == first
+
+
+def test_offline_without_metrics_table_falls_back(dataset, monkeypatch):
+    local, _ = dataset
+    _write_lof(local)
+
+    def no_client():
+        raise ModuleNotFoundError("No module named 'boto3'")
+
+    monkeypatch.setattr(dataloader, 'get_s3_client', no_client)
+    assert metrics.get_metrics('LOF', 'Raw Data', 'B0005')['capacity_corr'] != 'N/A'
+    assert metrics.get_metrics('LOF', 'Raw Data', 'B0005')['anomaly_cycle'] != 'N/A'
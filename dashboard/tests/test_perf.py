@@ -0,0 +1,39 @@
+"""perf 계측 통계 테스트"""
+import pytest
+
+from utils import perf
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    perf.reset_stats()
+    yield
+    perf.reset_stats()
+    perf.end_run()
+
+
+def _sample_line(text, name):
+    return next(line for line in text.splitlines() if line.startswith(name))
+
+
+def test_prometheus_sum_and_count_are_lifetime(monkeypatch):
+    monkeypatch.setattr(perf, '_samples', perf.defaultdict(lambda: perf.deque(maxlen=3)))
+    for _ in range(5):
+        perf.record("stage.a", 1.0)
+    stats = perf.stage_stats()["stage.a"]
+    # 분위수는 최근 구간, _sum/_count는 누적 (구간 밖으로 밀려난 기록도 포함)
+    assert stats['count'] == 3 and stats['total_count'] == 5
+    text = perf.prometheus_text()
+    assert _sample_line(text, 'dashboard_stage_seconds_count').endswith(' 5')
+    assert _sample_line(text, 'dashboard_stage_seconds_sum').endswith(' 5.000000')
+
+
+def test_run_record_is_bounded(monkeypatch):
+    monkeypatch.setattr(perf, 'PERF_RUN_MAX_ENTRIES', 4)
+    perf.begin_run()
+    for i in range(10):
+        perf.record("stage.b", 0.1, step=i)
+    run = perf.current_run()
+    assert [e['step'] for e in run] == [6, 7, 8, 9]
+    perf.begin_run()
+    assert perf.current_run() == []
@@ -0,0 +1,60 @@
+"""백그라운드 prefetch 테스트 (공유 풀, 진행 중 조합 중복 제거, 실패 로그)"""
+import logging
+import threading
+
+import pytest
+
+from utils import dataloader
+
+KEY = ("B0005", "LOF", "Raw Data")
+
+
+@pytest.fixture
+def fetches(tmp_path, monkeypatch):
+    """fetch_table/fetch_results 대신 호출 경로를 기록하고 release가 set될 때까지 막는 가짜"""
+    monkeypatch.setenv('BATTERY_DATASET_DIR', str(tmp_path))
+    monkeypatch.setattr(dataloader, 'DATA_FETCH_MODE', "lazy")
+    monkeypatch.setattr(dataloader, '_remote_missing', set())
+    calls, release = [], threading.Event()
+
+    def fake_fetch(path):
+        calls.append(path)
+        release.wait(5)
+        if path.endswith('.json'):
+            raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(dataloader, 'fetch_table', fake_fetch)
+    monkeypatch.setattr(dataloader, 'fetch_results', fake_fetch)
+    yield calls, release
+    release.set()
+
+
+def _wait_until_idle(key):
+    for _ in range(500):
+        with dataloader._prefetch_lock:
+            if key not in dataloader._prefetch_inflight:
+                return
+        threading.Event().wait(0.01)
+    raise AssertionError("prefetch가 끝나지 않음")
+
+
+def test_inflight_combination_is_not_resubmitted(fetches, caplog):
+    calls, release = fetches
+    dataloader.prefetch_in_background(*KEY)
+    pool = dataloader._prefetch_pool
+    dataloader.prefetch_in_background(*KEY)
+    assert KEY in dataloader._prefetch_inflight
+
+    with caplog.at_level(logging.WARNING, logger=dataloader.__name__):
+        release.set()
+        _wait_until_idle(KEY)
+    assert dataloader._prefetch_pool is pool
+    # 두 번째 호출은 제출되지 않아 경로마다 한 번씩만 받음
+    assert calls and len(calls) == len(set(calls))
+    # 실패는 조용히 삼키지 않고 경로와 함께 로그로 남김
+    failed = [r for r in caplog.records if "prefetch 실패" in r.getMessage()]
+    assert failed and all(r.exc_info for r in failed)
+
+    dataloader.prefetch_in_background(*KEY)
+    _wait_until_idle(KEY)
+    assert dataloader._prefetch_pool is pool
@@ -0,0 +1,35 @@
+"""Anomaly Transformer 결과 저장소 테스트 (pickle 변환)"""
+import os
+import pickle
+
+import numpy as np
+
+from utils.results_store import load_pickle_results, load_results, migrate_pickle, store_paths
+
+
+def test_migrated_store_matches_pickle(tmp_path):
+    pkl_path = tmp_path / 'test_results_B0005.pkl'
+    raw = {'cycle_scores': {5: 0.3, 1: 0.9, 3: 0.1}, 'threshold': 0.5}
+    pkl_path.write_bytes(pickle.dumps(raw))
+
+    assert migrate_pickle(str(pkl_path))
+    assert not migrate_pickle(str(pkl_path))  # 이미 최신
+    results = load_results(*store_paths(pkl_path))
+    assert results['cycles'].tolist() == [1, 3, 5]
+    np.testing.assert_array_equal(results['scores'], [0.9, 0.1, 0.3])
+    assert results['threshold'] == 0.5
+    # 메모리 매핑 view라 쓰기 불가
+    assert not results['scores'].flags.writeable
+
+    legacy = load_pickle_results(str(pkl_path))
+    np.testing.assert_array_equal(legacy['cycles'], results['cycles'])
+    np.testing.assert_array_equal(legacy['scores'], results['scores'])
+
+    # pickle이 더 최신이면 다시 변환
+    raw['cycle_scores'][7] = 2.0
+    pkl_path.write_bytes(pickle.dumps(raw))
+    npy_path, _ = store_paths(pkl_path)
+    stat = os.stat(pkl_path)
+    os.utime(npy_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10_000_000_000))
+    assert migrate_pickle(str(pkl_path))
+    assert load_results(*store_paths(pkl_path))['cycles'].tolist() == [1, 3, 5, 7]
@@ -0,0 +1,139 @@
+"""s3sync 오프라인 테스트 (LocalDirClient로 S3를 대신함)"""
+import hashlib
+import json
+import time
+
+import pytest
+
+from utils import s3sync
+from utils.s3sync import LocalDirClient, is_synced, load_manifest, sync_prefix
+
+BUCKET = "bkt"
+PREFIX = "p/"
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(s3sync, 'RETRY_BACKOFF', 0.0)
+
+
+@pytest.fixture
+def remote(tmp_path):
+    root = tmp_path / "remote"
+    (root / BUCKET / "p").mkdir(parents=True)
+    (root / BUCKET / "p" / "a.csv").write_bytes(b"x,y\n1,2\n")
+    (root / BUCKET / "p" / "b.csv").write_bytes(b"x,y\n3,4\n5,6\n")
+    return root
+
+
+def test_sync_downloads_everything(remote, tmp_path):
+    local = tmp_path / "local"
+    report = sync_prefix(LocalDirClient(remote), BUCKET, PREFIX, local)
+    assert report['downloaded'] == 2 and not report['failed']
+    assert (local / "b.csv").read_bytes() == (remote / BUCKET / "p" / "b.csv").read_bytes()
+    assert is_synced(local)
+
+
+def test_failed_download_is_retried_on_next_sync(remote, tmp_path):
+    local = tmp_path / "local"
+    report = sync_prefix(LocalDirClient(remote, corrupt_keys={'p/b.csv'}), BUCKET, PREFIX, local)
+    assert [key for key, _ in report['failed']] == ['b.csv']
+    assert not (local / "b.csv").exists()
+    assert load_manifest(local)['b.csv']['incomplete']
+    # 실패한 파일이 남아 있으면 동기화된 것으로 보지 않음
+    assert not is_synced(local)
+
+    report = sync_prefix(LocalDirClient(remote), BUCKET, PREFIX, local)
+    assert report['downloaded'] == 1 and report['skipped'] == 1
+    assert (local / "b.csv").read_bytes() == (remote / BUCKET / "p" / "b.csv").read_bytes()
+    assert 'incomplete' not in load_manifest(local)['b.csv']
+    assert is_synced(local)
+
+
+def test_stale_sync_rechecks_remote(remote, tmp_path):
+    local = tmp_path / "local"
+    sync_prefix(LocalDirClient(remote), BUCKET, PREFIX, local)
+    state = local / s3sync.SYNC_STATE_NAME
+    state.write_text(json.dumps({'synced_at': time.time() - s3sync.SYNC_MAX_AGE - 1}))
+    assert not is_synced(local)
+
+    (remote / BUCKET / "p" / "c.csv").write_bytes(b"x,y\n7,8\n")
+    report = sync_prefix(LocalDirClient(remote), BUCKET, PREFIX, local)
+    assert report['downloaded'] == 1
+    assert (local / "c.csv").exists() and is_synced(local)
+
+
+@pytest.fixture
+def big(tmp_path, monkeypatch):
+    """작은 파트 크기로 byte range 다운로드 경로를 타는 원격 객체"""
+    monkeypatch.setattr(s3sync, 'MULTIPART_THRESHOLD', 1000)
+    root = tmp_path / "remote"
+    (root / BUCKET / "p").mkdir(parents=True)
+    data = bytes(range(256)) * 40
+    (root / BUCKET / "p" / "big.bin").write_bytes(data)
+    return root, data
+
+
+def _md5(data):
+    return hashlib.md5(data).hexdigest()
+
+
+def test_ranged_download_survives_dropped_connections(big, tmp_path):
+    root, data = big
+    local = tmp_path / "local" / "big.bin"
+    client = LocalDirClient(root, fail_every=3)
+    s3sync.download_ranged(client, BUCKET, "p/big.bin", local, len(data), _md5(data), part_size=1024)
+    assert local.read_bytes() == data
+    assert not local.with_name("big.bin.part").exists() and not local.with_name("big.bin.part.json").exists()
+
+
+def test_ranged_download_resumes_remaining_parts(big, tmp_path):
+    root, data = big
+    local = tmp_path / "local" / "big.bin"
+    client = LocalDirClient(root)
+    original = client.get_object
+
+    def interrupted(Bucket, Key, Range=None):
+        if Range.startswith("bytes=5120-"):
+            raise RuntimeError("interrupted")
+        return original(Bucket, Key, Range)
+
+    client.get_object = interrupted
+    with pytest.raises(RuntimeError):
+        s3sync.download_ranged(client, BUCKET, "p/big.bin", local, len(data), _md5(data),
+                               part_size=1024, max_workers=1, retries=0)
+    assert not local.exists()
+
+    client = LocalDirClient(root)
+    s3sync.download_ranged(client, BUCKET, "p/big.bin", local, len(data), _md5(data), part_size=1024)
+    assert local.read_bytes() == data
+    # 끊긴 파트부터만 다시 받음 (max_workers=1이라 앞의 5개 파트는 완료)
+    assert client.get_calls == len(range(0, len(data), 1024)) - 5
+
+
+def test_corrupt_ranged_download_is_discarded(big, tmp_path):
+    root, data = big
+    local = tmp_path / "local"
+    report = sync_prefix(LocalDirClient(root, corrupt_keys={'p/big.bin'}), BUCKET, PREFIX, local)
+    assert [key for key, _ in report['failed']] == ['big.bin']
+    assert not any(local.glob("big.bin*"))
+
+    report = sync_prefix(LocalDirClient(root), BUCKET, PREFIX, local)
+    assert report['downloaded'] == 1 and (local / "big.bin").read_bytes() == data
+
+
+def test_unmatched_multipart_etag_is_unverifiable(tmp_path):
+    path = tmp_path / "f.bin"
+    path.write_bytes(b"x" * 3000)
+    assert s3sync.etag_matches(path, _md5(b"x" * 3000)) is True
+    assert s3sync.etag_matches(path, _md5(b"y")) is False
+    # 파트 크기를 알 수 없는 멀티파트 ETag는 불일치로 보지 않음
+    assert s3sync.etag_matches(path, _md5(b"y") + "-1") is None
+
+
+def test_sse_kms_objects_skip_md5_check(remote, tmp_path):
+    local = tmp_path / "local"
+    client = LocalDirClient(remote, kms_keys={'p/a.csv'})
+    report = sync_prefix(client, BUCKET, PREFIX, local)
+    assert report['downloaded'] == 2 and not report['failed']
+    assert s3sync.fetch_object(client, BUCKET, PREFIX, tmp_path / "lazy", "a.csv").exists()
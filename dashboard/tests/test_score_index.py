@@ -0,0 +1,60 @@
+"""점수 정렬 인덱스 테스트 (pandas 전수 계산과 비교)"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import score_index
+from utils.score_index import build_score_index, count_above, cycles_above, plot_positions, threshold_summary, top_k
+
+
+@pytest.fixture
+def index():
+    rng = np.random.default_rng(0)
+    # 동점이 많은 점수 + 뒤섞인 cycle 순서
+    scores = rng.integers(0, 20, size=300) / 10
+    cycles = rng.permutation(300) + 1
+    return build_score_index(cycles, scores, threshold=1.0)
+
+
+def _frame(index):
+    return pd.DataFrame({'cycle': index['cycles'], 'score': index['scores']})
+
+
+def _descending(df):
+    """점수 내림차순, 동점은 앞선 cycle 우선"""
+    return df.sort_values(['score', 'cycle'], ascending=[False, True], kind='stable')
+
+
+@pytest.mark.parametrize('t', [-1.0, 0.0, 0.55, 1.0, 1.2, 1.9, 5.0])
+def test_queries_match_brute_force(index, t):
+    df = _frame(index)
+    # t는 점수와 정확히 같은 값도 포함 (같으면 넘지 않은 것으로 봄)
+    above = _descending(df[df['score'] > t])
+    assert count_above(index, t) == len(above)
+
+    cycles, scores = cycles_above(index, t)
+    assert cycles.tolist() == above['cycle'].tolist()
+    assert scores.tolist() == above['score'].tolist()
+    cycles, _ = cycles_above(index, t, limit=7)
+    assert cycles.tolist() == above['cycle'].head(7).tolist()
+
+    summary = threshold_summary(index, t)
+    assert summary['above'] == len(above)
+    assert summary['critical'] == int((df['score'] > t * score_index.CRITICAL_FACTOR).sum())
+    assert summary['total'] == len(df)
+
+
+@pytest.mark.parametrize('k', [0, 1, 5, 17, 300, 400])
+def test_top_k_matches_brute_force_with_ties(index, k):
+    expected = _descending(_frame(index)).head(k)['cycle'].tolist()
+    assert index['cycles'][top_k(index, k)].tolist() == expected
+
+
+def test_top_k_tie_at_boundary():
+    index = build_score_index([1, 2, 3, 4, 5], [1.0, 5.0, 5.0, 5.0, 2.0], threshold=1.0)
+    assert index['cycles'][top_k(index, 2)].tolist() == [2, 3]
+
+
+def test_plot_positions_budget_larger_than_n(index):
+    positions = plot_positions(index, point_budget=10_000)
+    assert positions.tolist() == list(range(len(index['cycles'])))
@@ -0,0 +1,60 @@
+"""live tail 테스트"""
+import numpy as np
+import pandas as pd
+
+from utils.decimate import StreamingLTTB
+from utils.tail import TableTail
+
+
+def _rows(start, stop):
+    cycles = np.arange(start, stop)
+    return ''.join(f'{c},{np.sin(c / 7.0):.6f},{"test" if c % 2 else "val"}\n' for c in cycles)
+
+
+def test_partial_header_waits_for_newline(tmp_path):
+    path = tmp_path / 'summary.csv'
+    path.write_text('cycle_idx,mean_sc')
+    tail = TableTail(path)
+    assert len(tail.poll()) == 0 and len(tail) == 0
+    with open(path, 'a') as f:
+        f.write('ore,split\n' + _rows(0, 3))
+    assert len(tail.poll()) == 3
+    assert tail.take(slice(None)).columns.tolist() == ['cycle_idx', 'mean_score', 'split']
+
+
+def test_poll_appends_only_new_rows(tmp_path):
+    path = tmp_path / 'summary.csv'
+    path.write_text('cycle_idx,mean_score,split\n' + _rows(0, 100) + '100,0.5')
+    tail = TableTail(path, columns=('cycle_idx', 'mean_score'))
+    assert len(tail.poll()) == 100
+    with open(path, 'a') as f:
+        f.write(',val\n' + _rows(101, 5000))
+    assert len(tail.poll()) == 4900
+    expected = pd.read_csv(path, usecols=['cycle_idx', 'mean_score'])
+    np.testing.assert_array_equal(tail.column('cycle_idx'), expected['cycle_idx'])
+    np.testing.assert_allclose(tail.column('mean_score'), expected['mean_score'])
+
+
+def test_sample_keeps_budget_and_top_rows(tmp_path):
+    path = tmp_path / 'summary.csv'
+    path.write_text('cycle_idx,mean_score,split\n')
+    tail = TableTail(path)
+    for start in range(0, 20000, 1000):
+        with open(path, 'a') as f:
+            f.write(_rows(start, start + 1000))
+        tail.poll()
+        sample = tail.sample('cycle_idx', ('mean_score',), point_budget=500, top='mean_score')
+        assert len(sample) <= 505
+
+    scores = tail.column('mean_score')
+    top = np.sort(np.argsort(-scores, kind='stable')[:5])
+    assert set(tail.column('cycle_idx')[top]) <= set(sample['cycle_idx'])
+    # 첫/마지막 행은 항상 남음
+    assert sample['cycle_idx'].iloc[0] == 0 and sample['cycle_idx'].iloc[-1] == 19999
+
+
+def test_streaming_lttb_resets_on_shrink():
+    decimator = StreamingLTTB(100)
+    x = np.arange(1000, dtype=float)
+    assert len(decimator.update(x, np.sin(x))) <= 100
+    assert decimator.update(x[:10], np.sin(x[:10])).tolist() == list(range(10))
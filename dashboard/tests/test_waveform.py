@@ -0,0 +1,82 @@
+"""파형 저장소 테스트"""
+import json
+
+import numpy as np
+import pytest
+
+import utils.waveform as waveform
+
+
+def _discharge(n, offset):
+    t = np.arange(n, dtype=float)
+    return {'type': 'discharge', 'data': {'Time': t, 'Voltage_measured': 4.0 + offset + 0 * t,
+                                          'Current_measured': -2.0 + 0 * t, 'Temperature_measured': 25.0 + t}}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv('BATTERY_DATASET_DIR', str(tmp_path))
+    cycles = [{'type': 'charge', 'data': {}}, _discharge(5, 0.0), {'type': 'impedance', 'data': {}},
+              _discharge(7, 0.1), {'type': 'charge', 'data': {}}, _discharge(3, 0.2)]
+    cycle_idx, waveforms = waveform.discharge_waveforms(cycles)
+    waveform.write_store('B0005', cycle_idx, waveforms, tmp_path)
+    return tmp_path
+
+
+def test_store_keyed_by_raw_cycle_index(store):
+    assert waveform.has_waveforms('B0005')
+    assert waveform.stored_cycles(waveform.load_waveform_store('B0005')).tolist() == [1, 3, 5]
+    cycle = waveform.load_cycle('B0005', 3)
+    np.testing.assert_allclose(cycle['voltage'], np.full(7, 4.1, dtype=np.float32))
+    with pytest.raises(KeyError):
+        waveform.load_cycle('B0005', 2)
+
+
+def test_reference_cycle_uses_score_numbering(store):
+    store_data = waveform.load_waveform_store('B0005')
+    scores = np.array([0.9, 0.1, 0.5])
+    index = {'cycles': np.array([1, 3, 5]), 'order': np.argsort(scores, kind='stable')}
+    assert waveform.reference_cycle(index, store_data) == 3
+    # 다른 번호 체계(1부터 시작하는 방전 순번 등)와는 겹치지 않으면 None
+    index = {'cycles': np.array([10, 11, 12]), 'order': np.argsort(scores, kind='stable')}
+    assert waveform.reference_cycle(index, store_data) is None
+
+
+def test_old_store_version_is_rejected(store):
+    meta_path = waveform.waveform_paths('B0005')[2]
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta['version'] = 1
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f)
+    with pytest.raises(ValueError):
+        waveform.load_waveform_store('B0005')
+
+
+def test_has_waveforms_fetches_lazily(store, tmp_path, monkeypatch):
+    import shutil
+
+    from utils import dataloader
+    from utils.s3sync import LocalDirClient
+
+    remote = tmp_path / 'remote'
+    shutil.copytree(store / 'waveform', remote / dataloader.S3_BUCKET / dataloader.S3_PREFIX / 'waveform')
+    shutil.rmtree(store / 'waveform')
+    monkeypatch.setattr(dataloader, 'get_s3_client', lambda: LocalDirClient(remote))
+    monkeypatch.setattr(waveform, '_missing_stores', set())
+
+    assert not waveform.has_waveforms('B0006')
+    assert waveform.has_waveforms('B0005')
+    assert waveform.load_cycle('B0005', 5)['voltage'].shape == (3,)
+
+
+def test_has_waveforms_offline(tmp_path, monkeypatch):
+    from utils import dataloader
+
+    def no_client():
+        raise ModuleNotFoundError("No module named 'boto3'")
+
+    monkeypatch.setenv('BATTERY_DATASET_DIR', str(tmp_path))
+    monkeypatch.setattr(dataloader, 'get_s3_client', no_client)
+    monkeypatch.setattr(waveform, '_missing_stores', set())
+    assert not waveform.has_waveforms('B0005')
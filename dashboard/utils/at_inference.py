@@ -0,0 +1,276 @@
+"""Anomaly Transformer CPU 배치 추론 → 사이클별 점수 (tab2 결과 형식)
+
+피처 시계열을 길이 WINDOW_SIZE의 윈도우로 나누어 (sliding_window_view, 복사 없음)
+BATCH_SIZE씩 모델에 넣고, 윈도우 점수를 시점별로 평균한 뒤 사이클별 평균으로 집계한다.
+입력(CSV / Parquet / 메모리 매핑 배열)은 CHUNK_ROWS 행씩 스트리밍하고, 청크 경계에 걸친
+윈도우를 위해 마지막 윈도우 길이만큼의 행과 아직 점수가 다 모이지 않은 시점만 다음 청크로
+넘긴다. 점수가 확정된 시점은 바로 사이클 합계로 접으므로 긴 이력에서도 메모리 사용량이 일정하다.
+
+모델은 ONNX 파일 경로(onnxruntime CPU) 또는 (batch, window, feature) float32 배열을 받아
+시점별 점수 (batch, window) 또는 윈도우 점수 (batch,)를 반환하는 picklable 함수이다.
+
+사용법 (dashboard/ 에서):
+    python -m utils.at_inference run --model at.onnx --input features.parquet \
+        --battery B0005 --preprocessing LOWESS [--workers 4] [--anomaly-ratio 1.0]
+"""
+import argparse
+import os
+import pickle
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.columnar import COLUMNAR_SUFFIX
+from utils.dataloader import _anomaly_pickle_path
+from utils.results_store import RESULTS_DTYPE, save_results, store_paths
+
+# Anomaly Transformer 기본 설정 (win_size=100, 테스트는 겹치지 않는 윈도우)
+WINDOW_SIZE = 100
+STRIDE = WINDOW_SIZE
+BATCH_SIZE = 256
+CHUNK_WINDOWS = BATCH_SIZE * 16
+# 입력을 읽는 단위 (행)
+CHUNK_ROWS = CHUNK_WINDOWS * STRIDE
+# threshold: 사이클 점수 상위 ANOMALY_RATIO(%) 경계
+ANOMALY_RATIO = 1.0
+# 프로세스 워커당 onnxruntime 스레드 수 (워커 수 × 스레드 수 ≤ 코어 수)
+ORT_THREADS = 1
+
+_worker = {}
+
+
+def load_onnx_model(model_path, threads=ORT_THREADS):
+    """ONNX 모델을 CPU 추론 함수로 로드"""
+    try:
+        import onnxruntime as ort
+    except ImportError as e:
+        raise ImportError("ONNX 모델 추론에는 onnxruntime이 필요합니다: pip install onnxruntime") from e
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = threads
+    session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+    input_name = session.get_inputs()[0].name
+    return lambda batch: session.run(None, {input_name: batch})[0]
+
+
+def _init_worker(model):
+    """워커마다 모델 로드"""
+    _worker['model'] = load_onnx_model(model) if isinstance(model, str) else model
+
+
+def _score_block(block, starts, window, batch_size):
+    """block 안의 윈도우(시작 위치 starts)를 추론해 (시점별 점수 합, 시점별 윈도우 수) 반환"""
+    model = _worker['model']
+    # (n, feature, window) view → (n, window, feature)
+    windows = sliding_window_view(block, window, axis=0).transpose(0, 2, 1)
+
+    score_sum = np.zeros(len(block))
+    for b in range(0, len(starts), batch_size):
+        idx = starts[b:b + batch_size]
+        out = np.asarray(model(np.ascontiguousarray(windows[idx], dtype=np.float32)), dtype=float)
+        if out.ndim == 1:
+            out = np.repeat(out[:, None], window, axis=1)
+        positions = idx[:, None] + np.arange(window)
+        score_sum += np.bincount(positions.ravel(), weights=out.ravel(), minlength=len(block))
+    counts = np.bincount((starts[:, None] + np.arange(window)).ravel(), minlength=len(block))
+    return score_sum, counts
+
+
+def iter_array_chunks(features, cycles, chunk_rows=CHUNK_ROWS):
+    """배열(메모리 매핑 포함)을 chunk_rows 행씩 (float32 피처, cycle) 청크로 (전체 복사 없음)"""
+    for lo in range(0, len(features), chunk_rows):
+        yield (np.asarray(features[lo:lo + chunk_rows], dtype=np.float32),
+               np.asarray(cycles[lo:lo + chunk_rows]))
+
+
+def iter_file_chunks(path, columns=None, chunk_rows=CHUNK_ROWS):
+    """CSV / Parquet 입력을 chunk_rows 행씩 (float32 피처, cycle) 청크로 (기본 피처: cycle_idx 외 전체)"""
+    if str(path).endswith(COLUMNAR_SUFFIX):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        names = list(columns or [c for c in parquet.schema_arrow.names if c != 'cycle_idx'])
+        frames = (batch.to_pandas() for batch in
+                  parquet.iter_batches(batch_size=chunk_rows, columns=names + ['cycle_idx']))
+    else:
+        header = pd.read_csv(path, nrows=0).columns
+        names = list(columns or [c for c in header if c != 'cycle_idx'])
+        frames = pd.read_csv(path, usecols=names + ['cycle_idx'], chunksize=chunk_rows)
+    for df in frames:
+        yield df[names].to_numpy(dtype=np.float32), df['cycle_idx'].to_numpy()
+
+
+def _cycle_sums(cycles, step_scores):
+    cycle_values, inverse = np.unique(cycles, return_inverse=True)
+    return cycle_values, np.bincount(inverse, weights=step_scores), np.bincount(inverse)
+
+
+def run_inference_chunks(chunks, model, window=WINDOW_SIZE, stride=STRIDE,
+                         batch_size=BATCH_SIZE, workers=1):
+    """(피처, cycle) 청크 스트림으로 사이클 점수 계산
+
+    윈도우는 stride 간격으로 시작하고, 마지막 시점까지 덮도록 끝에 맞춘 윈도우를 하나 더한다.
+    반환: (cycle 오름차순 cycle 배열, 사이클 점수 배열, 통계 dict)
+    """
+    started = time.perf_counter()
+    pool = (ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model,))
+            if workers > 1 else None)
+    if pool is None:
+        _init_worker(model)
+    pending = deque()  # (첫 윈도우 시작 시점, Future) — 제출 순서대로 결과 반영
+
+    def submit(block, lo, starts):
+        if pool is not None:
+            future = pool.submit(_score_block, block, starts, window, batch_size)
+        else:
+            future = Future()
+            future.set_result(_score_block(block, starts, window, batch_size))
+        pending.append((lo, future))
+
+    total = 0          # 지금까지 읽은 시점 수
+    next_start = 0     # 다음 정규 윈도우 시작 시점
+    n_windows = 0
+    feat, feat_lo = None, 0                 # 앞으로 윈도우에 필요한 피처 [feat_lo, total)
+    rows_lo = 0                             # 아직 확정되지 않은 첫 시점
+    cyc = np.empty(0, dtype=np.int64)       # [rows_lo, total)의 cycle / 점수 합 / 윈도우 수
+    ssum, cnt = np.empty(0), np.empty(0)
+    partial = []
+
+    def drain(limit):
+        nonlocal ssum, cnt
+        while pending and (len(pending) > limit or pending[0][1].done()):
+            lo, future = pending.popleft()
+            block_sum, block_counts = future.result()
+            at = lo - rows_lo
+            ssum[at:at + len(block_sum)] += block_sum
+            cnt[at:at + len(block_counts)] += block_counts
+
+    def finalize(boundary):
+        nonlocal rows_lo, cyc, ssum, cnt
+        n = boundary - rows_lo
+        if n <= 0:
+            return
+        partial.append(_cycle_sums(cyc[:n], ssum[:n] / np.maximum(cnt[:n], 1)))
+        cyc, ssum, cnt = cyc[n:], ssum[n:], cnt[n:]
+        rows_lo = boundary
+
+    try:
+        for features, cycles in chunks:
+            if not len(features):
+                continue
+            feat = features if feat is None else np.concatenate([feat, features])
+            cyc = np.concatenate([cyc, cycles])
+            ssum = np.concatenate([ssum, np.zeros(len(features))])
+            cnt = np.concatenate([cnt, np.zeros(len(features))])
+            total += len(features)
+
+            starts = np.arange(next_start, total - window + 1, stride)
+            if len(starts):
+                lo = int(starts[0])
+                block = np.array(feat[lo - feat_lo:int(starts[-1]) + window - feat_lo])
+                submit(block, lo, starts - lo)
+                n_windows += len(starts)
+                next_start = int(starts[-1]) + stride
+
+            # 다음 정규 윈도우와 끝에 맞춘 윈도우에 필요한 행만 남김
+            keep_from = max(min(next_start, total - window), feat_lo)
+            feat, feat_lo = feat[keep_from - feat_lo:], keep_from
+
+            drain(workers * 2)
+            boundary = min(next_start, total - window)
+            if pending:
+                boundary = min(boundary, pending[0][0])
+            finalize(boundary)
+
+        if total < window:
+            raise ValueError(f"시계열 길이({total})가 윈도우 크기({window})보다 짧습니다.")
+        if next_start - stride + window < total:
+            submit(np.array(feat[total - window - feat_lo:]), total - window, np.array([0]))
+            n_windows += 1
+        drain(0)
+        finalize(total)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        else:
+            _worker.clear()
+
+    cycle_values, inverse = np.unique(np.concatenate([p[0] for p in partial]), return_inverse=True)
+    score_sums = np.bincount(inverse, weights=np.concatenate([p[1] for p in partial]))
+    step_counts = np.bincount(inverse, weights=np.concatenate([p[2] for p in partial]))
+    cycle_scores = score_sums / step_counts
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        'steps': total,
+        'windows': n_windows,
+        'cycles': len(cycle_values),
+        'seconds': elapsed,
+        'windows_per_sec': n_windows / elapsed if elapsed > 0 else float('inf'),
+    }
+    return cycle_values, cycle_scores, stats
+
+
+def run_inference(features, cycles, model, window=WINDOW_SIZE, stride=STRIDE,
+                  batch_size=BATCH_SIZE, chunk_rows=CHUNK_ROWS, workers=1):
+    """시점별 피처 (n_steps, n_features)와 시점별 cycle 배열로 사이클 점수 계산 (np.memmap도 청크 단위로 읽음)"""
+    return run_inference_chunks(iter_array_chunks(features, cycles, chunk_rows), model,
+                                window, stride, batch_size, workers)
+
+
+def threshold_from_ratio(scores, anomaly_ratio=ANOMALY_RATIO):
+    """상위 anomaly_ratio(%) 경계 점수"""
+    return float(np.percentile(scores, 100 - anomaly_ratio))
+
+
+def write_results(battery_id, preprocessing, cycles, scores, threshold, legacy_pickle=False):
+    """tab2가 읽는 결과 파일(npy/json, 선택적으로 기존 pickle) 저장"""
+    pkl_path = _anomaly_pickle_path(battery_id, preprocessing)
+    os.makedirs(os.path.dirname(pkl_path), exist_ok=True)
+    records = np.empty(len(cycles), dtype=RESULTS_DTYPE)
+    records['cycle'] = cycles
+    records['score'] = scores
+    npy_path, json_path = store_paths(pkl_path)
+    save_results(npy_path, json_path, records, threshold)
+    if legacy_pickle:
+        with open(pkl_path, 'wb') as f:
+            pickle.dump({'cycle_scores': dict(zip(cycles.tolist(), scores.tolist())),
+                         'threshold': float(threshold)}, f)
+    return npy_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Anomaly Transformer CPU 배치 추론")
+    parser.add_argument('command', choices=['run'])
+    parser.add_argument('--model', required=True, help="ONNX 모델 경로")
+    parser.add_argument('--input', required=True, help="시점별 피처 CSV / Parquet (cycle_idx + 피처 컬럼)")
+    parser.add_argument('--features', nargs='*', help="사용할 피처 컬럼 (기본: cycle_idx 외 전체)")
+    parser.add_argument('--battery', required=True)
+    parser.add_argument('--preprocessing', choices=['LOWESS', 'Raw Data'], default='LOWESS')
+    parser.add_argument('--window', type=int, default=WINDOW_SIZE)
+    parser.add_argument('--stride', type=int)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threshold', type=float)
+    parser.add_argument('--anomaly-ratio', type=float, default=ANOMALY_RATIO)
+    parser.add_argument('--pickle', action='store_true', help="기존 test_results_*.pkl도 함께 저장")
+    args = parser.parse_args()
+
+    stride = args.stride or args.window
+    cycles, scores, stats = run_inference_chunks(
+        iter_file_chunks(args.input, args.features, chunk_rows=CHUNK_WINDOWS * stride), args.model,
+        window=args.window, stride=stride, batch_size=args.batch_size, workers=args.workers)
+    threshold = args.threshold if args.threshold is not None else threshold_from_ratio(scores, args.anomaly_ratio)
+
+    path = write_results(args.battery, args.preprocessing, cycles, scores, threshold, args.pickle)
+    print(f"{stats['windows']}개 윈도우 / {stats['cycles']}개 사이클 · {stats['seconds']:.2f}s "
+          f"({stats['windows_per_sec']:.0f} windows/s) · threshold {threshold:.4f}")
+    print(f"→ {path}")
+
+
+if __name__ == '__main__':
+    main()
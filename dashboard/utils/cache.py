@@ -0,0 +1,290 @@
+import functools
+import os
+import sys
+import threading
+import types
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.perf import count_rows, span
+
+# 캐시 최대 메모리 (bytes)
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+
+def _copy_on_write():
+    """pandas Copy-on-Write 사용 여부 (pandas 3부터 항상 켜짐, 2.x는 옵션을 켠 경우만)"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def _freeze(obj):
+    """공유 캐시 항목을 읽기 전용으로 변환"""
+    if isinstance(obj, np.ndarray):
+        obj.setflags(write=False)
+        return obj
+    if isinstance(obj, dict):
+        return types.MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    if isinstance(obj, tuple):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+def _share(obj):
+    """캐시 항목을 호출자에게 전달 (DataFrame은 복사본, ndarray는 읽기 전용 view)
+
+    CoW가 켜져 있으면 얕은 복사로도 호출자의 수정이 원본에 닿지 않고,
+    꺼져 있으면 (pandas 2.x 기본) 깊은 복사로 공유 원본을 보호한다.
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return obj.copy(deep=not _copy_on_write())
+    if isinstance(obj, np.ndarray):
+        # 원본이 읽기 전용이므로 view도 쓰기 불가 (setflags(write=True)도 거부됨)
+        return obj.view()
+    if isinstance(obj, types.MappingProxyType):
+        return types.MappingProxyType({k: _share(v) for k, v in obj.items()})
+    if isinstance(obj, tuple):
+        return tuple(_share(v) for v in obj)
+    return obj
+
+
+def _hashable(value):
+    """캐시 키용으로 list 인자를 tuple로 변환"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+def estimate_nbytes(obj):
+    """캐시 항목의 대략적인 메모리 크기"""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.memmap):
+        return 0  # 파일 매핑은 페이지 캐시에 있으므로 제외
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (dict, types.MappingProxyType)):
+        return sys.getsizeof(obj) + sum(estimate_nbytes(k) + estimate_nbytes(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(estimate_nbytes(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+def mapped_nbytes(obj):
+    """캐시 항목 중 파일 매핑(np.memmap) 배열의 크기 — 세션 수와 무관하게 페이지 캐시를 공유"""
+    if isinstance(obj, np.memmap):
+        return int(obj.nbytes)
+    if isinstance(obj, (dict, types.MappingProxyType)):
+        return sum(mapped_nbytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(mapped_nbytes(v) for v in obj)
+    return 0
+
+
+def file_signature(paths):
+    """파일 목록의 (경로, mtime, size) 서명 — 하나라도 없으면 None"""
+    sig = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        sig.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(sig)
+
+
+class _Flight:
+    """진행 중인 로드 하나 (같은 키의 다른 요청은 done을 기다린 뒤 결과를 공유)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        # 로더가 rerun/stop 같은 제어 흐름 예외로 중단됨 → 기다리던 요청이 다시 로드
+        self.aborted = False
+
+
+class ArtifactCache:
+    """세션 간 공유되는 LRU 아티팩트 캐시
+
+    같은 키의 동시 miss는 single-flight로 묶여 로드가 한 번만 실행되고,
+    나머지 요청은 그 결과(같은 객체)를 받는다.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, nbytes, sig, mapped)
+        self._inflight = {}  # key -> _Flight
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.evictions = 0
+
+    def _lookup(self, key, sig):
+        entry = self._entries.get(key)
+        if entry is None or sig is None or entry[2] != sig:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key, sig):
+        """서명이 일치하는 항목 반환 (없으면 None)"""
+        with self._lock:
+            entry = self._lookup(key, sig)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry
+
+    def get_or_load(self, key, sig, load):
+        """(값, 'hit' | 'miss' | 'wait') 반환
+
+        load()는 (값, 로드 후 서명)을 반환한다. 같은 키를 다른 스레드가 이미 로드 중이면
+        새로 읽지 않고 그 로드가 끝나기를 기다린다. 로드가 Exception으로 실패하면 같은 예외를
+        다시 발생시키고, Streamlit RerunException/StopException 같은 BaseException으로 중단되면
+        그 예외는 로더 세션에만 전달되고 기다리던 요청 중 하나가 새로 로드한다.
+        """
+        while True:
+            with self._lock:
+                entry = self._lookup(key, sig)
+                if entry is not None:
+                    self.hits += 1
+                    return entry[0], 'hit'
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._inflight[key] = _Flight()
+                    self.misses += 1
+                else:
+                    self.waits += 1
+
+            if leader:
+                break
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if not flight.aborted:
+                return flight.value, 'wait'
+
+        try:
+            value, new_sig = load()
+            if new_sig is not None:
+                self.put(key, new_sig, value)
+            flight.value = value
+            return value, 'miss'
+        except Exception as exc:
+            flight.error = exc
+            raise
+        except BaseException:
+            flight.aborted = True
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def put(self, key, sig, value):
+        nbytes = estimate_nbytes(value)
+        mapped = mapped_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes, sig, mapped)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[1]
+                self.evictions += 1
+
+    def discard(self, artifact=None):
+        """항목 제거 (artifact 지정 시 해당 종류만)"""
+        with self._lock:
+            for key in [k for k in self._entries if artifact is None or k[0] == artifact]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def resident(self):
+        """artifact별 {entries, bytes (힙), mapped_bytes (memmap)}"""
+        per_artifact = {}
+        with self._lock:
+            for key, (_, nbytes, _, mapped) in self._entries.items():
+                row = per_artifact.setdefault(key[0], {'entries': 0, 'bytes': 0, 'mapped_bytes': 0})
+                row['entries'] += 1
+                row['bytes'] += nbytes
+                row['mapped_bytes'] += mapped
+        return dict(sorted(per_artifact.items(), key=lambda item: -item[1]['bytes']))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'waits': self.waits,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'inflight': len(self._inflight),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+# 프로세스 전역 캐시 (모든 Streamlit 세션이 공유)
+artifact_cache = ArtifactCache()
+
+
+def cached_artifact(artifact, paths):
+    """load_* 함수용 캐시 데코레이터
+
+    키는 (artifact, 인자, 파일 mtime/size)이며 반환값은 읽기 전용으로 공유된다.
+    paths는 로더와 같은 인자를 받아 읽을 파일 경로 목록을 반환한다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            call_key = (artifact, _hashable(args), _hashable(sorted(kwargs.items())))
+
+            with span(f"load.{artifact}") as info:
+                def load():
+                    value = _freeze(func(*args, **kwargs))
+                    # 로딩 중 파일을 받아왔거나 Parquet으로 바뀌었을 수 있으므로 경로를 다시 계산
+                    sig = file_signature(paths(*args, **kwargs))
+                    info['bytes'] = sum(size for _, _, size in sig or ())
+                    info['rows'] = count_rows(value)
+                    return value, sig
+
+                # 같은 키를 다른 세션이 로드 중이면 기다렸다가 그 결과를 공유 ('wait')
+                value, info['cache'] = artifact_cache.get_or_load(
+                    call_key, file_signature(paths(*args, **kwargs)), load)
+                return _share(value)
+
+        wrapper.paths = paths
+        wrapper.artifact = artifact
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    """캐시 hit/miss/wait 카운터 반환"""
+    return artifact_cache.stats()
+
+
+def resident_bytes():
+    """artifact별 캐시 상주 메모리 (세션 수와 무관하게 프로세스에 한 벌)"""
+    return artifact_cache.resident()
+
+
+def clear_cache(artifact=None):
+    """캐시 비우기"""
+    artifact_cache.discard(artifact)
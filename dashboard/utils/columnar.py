@@ -0,0 +1,204 @@
+"""CSV 아티팩트를 Parquet으로 변환하고 필요한 컬럼만 읽는 유틸리티
+
+사용법 (dashboard/ 에서):
+    python -m utils.columnar convert [dataset_dir]
+    python -m utils.columnar compare [dataset_dir]
+"""
+import argparse
+import fnmatch
+import glob
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+COLUMNAR_SUFFIX = ".parquet"
+
+# 아티팩트 종류별 파일 패턴과 명시적 스키마 (스키마에 없는 컬럼은 float64로 저장)
+SCHEMAS = {
+    'discharge_summary': {
+        'pattern': 'discharge_summary_*.csv',
+        'dtypes': {
+            'cycle_idx': 'int64',
+            'capacity': 'float64',
+            'dis_volt_min': 'float64',
+            'dis_temp_max': 'float64',
+            'dis_time': 'float64',
+        },
+    },
+    'lof_cycle_summary': {
+        'pattern': 'tab2/lof_*_cycle_summary*.csv',
+        'dtypes': {
+            'cycle_idx': 'int64',
+            'mean_score': 'float64',
+            'split': 'category',
+            'has_anom': 'bool',
+        },
+    },
+    'hi_analysis': {
+        'pattern': 'tab4/*_hi_analysis*.csv',
+        'dtypes': {
+            'cycle_idx': 'int64',
+            'HI_ema': 'float64',
+            'HI_abs_change': 'float64',
+            'HI_slope_rollstd': 'float64',
+            'HI_std_ma': 'float64',
+        },
+    },
+    'correlation': {
+        'pattern': 'tab5/*_correlation_*.csv',
+        'dtypes': {
+            'cycle_idx': 'int64',
+            'cycle': 'int64',
+            'mean_score': 'float64',
+            'Capacity': 'float64',
+            'R_ohmic': 'float64',
+        },
+    },
+    'shap_explain': {
+        'pattern': 'tab3/X_test_explain_*.csv',
+        'dtypes': {},
+    },
+}
+
+# CSV 파싱 시 안전하게 지정할 수 있는 dtype (정수/불리언은 값 형식에 따라 실패할 수 있어 제외)
+_CSV_SAFE_DTYPES = ('float64', 'category')
+
+
+def columnar_path(csv_path):
+    """CSV 경로에 대응하는 Parquet 경로"""
+    return str(Path(csv_path).with_suffix(COLUMNAR_SUFFIX))
+
+
+def resolve_table_path(csv_path):
+    """로컬에 최신 Parquet이 있으면 Parquet, 아니면 CSV 경로 (네트워크 사용 안 함)"""
+    col_path = columnar_path(csv_path)
+    if not os.path.exists(col_path):
+        return str(csv_path)
+    if os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(col_path):
+        return str(csv_path)  # CSV가 더 최신이면 변환 전까지 CSV 사용
+    return col_path
+
+
+def schema_for(path):
+    """파일 이름으로 스키마 dtype 찾기"""
+    name = Path(path).with_suffix('.csv').name
+    for spec in SCHEMAS.values():
+        if fnmatch.fnmatch(name, spec['pattern'].split('/')[-1]):
+            return spec['dtypes']
+    return {}
+
+
+def read_table(path, columns=None):
+    """CSV/Parquet 공통 로더 — columns 지정 시 해당 컬럼만 읽음"""
+    if str(path).endswith(COLUMNAR_SUFFIX):
+        if columns is not None:
+            import pyarrow.parquet as pq
+            available = set(pq.read_schema(path).names)
+            columns = [c for c in columns if c in available]
+        return pd.read_parquet(path, columns=columns)
+
+    dtypes = {c: t for c, t in schema_for(path).items() if t in _CSV_SAFE_DTYPES}
+    if columns is None:
+        return pd.read_csv(path, dtype=dtypes)
+    wanted = set(columns)
+    return pd.read_csv(path, usecols=lambda c: c in wanted,
+                       dtype={c: t for c, t in dtypes.items() if c in wanted})
+
+
+def table_columns(path):
+    """파일 전체를 읽지 않고 컬럼 이름 목록만 반환"""
+    if str(path).endswith(COLUMNAR_SUFFIX):
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def to_schema(df, dtypes):
+    """명시적 스키마로 캐스팅 (스키마 밖의 숫자 컬럼은 float64)"""
+    df = df.copy()
+    for col in df.columns:
+        if col in dtypes:
+            df[col] = df[col].astype(dtypes[col])
+        elif pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+            df[col] = df[col].astype('float64')
+    return df
+
+
+def convert_dataset(dataset_dir, force=False):
+    """dataset_dir 아래 표 형식 아티팩트를 Parquet으로 변환 (변환된 파일 목록 반환)"""
+    converted = []
+    for spec in SCHEMAS.values():
+        for csv_path in sorted(glob.glob(os.path.join(dataset_dir, spec['pattern']))):
+            out_path = columnar_path(csv_path)
+            if not force and os.path.exists(out_path) and os.path.getmtime(out_path) >= os.path.getmtime(csv_path):
+                continue
+            df = to_schema(pd.read_csv(csv_path), spec['dtypes'])
+            tmp_path = out_path + '.tmp'
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, out_path)
+            converted.append(out_path)
+    return converted
+
+
+def _measure(func):
+    """(결과, 경과 시간 초, 최대 할당 bytes)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def compare(dataset_dir, columns=None):
+    """CSV 전체 파싱 vs Parquet 컬럼 선택 읽기의 시간/메모리 비교"""
+    rows = []
+    for spec in SCHEMAS.values():
+        for csv_path in sorted(glob.glob(os.path.join(dataset_dir, spec['pattern']))):
+            col_path = columnar_path(csv_path)
+            if not os.path.exists(col_path):
+                continue
+            cols = columns or [c for c in spec['dtypes'] if c != 'cycle'] or None
+            csv_df, csv_time, csv_peak = _measure(lambda: pd.read_csv(csv_path))
+            col_df, col_time, col_peak = _measure(lambda: read_table(col_path, cols))
+            rows.append({
+                'file': os.path.relpath(csv_path, dataset_dir),
+                'rows': len(csv_df),
+                'csv_ms': csv_time * 1000,
+                'parquet_ms': col_time * 1000,
+                'speedup': csv_time / col_time if col_time > 0 else float('inf'),
+                'csv_peak_mb': csv_peak / 1e6,
+                'parquet_peak_mb': col_peak / 1e6,
+                'csv_df_mb': csv_df.memory_usage(deep=True).sum() / 1e6,
+                'parquet_df_mb': col_df.memory_usage(deep=True).sum() / 1e6,
+            })
+    return pd.DataFrame(rows)
+
+
+def main():
+    default_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dataset')
+    parser = argparse.ArgumentParser(description="CSV 아티팩트 Parquet 변환/비교")
+    parser.add_argument('command', choices=['convert', 'compare'])
+    parser.add_argument('dataset_dir', nargs='?', default=default_dir)
+    parser.add_argument('--force', action='store_true', help="이미 변환된 파일도 다시 변환")
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        converted = convert_dataset(args.dataset_dir, force=args.force)
+        print(f"{len(converted)}개 파일 변환 완료")
+        for path in converted:
+            print(f"  {path}")
+    else:
+        result = compare(args.dataset_dir)
+        if result.empty:
+            print("비교할 Parquet 파일이 없습니다. 먼저 convert를 실행하세요.")
+        else:
+            print(result.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""이상 점수와 Capacity / R_ohmic 상관 분석 엔진
+
+- Pearson / Spearman 상관 (배치 벡터화)
+- 누적합으로 계산하는 rolling Pearson 상관 (사이클 수명에 따른 관계 변화)
+- bootstrap 신뢰구간: 재표본을 NumPy 배치로 만들고 배치들을 프로세스 풀에 분산
+결과는 (배터리, 모델, 전처리)별로 아티팩트 캐시에 저장된다.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import stats
+
+from utils.cache import cached_artifact
+from utils.dataloader import correlation_data_paths, load_correlation_data
+
+ROLLING_WINDOW = 30
+BOOTSTRAP_SAMPLES = 2000
+CONFIDENCE = 0.95
+BOOTSTRAP_SEED = 0
+# 배치 하나에서 만드는 재표본 원소 수 상한 (배치 크기 = 이 값 // 사이클 수)
+BOOTSTRAP_BATCH_ELEMENTS = 4_000_000
+# 재표본 원소 수가 이보다 적으면 프로세스 풀 없이 현재 프로세스에서 계산
+BOOTSTRAP_POOL_MIN_ELEMENTS = 20_000_000
+BOOTSTRAP_MAX_WORKERS = min(8, os.cpu_count() or 1)
+# 사이클 수가 이보다 많으면 bootstrap 대신 Fisher z 근사 신뢰구간 (재표본 비용이 큼)
+# 결과의 'ci_method'에 실제 사용한 방법이 기록되고 tab5 제목에 표시된다
+BOOTSTRAP_MAX_N = 50_000
+
+TARGETS = ('Capacity', 'R_ohmic')
+
+
+def pearson(x, y):
+    """마지막 축 기준 Pearson 상관 (x, y: (..., n))"""
+    dx = x - x.mean(axis=-1, keepdims=True)
+    dy = y - y.mean(axis=-1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = (dx * dy).sum(axis=-1) / np.sqrt((dx * dx).sum(axis=-1) * (dy * dy).sum(axis=-1))
+    return np.clip(r, -1.0, 1.0)
+
+
+def spearman(x, y):
+    """마지막 축 기준 Spearman 상관 (동점은 평균 순위)"""
+    return pearson(stats.rankdata(x, axis=-1), stats.rankdata(y, axis=-1))
+
+
+METHODS = {'pearson': pearson, 'spearman': spearman}
+
+
+def rolling_pearson(x, y, window=ROLLING_WINDOW):
+    """길이 window 창의 Pearson 상관 (창 끝 위치 기준, 앞쪽 window-1개는 NaN)
+
+    x, y, x², y², xy 누적합의 차로 창 합을 구하므로 전체 O(n)이다.
+    x나 y가 NaN인 쌍은 창 합에서 빼고, 창 안의 유효 쌍 수로 계산한다 (유효 쌍이 2개 미만이면 NaN).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    out = np.full(len(x), np.nan)
+    if window < 2 or len(x) < window:
+        return out
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if not valid.any():
+        return out
+    # 상쇄 오차를 줄이기 위해 유효 쌍의 평균으로 중심화, NaN 쌍은 0으로 두고 개수에서 제외
+    x = np.where(valid, x - x[valid].mean(), 0.0)
+    y = np.where(valid, y - y[valid].mean(), 0.0)
+
+    def window_sums(v):
+        cs = np.concatenate(([0.0], np.cumsum(v)))
+        return cs[window:] - cs[:-window]
+
+    n = window_sums(valid.astype(float))
+    sx, sy = window_sums(x), window_sums(y)
+    sxx, syy, sxy = window_sums(x * x), window_sums(y * y), window_sums(x * y)
+    cov = n * sxy - sx * sy
+    var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out[window - 1:] = np.clip(cov / np.sqrt(np.where((var > 0) & (n >= 2), var, np.nan)), -1.0, 1.0)
+    return out
+
+
+def _bootstrap_batch(x, y, method, n_resamples, seed):
+    """재표본 n_resamples개의 상관계수 (한 배치)"""
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(x), size=(n_resamples, len(x)))
+    return METHODS[method](x[idx], y[idx])
+
+
+def bootstrap_ci(x, y, method='pearson', n_resamples=BOOTSTRAP_SAMPLES, confidence=CONFIDENCE,
+                 seed=BOOTSTRAP_SEED, max_workers=BOOTSTRAP_MAX_WORKERS):
+    """percentile bootstrap 신뢰구간 (low, high)"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) < 3:
+        return np.nan, np.nan
+
+    batch = max(1, min(n_resamples, BOOTSTRAP_BATCH_ELEMENTS // len(x)))
+    sizes = [min(batch, n_resamples - start) for start in range(0, n_resamples, batch)]
+    # 배치마다 독립된 난수열 (워커 수와 무관하게 같은 결과)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if max_workers > 1 and len(sizes) > 1 and n_resamples * len(x) >= BOOTSTRAP_POOL_MIN_ELEMENTS:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(sizes))) as pool:
+            parts = list(pool.map(_bootstrap_batch, [x] * len(sizes), [y] * len(sizes),
+                                  [method] * len(sizes), sizes, seeds))
+    else:
+        parts = [_bootstrap_batch(x, y, method, size, s) for size, s in zip(sizes, seeds)]
+
+    values = np.concatenate(parts)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return np.nan, np.nan
+    tail = (1.0 - confidence) / 2 * 100
+    low, high = np.percentile(values, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def fisher_ci(r, n, method='pearson', confidence=CONFIDENCE):
+    """Fisher z 변환 근사 신뢰구간 (Spearman은 Bonett-Wright 분산)"""
+    if n <= 3 or np.isnan(r):
+        return np.nan, np.nan
+    var = 1.0 + r * r / 2 if method == 'spearman' else 1.0
+    half = stats.norm.ppf(0.5 + confidence / 2) * np.sqrt(var / (n - 3))
+    z = np.arctanh(np.clip(r, -0.999999, 0.999999))
+    return float(np.tanh(z - half)), float(np.tanh(z + half))
+
+
+def ci_method(n):
+    """n개 사이클에 사용할 신뢰구간 방법 ('bootstrap' | 'fisher')"""
+    return 'fisher' if n > BOOTSTRAP_MAX_N else 'bootstrap'
+
+
+def correlation_ci(x, y, r, method='pearson', n_resamples=BOOTSTRAP_SAMPLES):
+    """bootstrap 신뢰구간 (대규모 데이터는 Fisher z 근사)"""
+    if ci_method(len(x)) == 'fisher':
+        return fisher_ci(r, len(x), method)
+    return bootstrap_ci(x, y, method, n_resamples)
+
+
+def linear_fit(x, y):
+    """최소제곱 직선 (기울기, 절편)"""
+    dx = x - x.mean()
+    denom = (dx * dx).sum()
+    slope = (dx * (y - y.mean())).sum() / denom if denom > 0 else 0.0
+    return float(slope), float(y.mean() - slope * x.mean())
+
+
+def analyze(cycles, score, targets, window=ROLLING_WINDOW, n_resamples=BOOTSTRAP_SAMPLES):
+    """점수와 대상 시리즈들의 상관 요약 dict"""
+    cycles = np.asarray(cycles)
+    score = np.asarray(score, dtype=float)
+    window = min(window, len(score))
+    result = {'cycles': cycles, 'window': window, 'n': len(score)}
+    for name, values in targets.items():
+        values = np.asarray(values, dtype=float)
+        valid = ~(np.isnan(score) | np.isnan(values))
+        x, y = score[valid], values[valid]
+        slope, intercept = linear_fit(x, y) if len(x) > 1 else (np.nan, np.nan)
+        r_pearson = float(pearson(x, y)) if len(x) > 1 else np.nan
+        r_spearman = float(spearman(x, y)) if len(x) > 1 else np.nan
+        result[name] = {
+            'pearson': r_pearson,
+            'pearson_ci': correlation_ci(x, y, r_pearson, 'pearson', n_resamples),
+            'spearman': r_spearman,
+            'spearman_ci': correlation_ci(x, y, r_spearman, 'spearman', n_resamples),
+            'ci_method': ci_method(len(x)),
+            'slope': slope,
+            'intercept': intercept,
+            'rolling': rolling_pearson(score, values, window),
+        }
+    return result
+
+
+@cached_artifact("correlation_summary", correlation_data_paths)
+def load_correlation_summary(battery_id, model_type, preprocessing):
+    """tab5 데이터의 Pearson/Spearman, bootstrap CI, rolling 상관 (파일이 바뀔 때만 재계산)"""
+    df_merged, _ = load_correlation_data(battery_id, model_type, preprocessing,
+                                         columns=('cycle', 'mean_score') + TARGETS)
+    df_merged = df_merged.sort_values('cycle', kind='stable')
+    return analyze(df_merged['cycle'].to_numpy(), df_merged['mean_score'].to_numpy(),
+                   {name: df_merged[name].to_numpy() for name in TARGETS})
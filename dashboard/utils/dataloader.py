@@ -1,161 +1,424 @@
 import os
+import re
 import pandas as pd
-import pickle
+import functools
 import json
-import boto3
+import logging
+import threading
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from utils.cache import cached_artifact
+from utils.columnar import columnar_path, read_table, resolve_table_path, table_columns
+from utils.perf import span
+from utils.results_store import load_pickle_results, load_results, store_paths
+from utils.s3sync import fetch_object, is_synced, list_remote, load_manifest, sync_prefix
 
 # S3 설정
 S3_BUCKET = "dh-bucket-111"  # 실제 버킷명으로 변경
 S3_PREFIX = "dataset/"  # S3에 업로드한 경로
 
+# 데이터 가져오기 방식
+# - "lazy": 선택한 배터리/모델/전처리에 필요한 파일만 처음 요청될 때 다운로드
+# - "eager": 첫 로드 시 dataset/ 전체를 동기화
+DATA_FETCH_MODE = "lazy"
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+_full_sync_done = False
+_full_sync_lock = threading.Lock()
+_remote_missing = set()  # S3에 없는 것으로 확인된 Parquet/npy 경로
+_remote_batteries = None  # S3에서 조회한 배터리 목록 (프로세스당 1회)
+
+# 백그라운드 prefetch: 공유 스레드 풀 1개 + 진행 중인 (배터리, 모델, 전처리) 조합
+PREFETCH_MAX_WORKERS = 8
+_prefetch_pool = None
+_prefetch_lock = threading.Lock()
+_prefetch_inflight = set()
+
+logger = logging.getLogger(__name__)
+
+# dataset 디렉토리 재지정 환경변수 (벤치마크/합성 데이터용)
+DATASET_DIR_ENV = "BATTERY_DATASET_DIR"
+
+# 배터리 탐색에 실패했을 때 사용하는 기본 목록
+DEFAULT_BATTERIES = ["B0005", "B0006", "B0007"]
+_DISCHARGE_FILE = re.compile(r'^discharge_summary_(?P<battery>.+)\.(csv|parquet)$')
+
+def get_s3_client():
+    """Streamlit Secrets의 AWS credentials로 S3 클라이언트 생성 (프로세스당 1회)"""
+    global _s3_client
+    with _s3_client_lock:
+        if _s3_client is None:
+            import boto3
+            _s3_client = boto3.client(
+                's3',
+                aws_access_key_id=st.secrets["AWS_ACCESS_KEY_ID"],
+                aws_secret_access_key=st.secrets["AWS_SECRET_ACCESS_KEY"],
+                region_name=st.secrets.get("AWS_REGION", "ap-northeast-2")
+            )
+        return _s3_client
+
 def download_from_s3():
-    """S3에서 dataset 폴더 전체 다운로드 (최초 1회만)"""
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    local_dir = Path(base_dir) / "dataset"
+    """S3 dataset 폴더를 로컬과 동기화 (변경/누락된 파일만 병렬 다운로드)"""
+    local_dir = get_dataset_dir()
     
-    # 특정 파일로 완전한 다운로드 확인
-    check_file = local_dir / "discharge_summary.csv"
-    if check_file.exists():
+    # manifest 기준으로 완전한 다운로드 확인
+    if is_synced(local_dir):
         return  # 이미 다운로드됨
     
-    st.write("📥 S3에서 데이터 다운로드 중...")
-    local_dir.mkdir(parents=True, exist_ok=True)
+    st.write("📥 S3에서 데이터 동기화 중...")
+    with span("s3.sync") as info:
+        report = sync_prefix(get_s3_client(), S3_BUCKET, S3_PREFIX, local_dir)
+        info['bytes'] = report['bytes']
     
-    # AWS credentials from Streamlit Secrets
-    s3 = boto3.client(
-        's3',
-        aws_access_key_id=st.secrets["AWS_ACCESS_KEY_ID"],
-        aws_secret_access_key=st.secrets["AWS_SECRET_ACCESS_KEY"],
-        region_name=st.secrets.get("AWS_REGION", "ap-northeast-2")
+    st.write(
+        f"✅ {report['downloaded']}개 파일 다운로드 완료 "
+        f"({report['skipped']}개 최신, {report['throughput_mbps']:.1f} MB/s)"
     )
-    
-    # S3에서 모든 파일 다운로드
-    file_count = 0
-    paginator = s3.get_paginator('list_objects_v2')
-    for page in paginator.paginate(Bucket=S3_BUCKET, Prefix=S3_PREFIX):
-        for obj in page.get('Contents', []):
-            s3_key = obj['Key']
-            if s3_key.endswith('/'):  # 폴더는 스킵
-                continue
-            local_path = local_dir / s3_key.replace(S3_PREFIX, '')
-            local_path.parent.mkdir(parents=True, exist_ok=True)
-            s3.download_file(S3_BUCKET, s3_key, str(local_path))
-            file_count += 1
-    
-    st.write(f"✅ {file_count}개 파일 다운로드 완료")
-
-# 앱 시작 시 S3에서 데이터 다운로드
-download_from_s3()
+    if report['failed']:
+        st.warning(f"⚠️ {len(report['failed'])}개 파일 다운로드 실패: "
+                   + ", ".join(key for key, _ in report['failed']))
 
 def get_base_dir():
     """프로젝트 루트 디렉토리 반환"""
     # data_loader.py 위치 기준으로 상위 폴더 (dashboard/)
     return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def load_discharge_summary(battery_id):
-    """방전 요약 데이터 로드"""
-    base_dir = get_base_dir()
-    file_path = os.path.join(base_dir, 'dataset', f'discharge_summary_{battery_id}.csv')
-    return pd.read_csv(file_path)
+def get_dataset_dir():
+    """로컬 dataset 디렉토리 반환 (BATTERY_DATASET_DIR 환경변수가 있으면 그 경로)"""
+    override = os.environ.get(DATASET_DIR_ENV)
+    if override:
+        return Path(override)
+    return Path(get_base_dir()) / "dataset"
 
-def load_feature_importance(battery_id, preprocessing):
-    """Feature Importance 데이터 로드"""
-    base_dir = get_base_dir()
-    
+def discover_batteries():
+    """dataset 디렉토리, manifest에서 배터리 목록 탐색
+
+    로컬에서 하나도 찾지 못했을 때만 (lazy 모드) S3 목록을 조회한다.
+    로컬 데이터셋이 있으면 시작 시 네트워크를 사용하지 않는다.
+    """
+    global _remote_batteries
+    dataset_dir = get_dataset_dir()
+    names = set(os.listdir(dataset_dir)) if dataset_dir.is_dir() else set()
+    names |= set(load_manifest(dataset_dir))
+    local_found = any(map(_DISCHARGE_FILE.match, names))
+
+    if DATA_FETCH_MODE == "lazy" and not local_found and _remote_batteries is None:
+        prefix = S3_PREFIX + "discharge_summary_"
+        try:
+            _remote_batteries = {"discharge_summary_" + key for key in list_remote(get_s3_client(), S3_BUCKET, prefix)}
+        except Exception:
+            _remote_batteries = set()  # 오프라인/credentials 없음 → 로컬 파일만 사용
+    names |= _remote_batteries or set()
+
+    batteries = {m.group('battery') for m in map(_DISCHARGE_FILE.match, names) if m}
+    return sorted(batteries) or list(DEFAULT_BATTERIES)
+
+def ensure_local(*paths):
+    """로컬에 없는 아티팩트를 S3에서 받아옴 (이미 있으면 네트워크 사용 안 함)"""
+    global _full_sync_done
+    if DATA_FETCH_MODE == "eager":
+        with _full_sync_lock:
+            if not _full_sync_done:
+                download_from_s3()
+                _full_sync_done = True
+        return
+
+    dataset_dir = get_dataset_dir()
+    for path in paths:
+        if os.path.exists(path):
+            continue
+        rel_key = Path(path).relative_to(dataset_dir).as_posix()
+        with span("s3.fetch", key=rel_key) as info:
+            fetch_object(get_s3_client(), S3_BUCKET, S3_PREFIX, dataset_dir, rel_key)
+            info['bytes'] = os.path.getsize(path)
+
+def fetch_table(path):
+    """표 아티팩트를 로컬에 준비하고 실제로 읽을 경로 반환 (Parquet 우선, 없으면 CSV)"""
+    if os.path.exists(path):
+        return path
+    if path.endswith('.csv') and DATA_FETCH_MODE == "lazy":
+        col_path = columnar_path(path)
+        if col_path not in _remote_missing:
+            try:
+                ensure_local(col_path)
+                return col_path
+            except FileNotFoundError:
+                _remote_missing.add(col_path)
+    ensure_local(path)
+    return path
+
+def _get_prefetch_pool():
+    """prefetch 전용 스레드 풀 (프로세스당 1개, rerun마다 새로 만들지 않음)"""
+    global _prefetch_pool
+    with _prefetch_lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="prefetch")
+        return _prefetch_pool
+
+def _prefetch_one(path):
+    try:
+        if path.endswith('.pkl'):
+            fetch_results(path)
+        else:
+            fetch_table(path)
+    except FileNotFoundError:
+        _remote_missing.add(path)
+
+def _submit_prefetch(battery_id, model_type, preprocessing):
+    """선택한 조합에서 로컬에 없는 아티팩트를 공유 풀에 제출, (경로, Future) 목록 반환"""
+    if DATA_FETCH_MODE != "lazy":
+        return []
+    paths = (
+        discharge_summary_paths(battery_id)
+        + anomaly_results_paths(battery_id, model_type, preprocessing)
+        + lof_cycle_summary_paths(battery_id, preprocessing)
+        + feature_importance_paths(battery_id, preprocessing)
+        + shap_data_paths(battery_id, preprocessing)
+        + hi_analysis_paths(battery_id, preprocessing)
+        + correlation_data_paths(battery_id, model_type, preprocessing)
+    )
+    missing = [p for p in paths if not os.path.exists(p) and p not in _remote_missing]
+    pool = _get_prefetch_pool() if missing else None
+    return [(path, pool.submit(_prefetch_one, path)) for path in missing]
+
+def prefetch(battery_id, model_type, preprocessing):
+    """선택한 조합에 필요한 아티팩트를 병렬로 미리 받아옴 (없는 파일은 무시)"""
+    for _, future in _submit_prefetch(battery_id, model_type, preprocessing):
+        future.result()
+
+def prefetch_in_background(battery_id, model_type, preprocessing):
+    """다른 뷰로 전환할 때를 대비해 공유 풀에서 prefetch (같은 조합이 진행 중이면 다시 제출하지 않음)"""
+    key = (battery_id, model_type, preprocessing)
+    with _prefetch_lock:
+        if key in _prefetch_inflight:
+            return
+        _prefetch_inflight.add(key)
+
+    try:
+        futures = _submit_prefetch(battery_id, model_type, preprocessing)
+    except Exception:
+        logger.warning("prefetch 실패: %s", key, exc_info=True)
+        futures = []
+    if not futures:
+        with _prefetch_lock:
+            _prefetch_inflight.discard(key)
+        return
+
+    remaining = [len(futures)]
+
+    def done(path, future):
+        # 실패한 파일은 실제로 로드할 때 다시 받아오며 에러도 그때 화면에 표시
+        error = None if future.cancelled() else future.exception()
+        if error is not None:
+            logger.warning("prefetch 실패: %s (%s)", path, key, exc_info=error)
+        with _prefetch_lock:
+            remaining[0] -= 1
+            if not remaining[0]:
+                _prefetch_inflight.discard(key)
+
+    for path, future in futures:
+        future.add_done_callback(functools.partial(done, path))
+
+def _suffix(preprocessing):
+    return "_lowess" if preprocessing == "LOWESS" else ""
+
+def _model_name(model_type):
+    return "at" if model_type == "Anomaly Transformer" else "lof"
+
+# 각 로더가 읽는 파일 경로 (캐시 키의 mtime/size 서명에 사용)
+def discharge_summary_paths(battery_id, columns=None):
+    return [resolve_table_path(os.path.join(get_dataset_dir(), f'discharge_summary_{battery_id}.csv'))]
+
+def feature_importance_paths(battery_id, preprocessing):
     if preprocessing == "LOWESS":
         filename = f'lof_{battery_id}_feature_importance_lowess.csv'
     else:
         filename = f'lof_{battery_id}_feature_importance.csv'
-    
-    file_path = os.path.join(base_dir, 'dataset', 'tab3', filename)
+    return [os.path.join(get_dataset_dir(), 'tab3', filename)]
+
+def _anomaly_pickle_path(battery_id, preprocessing):
+    if preprocessing == "LOWESS":
+        filename = f'test_results_{battery_id}_lowess.pkl'
+    else:
+        filename = f'test_results_{battery_id}.pkl'
+    return os.path.join(get_dataset_dir(), 'tab2', filename)
+
+def anomaly_results_paths(battery_id, model_type, preprocessing):
+    if model_type != "Anomaly Transformer":
+        return []
+    pkl_path = _anomaly_pickle_path(battery_id, preprocessing)
+    npy_path, json_path = store_paths(pkl_path)
+    if os.path.exists(npy_path) and os.path.exists(json_path):
+        return [npy_path, json_path]
+    return [pkl_path]
+
+def shap_data_paths(battery_id, preprocessing, columns=None):
+    if preprocessing == "LOWESS":
+        shap_file = f'shap_values_{battery_id}_lowess.npy'
+        explain_file = f'X_test_explain_{battery_id}_lowess.csv'
+    else:
+        shap_file = f'shap_values_{battery_id}.npy'
+        explain_file = f'X_test_explain_{battery_id}.csv'
+    tab3_dir = os.path.join(get_dataset_dir(), 'tab3')
+    return [os.path.join(tab3_dir, shap_file), resolve_table_path(os.path.join(tab3_dir, explain_file))]
+
+def lof_cycle_summary_paths(battery_id, preprocessing, columns=None):
+    suffix = _suffix(preprocessing)
+    tab2_dir = os.path.join(get_dataset_dir(), 'tab2')
+    return [resolve_table_path(os.path.join(tab2_dir, f'lof_{battery_id}_cycle_summary{suffix}.csv')),
+            os.path.join(tab2_dir, f'lof_{battery_id}_metadata{suffix}.json')]
+
+def hi_analysis_paths(battery_id, preprocessing, columns=None):
+    suffix = _suffix(preprocessing)
+    tab4_dir = os.path.join(get_dataset_dir(), 'tab4')
+    return [resolve_table_path(os.path.join(tab4_dir, f'{battery_id}_hi_analysis{suffix}.csv')),
+            os.path.join(tab4_dir, f'{battery_id}_hi_metadata{suffix}.json')]
+
+def correlation_data_paths(battery_id, model_type, preprocessing, columns=None):
+    model_name = _model_name(model_type)
+    suffix = _suffix(preprocessing)
+    tab5_dir = os.path.join(get_dataset_dir(), 'tab5')
+    return [resolve_table_path(os.path.join(tab5_dir, f'{battery_id}_correlation_{model_name}{suffix}.csv')),
+            os.path.join(tab5_dir, f'{battery_id}_correlation_metadata_{model_name}{suffix}.json')]
+
+@cached_artifact("discharge_summary", discharge_summary_paths)
+def load_discharge_summary(battery_id, columns=None):
+    """방전 요약 데이터 로드 (columns 지정 시 해당 컬럼만)"""
+    file_path, = discharge_summary_paths(battery_id)
+    return read_table(fetch_table(file_path), columns)
+
+@cached_artifact("feature_importance", feature_importance_paths)
+def load_feature_importance(battery_id, preprocessing):
+    """Feature Importance 데이터 로드"""
+    file_path, = feature_importance_paths(battery_id, preprocessing)
     
     try:
+        ensure_local(file_path)
         return pd.read_csv(file_path)
     except FileNotFoundError as e:
         raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}") from e
 
+def fetch_results(pkl_path):
+    """결과 파일을 로컬에 준비 (npy/json 우선, 없으면 기존 pickle) 후 읽을 경로 반환"""
+    npy_path, json_path = store_paths(pkl_path)
+    if os.path.exists(npy_path) and os.path.exists(json_path):
+        return npy_path, json_path
+    if os.path.exists(pkl_path):
+        return pkl_path,
+    if DATA_FETCH_MODE == "lazy" and npy_path not in _remote_missing:
+        try:
+            ensure_local(npy_path, json_path)
+            return npy_path, json_path
+        except FileNotFoundError:
+            _remote_missing.add(npy_path)
+    ensure_local(pkl_path)
+    return pkl_path,
+
+@cached_artifact("anomaly_results", anomaly_results_paths)
 def load_anomaly_results(battery_id, model_type, preprocessing):
-    """Anomaly Transformer 결과 로드"""
-    base_dir = get_base_dir()
+    """Anomaly Transformer 결과 로드
 
+    {'cycles', 'scores', 'threshold'}를 반환하며 cycles/scores는 cycle 오름차순
+    NumPy 배열이다 (npy 형식이면 메모리 매핑된 zero-copy view).
+    """
     if model_type != "Anomaly Transformer":
         return None
     
-    if preprocessing == "LOWESS":
-        filename = f'test_results_{battery_id}_lowess.pkl'
-    else:
-        filename = f'test_results_{battery_id}.pkl'
-    
-    file_path = os.path.join(base_dir, 'dataset', 'tab2', filename)
+    file_path = _anomaly_pickle_path(battery_id, preprocessing)
     
     try:
-        with open(file_path, 'rb') as f:
-            return pickle.load(f)
+        paths = fetch_results(file_path)
+        if len(paths) == 2:
+            return load_results(*paths)
+        # 변환 전 pickle (python -m utils.results_store migrate 로 변환 권장)
+        return load_pickle_results(file_path)
     except FileNotFoundError as e:
         raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}") from e
 
-def load_shap_data(battery_id, preprocessing):
-    """SHAP 분석 데이터 로드"""
-    base_dir = get_base_dir()
-    
-    if preprocessing == "LOWESS":
-        shap_file = f'shap_values_{battery_id}_lowess.npy'
-        explain_file = f'X_test_explain_{battery_id}_lowess.csv'
-    else:
-        shap_file = f'shap_values_{battery_id}.npy'
-        explain_file = f'X_test_explain_{battery_id}.csv'
-    
+@cached_artifact("shap_data", shap_data_paths)
+def load_shap_data(battery_id, preprocessing, columns=None):
+    """SHAP 분석 데이터 로드 (columns 지정 시 X_explain의 해당 컬럼만)"""
     import numpy as np
 
-    shap_path = os.path.join(base_dir, 'dataset', 'tab3', shap_file)
-    explain_path = os.path.join(base_dir, 'dataset', 'tab3', explain_file)
+    shap_path, explain_path = shap_data_paths(battery_id, preprocessing)
     
     try:
-        shap_values = np.load(shap_path)
-        X_explain = pd.read_csv(explain_path)
+        ensure_local(shap_path)
+        shap_values = np.load(shap_path, mmap_mode='r')
+        X_explain = read_table(fetch_table(explain_path), columns)
         return shap_values, X_explain
     except FileNotFoundError as e:
         raise FileNotFoundError(f"SHAP 데이터를 찾을 수 없습니다: {e}") from e
-    
-def load_lof_cycle_summary(battery_id, preprocessing):
-    """LOF 사이클 요약 데이터 로드"""
-    base_dir = get_base_dir()
 
-    suffix = "_lowess" if preprocessing == "LOWESS" else ""
-    df = pd.read_csv(os.path.join(base_dir, f'dataset/tab2/lof_{battery_id}_cycle_summary{suffix}.csv'))
+@cached_artifact("shap_importance", shap_data_paths)
+def load_shap_importance(battery_id, preprocessing):
+    """shap_values에서 피처별 mean |SHAP| 계산 (feature, importance, column — 중요도 내림차순)
+
+    column은 shap_values에서의 열 위치이며 X_explain 컬럼 순서와 같다.
+    """
+    import numpy as np
+
+    shap_path, explain_path = shap_data_paths(battery_id, preprocessing)
+    
+    try:
+        ensure_local(shap_path)
+        shap_values = np.load(shap_path, mmap_mode='r')
+        columns = table_columns(fetch_table(explain_path))
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"SHAP 데이터를 찾을 수 없습니다: {e}") from e
+    if shap_values.ndim != 2 or shap_values.shape[1] != len(columns):
+        raise ValueError(f"SHAP 값 {shap_values.shape}과 X_explain 컬럼 수({len(columns)})가 맞지 않습니다.")
+    
+    # 메모리 매핑 배열을 행 블록 단위로 한 번만 훑음
+    total = np.zeros(shap_values.shape[1])
+    for start in range(0, len(shap_values), 65536):
+        total += np.abs(shap_values[start:start + 65536]).sum(axis=0)
+    importance = total / max(len(shap_values), 1)
+    df = pd.DataFrame({'feature': columns, 'importance': importance, 'column': np.arange(len(columns))})
+    return df.sort_values('importance', ascending=False, kind='stable').reset_index(drop=True)
+    
+@cached_artifact("lof_cycle_summary", lof_cycle_summary_paths)
+def load_lof_cycle_summary(battery_id, preprocessing, columns=None):
+    """LOF 사이클 요약 데이터 로드 (columns 지정 시 해당 컬럼만)"""
+    summary_path, metadata_path = lof_cycle_summary_paths(battery_id, preprocessing)
+    ensure_local(metadata_path)
+    df = read_table(fetch_table(summary_path), columns)
     
-    with open(os.path.join(base_dir, f'dataset/tab2/lof_{battery_id}_metadata{suffix}.json')) as f:
+    with open(metadata_path) as f:
         metadata = json.load(f)
     
     return df, metadata['threshold']
 
-def load_hi_analysis(battery_id, preprocessing):
-    """HI 변동성 분석 데이터 로드"""
-    base_dir = get_base_dir()
+@cached_artifact("hi_analysis", hi_analysis_paths)
+def load_hi_analysis(battery_id, preprocessing, columns=None):
+    """HI 변동성 분석 데이터 로드 (columns 지정 시 해당 컬럼만)"""
+    analysis_path, metadata_path = hi_analysis_paths(battery_id, preprocessing)
+    ensure_local(metadata_path)
+    val_test_df = read_table(fetch_table(analysis_path), columns)
 
-    suffix = "_lowess" if preprocessing == "LOWESS" else ""
-    val_test_df = pd.read_csv(os.path.join(base_dir, f'dataset/tab4/{battery_id}_hi_analysis{suffix}.csv'))
-
-    with open(os.path.join(base_dir, f'dataset/tab4/{battery_id}_hi_metadata{suffix}.json')) as f:
+    with open(metadata_path) as f:
         metadata = json.load(f)
     
     return val_test_df, metadata
 
-def load_correlation_data(battery_id, model_type, preprocessing):
-    """Correlation 분석 데이터 로드"""
-    base_dir = get_base_dir()
-
-    model_name = "at" if model_type == "Anomaly Transformer" else "lof"
-    suffix = "_lowess" if preprocessing == "LOWESS" else ""
+@cached_artifact("correlation_data", correlation_data_paths)
+def load_correlation_data(battery_id, model_type, preprocessing, columns=None):
+    """Correlation 분석 데이터 로드 (columns 지정 시 해당 컬럼만, 'cycle'은 cycle_idx도 허용)"""
+    data_path, metadata_path = correlation_data_paths(battery_id, model_type, preprocessing)
+    ensure_local(metadata_path)
     
-    df_merged = pd.read_csv(os.path.join(base_dir, f'dataset/tab5/{battery_id}_correlation_{model_name}{suffix}.csv'))
+    data_path = fetch_table(data_path)
+    if columns is not None and 'cycle' in columns and 'cycle' not in table_columns(data_path):
+        columns = [c for c in columns if c != 'cycle'] + ['cycle_idx']
+    df_merged = read_table(data_path, columns)
 
-    if 'cycle_idx' in df_merged.columns:
+    # 'cycle' 컬럼이 없을 때만 cycle_idx를 cycle로 사용 (둘 다 있으면 cycle 유지)
+    if 'cycle_idx' in df_merged.columns and 'cycle' not in df_merged.columns:
         df_merged = df_merged.rename(columns={'cycle_idx': 'cycle'})
 
-    with open(os.path.join(base_dir, f'dataset/tab5/{battery_id}_correlation_metadata_{model_name}{suffix}.json')) as f:
+    with open(metadata_path) as f:
         metadata = json.load(f)
     
-    return df_merged, metadata
\ No newline at end of file
+    return df_merged, metadata
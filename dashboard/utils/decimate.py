@@ -0,0 +1,132 @@
+"""대용량 사이클 시계열을 브라우저로 보내기 전에 줄이는 유틸리티
+
+- lttb: Largest-Triangle-Three-Buckets (선 모양 보존)
+- minmax: 구간별 최솟값/최댓값 (피크 보존)
+point budget을 넘는 시리즈만 줄이며, keep으로 지정한 인덱스(Top 5 이상치 등)는 항상 포함한다.
+"""
+import warnings
+
+import numpy as np
+
+# 시리즈당 최대 포인트 수 (사이드바에서 변경 가능)
+DEFAULT_POINT_BUDGET = 2000
+# 이 포인트 수를 넘으면 WebGL(Scattergl)로 렌더링
+# 기본 point budget(2000)으로 줄인 시리즈는 SVG로 그리고, WebGL은 사이드바에서 budget을 이보다
+# 크게 올렸을 때나 줄이지 않는 산점도(tab5 점수-용량 등)에만 쓰인다.
+WEBGL_THRESHOLD = 5000
+
+
+def lttb(x, y, n_out):
+    """LTTB로 선택한 인덱스 (첫/마지막 포인트 포함)"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # 첫/마지막 포인트를 제외한 구간을 n_out - 2개 버킷으로 분할
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+
+    # 다음 버킷이 모두 NaN이면 평균도 NaN (해당 버킷은 첫 포인트 선택) — 경고는 생략
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        idx[1:-1] = _lttb_buckets(x, y, edges, n)
+    return idx
+
+
+def _lttb_buckets(x, y, edges, n):
+    """가운데 버킷마다 이전 선택점, 다음 버킷 평균과 이루는 삼각형이 가장 큰 포인트"""
+    selected = np.empty(len(edges) - 1, dtype=np.int64)
+    a = 0
+    for i in range(len(edges) - 1):
+        start, stop = edges[i], edges[i + 1]
+        next_start = stop
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = np.nanmean(x[next_start:next_stop])
+        avg_y = np.nanmean(y[next_start:next_stop])
+
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        selected[i] = a
+    return selected
+
+
+def minmax(x, y, n_out):
+    """구간별 최솟값/최댓값 인덱스 ((n_out - 2) // 2개 구간 + 첫/마지막 포인트)"""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    # 구간마다 2개 + 첫/마지막 포인트가 n_out을 넘지 않도록
+    n_buckets = (n_out - 2) // 2
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    # 버킷 → 값 순으로 정렬하면 각 버킷의 처음/끝이 최솟값/최댓값
+    order = np.lexsort((np.nan_to_num(y, nan=-np.inf), bucket))
+    idx = np.concatenate([order[edges[:-1]], order[edges[1:] - 1], [0, n - 1]])
+    return np.unique(idx)
+
+
+def decimate(x, y, point_budget=DEFAULT_POINT_BUDGET, method='lttb', keep=None):
+    """point budget에 맞춘 오름차순 인덱스 (첫/마지막 포인트와 keep 인덱스는 항상 포함)
+
+    keep 몫만큼 budget을 비워 두고 나머지를 줄이므로 결과는 point budget 이하다
+    (keep이 budget - 2개를 넘을 때만 예외로 첫/마지막 + keep 전부).
+    """
+    n = len(y)
+    if point_budget is None or n <= point_budget:
+        return np.arange(n)
+    keep = np.unique(np.asarray(keep if keep is not None else [], dtype=np.int64))
+    n_out = point_budget - len(keep)
+    if n_out < 4:
+        idx = np.array([0, n - 1], dtype=np.int64)
+    elif method == 'minmax':
+        idx = minmax(x, y, n_out)
+    else:
+        idx = lttb(x, y, n_out)
+    return np.union1d(idx, keep)
+
+
+class StreamingLTTB:
+    """행이 계속 추가되는 시리즈의 축소 인덱스 (누적 시리즈 전체에 lttb를 한 번 적용한 결과와 같음)
+
+    LTTB 버킷 경계는 전체 길이에 따라 바뀌므로 새 행이 들어오면 메모리의 누적 배열을 한 번
+    다시 훑는다 (파일은 다시 읽지 않음). budget 이하인 동안은 새 위치만 덧붙이고,
+    행 수가 그대로면 이전 결과를 그대로 돌려준다.
+    """
+
+    def __init__(self, point_budget=DEFAULT_POINT_BUDGET):
+        self.point_budget = point_budget
+        self.idx = np.empty(0, dtype=np.int64)
+        self.n_seen = 0
+
+    def update(self, x, y):
+        """누적 x, y (앞부분은 바뀌지 않음)의 선택 인덱스 (오름차순)"""
+        n = len(y)
+        if n == self.n_seen:
+            return self.idx
+        if self.point_budget is None or n <= self.point_budget:
+            self.idx = np.arange(n)
+        else:
+            self.idx = lttb(x[:n], y[:n], self.point_budget)
+        self.n_seen = n
+        return self.idx
+
+
+def scatter_cls(n_points):
+    """포인트 수에 따라 Scatter 또는 Scattergl"""
+    import plotly.graph_objects as go
+
+    return go.Scattergl if n_points > WEBGL_THRESHOLD else go.Scatter
+
+
+def series_trace(x, y, point_budget=DEFAULT_POINT_BUDGET, method='lttb', keep=None, **kwargs):
+    """시리즈를 줄여서 trace 생성 (남은 포인트가 많으면 Scattergl)"""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    idx = decimate(x, y, point_budget, method, keep)
+    return scatter_cls(len(idx))(x=x[idx], y=y[idx], **kwargs)
@@ -0,0 +1,127 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from utils.cache import file_signature
+from utils.perf import span
+
+# 직렬화된 figure 캐시 최대 크기 (bytes)
+FIGURE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+
+def data_version(paths):
+    """아티팩트 파일 (경로, mtime, size) 해시 — 파일이 아직 없으면 None"""
+    sig = file_signature(paths)
+    if sig is None:
+        return None
+    return hashlib.sha1(repr(sig).encode()).hexdigest()
+
+
+class FigureCache:
+    """사이드바 상태 + 데이터 버전으로 키를 잡는 직렬화 figure 캐시"""
+
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (version, payload, nbytes, build_seconds)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or version is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry[3]
+            return entry[1]
+
+    def put(self, key, version, payload, build_seconds):
+        nbytes = sum(len(v) for kind, v in payload.values() if kind == 'figure')
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[2]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (version, payload, nbytes, build_seconds)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[2]
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'saved_seconds': self.saved_seconds,
+            }
+
+
+# 프로세스 전역 figure 캐시 (모든 Streamlit 세션이 공유)
+figure_cache = FigureCache()
+
+
+def _serialize(result):
+    import plotly.graph_objects as go
+
+    return {
+        name: ('figure', value.to_json()) if isinstance(value, go.Figure) else ('value', value)
+        for name, value in result.items()
+    }
+
+
+def _deserialize(payload):
+    import plotly.io as pio
+
+    return {
+        name: pio.from_json(value) if kind == 'figure' else copy.deepcopy(value)
+        for name, (kind, value) in payload.items()
+    }
+
+
+def cached_figures(key, paths, build):
+    """build()가 만든 {이름: figure 또는 값} dict를 캐시에서 반환
+
+    key는 (view, battery_id, model_type, preprocessing, ...) 형태의 사이드바 상태이며
+    paths는 figure가 의존하는 아티팩트 파일 목록이다. 캐시 적중 시 데이터 로드와
+    figure 생성을 모두 건너뛴다.
+    """
+    version = data_version(paths)
+    payload = figure_cache.get(key, version)
+    if payload is not None:
+        with span(f"figure.{key[0]}", cache='hit'):
+            return _deserialize(payload)
+
+    started = time.perf_counter()
+    with span(f"figure.{key[0]}", cache='miss'):
+        result = build()
+    elapsed = time.perf_counter() - started
+
+    # 로딩 중 파일을 받아왔을 수 있으므로 버전을 다시 계산
+    version = data_version(paths)
+    if version is not None:
+        figure_cache.put(key, version, _serialize(result), elapsed)
+    return result
+
+
+def figure_cache_stats():
+    """figure 캐시 통계 (saved_seconds: 적중으로 절약한 생성 시간 합계)"""
+    return figure_cache.stats()
@@ -0,0 +1,144 @@
+"""다중 배터리 fleet 요약 테이블
+
+대시보드(tab6)는 스레드 풀로 세션 공유 아티팩트 캐시를 그대로 쓰고, 테이블 자체도
+입력 파일 서명으로 캐시해 파일이 바뀌지 않으면 다시 계산하지 않는다.
+오프라인 일괄 처리는 CLI에서 프로세스 풀로 CSV 파싱까지 코어 수만큼 병렬화한다.
+
+사용법 (dashboard/ 에서):
+    python -m utils.fleet [--model LOF] [--preprocessing "Raw Data"] [--workers 4]
+"""
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import cached_artifact
+from utils.dataloader import (
+    anomaly_results_paths,
+    discharge_summary_paths,
+    discover_batteries,
+    load_anomaly_results,
+    load_discharge_summary,
+    load_lof_cycle_summary,
+    lof_cycle_summary_paths,
+)
+
+# 앱 내 스레드 풀 워커 수 (캐시 조회 + 처음 한 번의 로드/다운로드)
+FLEET_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+logger = logging.getLogger(__name__)
+
+FLEET_COLUMNS = [
+    'battery_id', 'cycles', 'current_capacity', 'capacity_fade_pct',
+    'max_anomaly_score', 'threshold', 'cycles_over_threshold', 'status',
+]
+
+
+def _cycle_scores(battery_id, model_type, preprocessing):
+    """(사이클별 점수 배열, threshold)"""
+    if model_type == "Anomaly Transformer":
+        results = load_anomaly_results(battery_id, model_type, preprocessing)
+        return np.asarray(results['scores']), results['threshold']
+    cycle_summary, threshold = load_lof_cycle_summary(battery_id, preprocessing, columns=('mean_score',))
+    return cycle_summary['mean_score'].to_numpy(dtype=float), threshold
+
+
+def summarize_battery(battery_id, model_type, preprocessing):
+    """배터리 하나의 fleet 테이블 행 (없거나 읽을 수 없는 아티팩트는 NaN으로 두고 status에 기록)"""
+    row = dict.fromkeys(FLEET_COLUMNS, np.nan)
+    row['battery_id'] = battery_id
+    missing, unreadable = [], []
+
+    try:
+        discharge = load_discharge_summary(battery_id, columns=('cycle_idx', 'capacity'))
+        capacity = discharge.sort_values('cycle_idx')['capacity'].to_numpy(dtype=float)
+        row['cycles'] = len(capacity)
+        if len(capacity):
+            row['current_capacity'] = capacity[-1]
+            row['capacity_fade_pct'] = (capacity[-1] / capacity[0] - 1) * 100
+    except FileNotFoundError:
+        missing.append('discharge summary')
+    except Exception:
+        # 손상된 파일 하나 때문에 테이블 전체가 실패하지 않도록 해당 배터리 행에만 표시
+        logger.warning("fleet 요약 실패 (discharge summary): %s", battery_id, exc_info=True)
+        unreadable.append('discharge summary')
+
+    try:
+        scores, threshold = _cycle_scores(battery_id, model_type, preprocessing)
+        row['threshold'] = threshold
+        if len(scores):
+            row['max_anomaly_score'] = float(np.nanmax(scores))
+        row['cycles_over_threshold'] = int(np.count_nonzero(scores > threshold))
+    except FileNotFoundError:
+        missing.append('anomaly scores')
+    except Exception:
+        logger.warning("fleet 요약 실패 (anomaly scores): %s", battery_id, exc_info=True)
+        unreadable.append('anomaly scores')
+
+    problems = [label + ", ".join(items) for label, items in (("Missing ", missing), ("Unreadable ", unreadable)) if items]
+    row['status'] = "; ".join(problems) or "OK"
+    return row
+
+
+def fleet_paths(batteries, model_type, preprocessing):
+    """fleet 테이블 입력 파일 중 로컬에 있는 것 (없는 파일은 행에 Missing으로 남으므로 키에서 제외)"""
+    paths = []
+    for battery_id in batteries:
+        paths += discharge_summary_paths(battery_id)
+        if model_type == "Anomaly Transformer":
+            paths += anomaly_results_paths(battery_id, model_type, preprocessing)
+        else:
+            paths += lof_cycle_summary_paths(battery_id, preprocessing)
+    return [path for path in paths if os.path.exists(path)]
+
+
+def summarize_fleet(batteries, model_type, preprocessing, max_workers=FLEET_MAX_WORKERS, use_processes=False):
+    """배터리들을 병렬로 요약해 max anomaly score 내림차순 DataFrame 반환
+
+    use_processes=True는 오프라인 CLI 전용이다. Streamlit 서버(멀티스레드)에서 fork하면
+    잠금 상태가 복사돼 교착될 수 있고, 자식 프로세스의 아티팩트 캐시는 버려진다.
+    """
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    workers = max(1, min(max_workers, len(batteries)))
+    with executor_cls(max_workers=workers) as pool:
+        rows = list(pool.map(summarize_battery, batteries,
+                             [model_type] * len(batteries), [preprocessing] * len(batteries)))
+
+    fleet = pd.DataFrame(rows, columns=FLEET_COLUMNS)
+    fleet = fleet.sort_values('max_anomaly_score', ascending=False, na_position='last', kind='stable')
+    return fleet.reset_index(drop=True)
+
+
+@cached_artifact("fleet_table", fleet_paths)
+def fleet_table(batteries, model_type, preprocessing):
+    """앱용 fleet 테이블 (스레드 풀, 입력 파일이 바뀔 때만 다시 계산)"""
+    return summarize_fleet(batteries, model_type, preprocessing)
+
+
+def load_fleet(batteries, model_type, preprocessing):
+    """fleet 테이블과 소요 시간(초) 반환"""
+    started = time.perf_counter()
+    fleet = fleet_table(batteries, model_type, preprocessing)
+    return fleet, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="다중 배터리 fleet 요약 테이블")
+    parser.add_argument('--model', default="LOF", choices=["LOF", "Anomaly Transformer"])
+    parser.add_argument('--preprocessing', default="Raw Data", choices=["Raw Data", "LOWESS"])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    batteries = discover_batteries()
+    fleet = summarize_fleet(batteries, args.model, args.preprocessing, args.workers, use_processes=True)
+    print(fleet.to_string(index=False))
+    print(f"{len(fleet)}개 배터리 요약 ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""KD-tree 기반 LOF 점수 엔진 (재학습 없이 새 샘플 점수 계산)
+
+학습 피처로 KD-tree를 만들고, 학습 포인트마다 k-distance와 local reachability
+density(lrd)를 미리 계산해 둔다. 새 샘플은 k-NN 한 번 질의(O(k log n))와 캐시된
+값만으로 점수를 계산한다. 점수는 sklearn LocalOutlierFactor(novelty=True)의
+-score_samples와 같은 LOF 값이며 클수록 이상이다.
+피처는 표준화 없이 그대로 쓰므로 metadata threshold를 만든 학습 파이프라인과 같은 피처 공간이어야 한다.
+
+사용법 (dashboard/ 에서):
+    python -m utils.lof_engine score --train train.csv --input new.csv --out summary.csv
+        [--metadata lof_B0005_metadata.json] [--battery B0005 --preprocessing LOWESS --append]
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from utils.columnar import COLUMNAR_SUFFIX, read_table, schema_for, to_schema
+from utils.dataloader import lof_cycle_summary_paths
+
+# tab3 Feature 설명의 피처 목록
+FEATURES = [
+    'Current_measured_trend',
+    'Current_load_trend',
+    'Voltage_measured_trend',
+    'Voltage_load_trend',
+    'Temperature_measured',
+    'Temperature_measured_smooth',
+    'Temperature_measured_residual',
+    'Voltage_measured',
+    'Voltage_measured_smooth',
+    'Current_load_smooth',
+]
+
+N_NEIGHBORS = 20
+LEAF_SIZE = 40
+SCORE_BATCH_SIZE = 8192
+# metadata threshold가 없을 때 학습 점수의 이 분위수를 threshold로 사용
+THRESHOLD_QUANTILE = 0.95
+
+# sklearn LocalOutlierFactor와 같은 0 나눗셈 방지값
+_EPS = 1e-10
+
+
+class LOFIndex:
+    """학습 포인트의 k-distance / lrd를 캐시한 LOF 인덱스"""
+
+    def __init__(self, X, n_neighbors=N_NEIGHBORS, leaf_size=LEAF_SIZE):
+        X = np.asarray(X, dtype=float)
+        self.n_neighbors = min(n_neighbors, len(X) - 1)
+        if self.n_neighbors < 1:
+            raise ValueError("LOF 학습에는 최소 2개의 샘플이 필요합니다.")
+
+        self.X = X
+        self.tree = KDTree(self.X, leaf_size=leaf_size)
+
+        # 자기 자신을 제외한 k개 이웃 (중복 포인트가 있어도 sklearn처럼 자기 인덱스를 뺌)
+        dist, ind = self.tree.query(self.X, k=self.n_neighbors + 1)
+        is_self = ind == np.arange(len(ind))[:, None]
+        is_self[~is_self.any(axis=1), -1] = True
+        dist = dist[~is_self].reshape(len(ind), -1)
+        ind = ind[~is_self].reshape(len(ind), -1)
+        self.k_distance = dist[:, -1]
+        self.lrd = self._lrd(dist, ind)
+        self.train_scores = self.lrd[ind].mean(axis=1) / self.lrd
+
+    def _lrd(self, dist, ind):
+        """reach-dist(p, o) = max(k-distance(o), d(p, o))의 평균 역수"""
+        reach = np.maximum(dist, self.k_distance[ind])
+        return 1.0 / (reach.mean(axis=1) + _EPS)
+
+    def score(self, X, batch_size=SCORE_BATCH_SIZE):
+        """새 샘플들의 LOF 점수 (배치 단위 벡터화)"""
+        X = np.asarray(X, dtype=float)
+        scores = np.empty(len(X))
+        for start in range(0, len(X), batch_size):
+            batch = X[start:start + batch_size]
+            dist, ind = self.tree.query(batch, k=self.n_neighbors)
+            scores[start:start + batch_size] = self.lrd[ind].mean(axis=1) / self._lrd(dist, ind)
+        return scores
+
+    def default_threshold(self):
+        return float(np.quantile(self.train_scores, THRESHOLD_QUANTILE))
+
+
+def aggregate_cycles(cycle_idx, scores, threshold, split=None):
+    """샘플 점수를 tab2 LOF 사이클 요약 형식 (cycle_idx, mean_score, split, has_anom)으로 집계"""
+    cycles, inverse = np.unique(np.asarray(cycle_idx), return_inverse=True)
+    counts = np.bincount(inverse)
+    mean_score = np.bincount(inverse, weights=scores) / counts
+    has_anom = np.bincount(inverse, weights=scores > threshold) > 0
+
+    summary = pd.DataFrame({'cycle_idx': cycles, 'mean_score': mean_score})
+    if split is not None:
+        # 사이클의 첫 샘플 split 사용
+        first = np.full(len(cycles), len(inverse))
+        np.minimum.at(first, inverse, np.arange(len(inverse)))
+        summary['split'] = np.asarray(split)[first]
+    else:
+        summary['split'] = 'test'
+    summary['has_anom'] = has_anom
+    return summary
+
+
+def score_frame(index, df, threshold, features=FEATURES):
+    """cycle_idx + 피처 컬럼 DataFrame을 점수 매겨 사이클 요약으로 반환"""
+    scores = index.score(df[features].to_numpy(dtype=float))
+    split = df['split'].to_numpy() if 'split' in df.columns else None
+    return aggregate_cycles(df['cycle_idx'].to_numpy(), scores, threshold, split)
+
+
+def append_cycle_summary(battery_id, preprocessing, summary):
+    """새 사이클 요약을 기존 LOF 사이클 요약 끝에 추가 (로더가 읽는 파일 형식 그대로)
+
+    CSV는 끝에 이어 쓰고 (live tail이 새 행만 읽음), Parquet은 기존 행과 합쳐 원자적으로 다시 쓴다.
+    Parquet 옆에 새 CSV를 만들면 더 최신인 CSV로 전환돼 기존 이력이 사라진 것처럼 보인다.
+    """
+    summary_path, _ = lof_cycle_summary_paths(battery_id, preprocessing)
+    if summary_path.endswith(COLUMNAR_SUFFIX):
+        existing = read_table(summary_path)
+        merged = pd.concat([existing, summary.reindex(columns=existing.columns)], ignore_index=True)
+        tmp_path = summary_path + '.tmp'
+        to_schema(merged, schema_for(summary_path)).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, summary_path)
+        return summary_path
+
+    exists = os.path.exists(summary_path)
+    if exists:
+        header = pd.read_csv(summary_path, nrows=0).columns.tolist()
+        summary = summary.reindex(columns=header)
+    summary.to_csv(summary_path, mode='a' if exists else 'w', header=not exists, index=False)
+    return summary_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KD-tree LOF로 새 샘플 점수 계산")
+    parser.add_argument('command', choices=['score'])
+    parser.add_argument('--train', required=True, help="학습 피처 CSV")
+    parser.add_argument('--input', required=True, help="점수를 매길 CSV (cycle_idx + 피처)")
+    parser.add_argument('--out', help="사이클 요약 CSV 저장 경로")
+    parser.add_argument('--metadata', help="threshold를 읽을 LOF metadata JSON")
+    parser.add_argument('--neighbors', type=int, default=N_NEIGHBORS)
+    parser.add_argument('--battery')
+    parser.add_argument('--preprocessing', choices=['LOWESS', 'Raw Data'], default='LOWESS')
+    parser.add_argument('--append', action='store_true', help="배터리 LOF 사이클 요약 CSV에 추가")
+    args = parser.parse_args()
+
+    index = LOFIndex(pd.read_csv(args.train, usecols=FEATURES)[FEATURES].to_numpy(), args.neighbors)
+    if args.metadata:
+        with open(args.metadata) as f:
+            threshold = json.load(f)['threshold']
+    else:
+        threshold = index.default_threshold()
+
+    summary = score_frame(index, pd.read_csv(args.input), threshold)
+    print(f"{len(summary)}개 사이클 점수 계산 (threshold {threshold:.4f}, "
+          f"이상 사이클 {int(summary['has_anom'].sum())}개)")
+    if args.out:
+        summary.to_csv(args.out, index=False)
+    if args.append:
+        if not args.battery:
+            parser.error("--append에는 --battery가 필요합니다.")
+        print(f"→ {append_cycle_summary(args.battery, args.preprocessing, summary)}")
+
+
+if __name__ == '__main__':
+    main()
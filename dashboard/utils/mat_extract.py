@@ -0,0 +1,192 @@
+"""NASA PCoE 원시 .mat 사이클 데이터 → 방전 요약 CSV / 상관 파일 R_ohmic 추출
+
+.mat 구조: {battery}.mat → [battery]['cycle'] 목록, 사이클마다
+    type: 'charge' | 'discharge' | 'impedance'
+    data: discharge → Voltage_measured, Current_measured, Temperature_measured, Time, Capacity ...
+          impedance → Re, Rct ...
+cycle_idx는 [battery]['cycle'] 목록에서의 위치(0부터)로, 점수 아티팩트와 파형 저장소가 같은 번호를 쓴다.
+방전 사이클들의 배열을 한 번에 이어 붙인 뒤 reduceat으로 사이클별 요약을 벡터화해 계산한다.
+샘플이 없는 방전 사이클은 요약하지 않는다.
+
+- discharge_summary_{battery}.csv: 아직 없는 cycle_idx의 방전 사이클만 요약해 추가
+- tab5/{battery}_correlation_*.csv: R_ohmic이 비어 있는 행을 채움
+  (R_ohmic은 각 방전 사이클 직전의 임피던스 측정 Re 값, 이전 측정이 없으면 다음 측정값)
+
+사용법 (dashboard/ 에서):
+    python -m utils.mat_extract RAW_DIR [--out DATASET_DIR] [--workers 4]
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.dataloader import get_dataset_dir
+
+SUMMARY_COLUMNS = ['cycle_idx', 'capacity', 'dis_volt_min', 'dis_temp_max', 'dis_time']
+EXTRACT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def load_cycles(mat_path):
+    """.mat 파일의 사이클 목록 (dict 목록)"""
+    from scipy.io import loadmat
+
+    battery_id = os.path.splitext(os.path.basename(mat_path))[0]
+    mat = loadmat(mat_path, simplify_cells=True)
+    cycles = mat[battery_id]['cycle']
+    return cycles if isinstance(cycles, list) else [cycles]
+
+
+def discharge_cycles(cycles):
+    """(방전 사이클의 원시 cycle 인덱스 배열, 방전 data 목록)"""
+    pairs = [(i, c['data']) for i, c in enumerate(cycles) if c['type'] == 'discharge']
+    return np.array([i for i, _ in pairs], dtype=np.int64), [d for _, d in pairs]
+
+
+def ohmic_per_discharge(cycles):
+    """방전 사이클별 R_ohmic DataFrame (cycle_idx, R_ohmic) — 측정이 전혀 없으면 NaN"""
+    values, current = [], np.nan
+    for cycle in cycles:
+        if cycle['type'] == 'impedance':
+            re = np.real(np.asarray(cycle['data'].get('Re', np.nan), dtype=complex)).ravel()
+            if len(re) and np.isfinite(re[0]):
+                current = float(re[0])
+        elif cycle['type'] == 'discharge':
+            values.append(current)
+    return pd.DataFrame({
+        'cycle_idx': discharge_cycles(cycles)[0],
+        'R_ohmic': pd.Series(values, dtype=float).bfill().to_numpy(),
+    })
+
+
+def _concat_offsets(arrays):
+    """(이어 붙인 배열, 사이클별 시작 위치, 길이)"""
+    lengths = np.array([len(a) for a in arrays], dtype=np.int64)
+    return np.concatenate(arrays), np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths
+
+
+def summarize_discharges(cycles, skip=()):
+    """방전 사이클 요약 DataFrame (cycle_idx가 skip에 있는 사이클과 샘플이 없는 사이클은 제외)"""
+    cycle_idx, discharges = discharge_cycles(cycles)
+    keep = ~np.isin(cycle_idx, np.fromiter(skip, dtype=np.int64))
+
+    def column(name):
+        return [np.atleast_1d(np.asarray(d[name], dtype=float)) for d in discharges]
+
+    voltage, temperature, times = column('Voltage_measured'), column('Temperature_measured'), column('Time')
+    capacity = column('Capacity')
+    # reduceat은 길이 0 구간에서 다음 구간 값을 돌려주므로 빈 사이클은 먼저 제외
+    keep &= np.array([min(len(v), len(t), len(s), len(c)) > 0
+                      for v, t, s, c in zip(voltage, temperature, times, capacity)], dtype=bool)
+    if not keep.any():
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    selected = np.flatnonzero(keep)
+
+    # 모든 사이클을 이어 붙여 reduceat 한 번으로 사이클별 최솟값/최댓값 계산
+    volt_all, volt_offsets, _ = _concat_offsets([voltage[i] for i in selected])
+    temp_all, temp_offsets, _ = _concat_offsets([temperature[i] for i in selected])
+    time_all, time_offsets, time_lengths = _concat_offsets([times[i] for i in selected])
+
+    return pd.DataFrame({
+        'cycle_idx': cycle_idx[selected],
+        'capacity': np.array([capacity[i][-1] for i in selected]),
+        'dis_volt_min': np.minimum.reduceat(volt_all, volt_offsets),
+        'dis_temp_max': np.maximum.reduceat(temp_all, temp_offsets),
+        'dis_time': time_all[time_offsets + time_lengths - 1] - time_all[time_offsets],
+    })
+
+
+def summary_path(battery_id, dataset_dir=None):
+    return os.path.join(dataset_dir or get_dataset_dir(), f'discharge_summary_{battery_id}.csv')
+
+
+def correlation_paths(battery_id, dataset_dir=None):
+    """배터리의 모든 상관 분석 CSV (모델/전처리별)"""
+    pattern = os.path.join(dataset_dir or get_dataset_dir(), 'tab5', f'{battery_id}_correlation_*.csv')
+    return sorted(p for p in glob.glob(pattern) if '_correlation_metadata_' not in os.path.basename(p))
+
+
+def _summarized_cycles(path):
+    """이미 요약된 cycle_idx 집합"""
+    if not os.path.exists(path):
+        return set()
+    return set(pd.read_csv(path, usecols=['cycle_idx'])['cycle_idx'].astype(np.int64).tolist())
+
+
+def _write_csv(path, df):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', newline='') as f:
+        df.to_csv(f, index=False)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+
+def fill_correlation_ohmic(path, ohmic):
+    """상관 CSV에서 R_ohmic이 비어 있는 행을 cycle 번호로 채움, 채운 행 수 반환"""
+    df = pd.read_csv(path)
+    key = 'cycle' if 'cycle' in df.columns else 'cycle_idx'
+    if 'R_ohmic' not in df.columns:
+        df['R_ohmic'] = np.nan
+    missing = df['R_ohmic'].isna()
+    values = df.loc[missing, key].map(ohmic.set_index('cycle_idx')['R_ohmic'])
+    filled = int(values.notna().sum())
+    if filled:
+        df.loc[missing, 'R_ohmic'] = values
+        _write_csv(path, df)
+    return filled
+
+
+def extract_battery(mat_path, dataset_dir):
+    """배터리 하나의 새 방전 사이클 요약을 추가하고 상관 파일 R_ohmic을 채움
+
+    (battery_id, 추가된 사이클 수, R_ohmic을 채운 행 수) 반환
+    """
+    battery_id = os.path.splitext(os.path.basename(mat_path))[0]
+    path = summary_path(battery_id, dataset_dir)
+    cycles = load_cycles(mat_path)
+
+    summary = summarize_discharges(cycles, skip=_summarized_cycles(path))
+    if len(summary):
+        if os.path.exists(path):
+            header = pd.read_csv(path, nrows=0).columns.tolist()
+            summary.reindex(columns=header).to_csv(path, mode='a', header=False, index=False)
+        else:
+            summary.to_csv(path, index=False)
+
+    ohmic = ohmic_per_discharge(cycles)
+    filled = sum(fill_correlation_ohmic(p, ohmic) for p in correlation_paths(battery_id, dataset_dir))
+    return battery_id, len(summary), filled
+
+
+def extract_all(raw_dir, dataset_dir=None, max_workers=EXTRACT_MAX_WORKERS):
+    """raw_dir의 모든 .mat을 배터리별 프로세스로 병렬 추출"""
+    dataset_dir = str(dataset_dir or get_dataset_dir())
+    os.makedirs(dataset_dir, exist_ok=True)
+    mat_paths = sorted(glob.glob(os.path.join(raw_dir, '*.mat')))
+    if not mat_paths:
+        return []
+    workers = max(1, min(max_workers, len(mat_paths)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(extract_battery, mat_paths, [dataset_dir] * len(mat_paths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NASA .mat 원시 데이터에서 방전 요약 CSV 추출")
+    parser.add_argument('raw_dir', help="{battery}.mat 파일 디렉토리")
+    parser.add_argument('--out', help="dataset 디렉토리 (기본: 대시보드 dataset/)")
+    parser.add_argument('--workers', type=int, default=EXTRACT_MAX_WORKERS)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = extract_all(args.raw_dir, args.out, args.workers)
+    for battery_id, added, filled in results:
+        print(f"{battery_id}: {added}개 방전 사이클 추가, R_ohmic {filled}행 채움")
+    print(f"{len(results)}개 배터리 처리 ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+"""헤더 메트릭 (Spearman 상관, p-value, 최초 이상 사이클, baseline 대비 변화) 계산
+
+모든 (배터리 × 모델 × 전처리) 조합을 한 번에 계산해 dataset/metrics.csv에 저장하고,
+대시보드는 (battery_id, model_type, preprocessing) 키로 바로 조회한다.
+
+사용법 (dashboard/ 에서):
+    python -m utils.metrics build
+"""
+import argparse
+import logging
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import cached_artifact
+from utils.columnar import read_table, resolve_table_path
+from utils import dataloader
+from utils.dataloader import (
+    anomaly_results_paths,
+    correlation_data_paths,
+    fetch_table,
+    get_dataset_dir,
+    load_anomaly_results,
+    load_correlation_data,
+    load_lof_cycle_summary,
+    lof_cycle_summary_paths,
+)
+
+METRICS_FILE = "metrics.csv"
+BASELINE_MODEL = "LOF"
+MODEL_TYPES = {"at": "Anomaly Transformer", "lof": "LOF"}
+
+logger = logging.getLogger(__name__)
+
+_CORRELATION_FILE = re.compile(r'^(?P<battery>.+)_correlation_(?P<model>at|lof)(?P<lowess>_lowess)?\.(csv|parquet)$')
+
+EMPTY_METRICS = {
+    'capacity_corr': "N/A",
+    'rohmic_corr': "N/A",
+    'anomaly_cycle': "N/A",
+    'capacity_delta': "No data",
+    'rohmic_delta': "No data",
+    'p_value': "N/A",
+    'confidence': 'No data'
+}
+
+
+def metrics_path():
+    return os.path.join(get_dataset_dir(), METRICS_FILE)
+
+
+def battery_metrics_paths(battery_id, preprocessing):
+    """배터리 단독 계산에 쓰이는 입력 파일 중 로컬에 있는 것 (원격에 없는 파일은 키에서 제외)"""
+    paths = lof_cycle_summary_paths(battery_id, preprocessing)
+    for model_type in MODEL_TYPES.values():
+        paths = paths + correlation_data_paths(battery_id, model_type, preprocessing)
+        if model_type != "LOF":
+            paths = paths + anomaly_results_paths(battery_id, model_type, preprocessing)
+    return [path for path in paths if os.path.exists(path)]
+
+
+def discover_combinations(dataset_dir=None):
+    """tab5 상관 파일로부터 (battery_id, model_type, preprocessing) 목록"""
+    tab5_dir = os.path.join(dataset_dir or get_dataset_dir(), 'tab5')
+    combos = set()
+    for name in os.listdir(tab5_dir) if os.path.isdir(tab5_dir) else []:
+        m = _CORRELATION_FILE.match(name)
+        if m:
+            preprocessing = "LOWESS" if m.group('lowess') else "Raw Data"
+            combos.add((m.group('battery'), MODEL_TYPES[m.group('model')], preprocessing))
+    return sorted(combos)
+
+
+def batch_spearman(x, y):
+    """행마다 Spearman 상관과 양측 p-value (NaN 패딩 허용, 벡터화)
+
+    x, y: (조합 수, 최대 길이) 배열. 같은 위치에 값이 모두 있는 포인트만 사용한다.
+    """
+    from scipy import stats
+
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x = np.where(valid, x, np.nan)
+    y = np.where(valid, y, np.nan)
+
+    # 동점은 평균 순위 (scipy.stats.spearmanr과 동일)
+    rx = pd.DataFrame(x).rank(axis=1).to_numpy()
+    ry = pd.DataFrame(y).rank(axis=1).to_numpy()
+
+    n = valid.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dx = rx - np.nanmean(rx, axis=1, keepdims=True)
+        dy = ry - np.nanmean(ry, axis=1, keepdims=True)
+        r = np.nansum(dx * dy, axis=1) / np.sqrt(np.nansum(dx ** 2, axis=1) * np.nansum(dy ** 2, axis=1))
+        r = np.clip(r, -1.0, 1.0)
+        t = r * np.sqrt((n - 2) / ((1.0 - r) * (1.0 + r)))
+        p = 2 * stats.t.sf(np.abs(t), n - 2)
+    p = np.where(np.abs(r) == 1.0, 0.0, p)
+    r = np.where(n > 2, r, np.nan)
+    p = np.where(n > 2, p, np.nan)
+    return r, p
+
+
+def _pad(series_list):
+    """길이가 다른 1차원 배열들을 NaN 패딩한 2차원 배열로"""
+    width = max((len(s) for s in series_list), default=0)
+    out = np.full((len(series_list), width), np.nan)
+    for i, s in enumerate(series_list):
+        out[i, :len(s)] = s
+    return out
+
+
+def first_anomaly_cycle(battery_id, model_type, preprocessing):
+    """threshold를 처음 넘는 사이클 (없으면 None)"""
+    if model_type == "Anomaly Transformer":
+        results = load_anomaly_results(battery_id, model_type, preprocessing)
+        cycles, scores, threshold = results['cycles'], results['scores'], results['threshold']
+    else:
+        cycle_summary, threshold = load_lof_cycle_summary(
+            battery_id, preprocessing, columns=('cycle_idx', 'mean_score'))
+        order = np.argsort(cycle_summary['cycle_idx'].to_numpy(), kind='stable')
+        cycles = cycle_summary['cycle_idx'].to_numpy()[order]
+        scores = cycle_summary['mean_score'].to_numpy()[order]
+    above = np.flatnonzero(np.asarray(scores) > threshold)
+    return int(cycles[above[0]]) if len(above) else None
+
+
+def compute_metrics(combos):
+    """조합 목록의 메트릭을 한 번에 계산해 DataFrame으로 반환"""
+    rows, capacity, rohmic, score = [], [], [], []
+    for battery_id, model_type, preprocessing in combos:
+        key = (battery_id, model_type, preprocessing)
+        try:
+            df, _ = load_correlation_data(battery_id, model_type, preprocessing,
+                                          columns=('mean_score', 'Capacity', 'R_ohmic'))
+        except FileNotFoundError:
+            continue
+        except Exception:
+            # 받아올 수 없는 아티팩트 (오프라인/credentials 없음, 손상된 파일) — 조합 하나 때문에 헤더 전체가 실패하지 않도록
+            logger.warning("메트릭 계산에서 제외: %s", key, exc_info=True)
+            continue
+        try:
+            first_cycle = first_anomaly_cycle(battery_id, model_type, preprocessing)
+        except FileNotFoundError:
+            first_cycle = None
+        except Exception:
+            logger.warning("최초 이상 사이클 계산 실패: %s", key, exc_info=True)
+            first_cycle = None
+        rows.append({
+            'battery_id': battery_id,
+            'model_type': model_type,
+            'preprocessing': preprocessing,
+            'first_anomaly_cycle': first_cycle,
+        })
+        score.append(df['mean_score'].to_numpy(dtype=float))
+        capacity.append(df['Capacity'].to_numpy(dtype=float))
+        rohmic.append(df['R_ohmic'].to_numpy(dtype=float))
+
+    table = pd.DataFrame(rows, columns=['battery_id', 'model_type', 'preprocessing', 'first_anomaly_cycle'])
+    if table.empty:
+        return table
+
+    # Capacity/R_ohmic 두 상관을 한 배치로 계산
+    scores = _pad(score)
+    r, p = batch_spearman(np.vstack([scores, scores]), np.vstack([_pad(capacity), _pad(rohmic)]))
+    n_combos = len(table)
+    table['capacity_corr'], table['rohmic_corr'] = r[:n_combos], r[n_combos:]
+    table['capacity_p'], table['rohmic_p'] = p[:n_combos], p[n_combos:]
+    table['n_cycles'] = [len(s) for s in score]
+
+    # baseline(같은 배터리/전처리의 LOF) 대비 |상관| 변화율
+    baseline = table[table['model_type'] == BASELINE_MODEL].set_index(['battery_id', 'preprocessing'])
+    keys = pd.MultiIndex.from_frame(table[['battery_id', 'preprocessing']])
+    for col in ('capacity_corr', 'rohmic_corr'):
+        base = baseline[col].reindex(keys).to_numpy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = (np.abs(table[col].to_numpy()) - np.abs(base)) / np.abs(base) * 100
+        table[col.replace('_corr', '_delta_pct')] = np.where(table['model_type'] == BASELINE_MODEL, 0.0, delta)
+
+    table['first_anomaly_cycle'] = table['first_anomaly_cycle'].astype('Int64')
+    return table
+
+
+def build_metrics_table(combos=None):
+    """모든 조합을 계산해 metrics.csv로 저장 (원자적 교체)"""
+    table = compute_metrics(combos if combos is not None else discover_combinations())
+    path = metrics_path()
+    tmp_path = path + '.tmp'
+    table.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return table
+
+
+def fetch_metrics_table():
+    """metrics.csv를 로컬에 준비하고 읽을 경로 반환 — 원격에 없거나 S3를 쓸 수 없으면 None
+
+    실패는 프로세스 동안 기억해 매 rerun마다 S3에 다시 묻지 않는다 (헤더는 배터리별 계산으로 대체).
+    """
+    path = metrics_path()
+    local_path = resolve_table_path(path)
+    if os.path.exists(local_path):
+        return local_path
+    if path in dataloader._remote_missing:
+        return None
+    try:
+        return fetch_table(path)
+    except Exception:
+        # 원격에 없음, 또는 오프라인/boto3·credentials 없음
+        dataloader._remote_missing.add(path)
+        return None
+
+
+@cached_artifact("metrics_table", lambda: [resolve_table_path(metrics_path())])
+def load_metrics_table():
+    """metrics.csv를 (battery_id, model_type, preprocessing) → 행 dict로 로드 (로컬에 없으면 S3에서 받아옴)"""
+    path = fetch_metrics_table()
+    if path is None:
+        raise FileNotFoundError(f"metrics 테이블을 찾을 수 없습니다: {metrics_path()}")
+    table = read_table(path)
+    return {
+        (row['battery_id'], row['model_type'], row['preprocessing']): row
+        for row in table.to_dict('records')
+    }
+
+
+def _format_p(p):
+    if p < 0.01:
+        return "< 0.01"
+    if p < 0.05:
+        return "< 0.05"
+    return "> 0.05"
+
+
+def _format_delta(model_type, delta):
+    if model_type == BASELINE_MODEL:
+        return "baseline"
+    if delta is None or pd.isna(delta):
+        return "No baseline"
+    return f"{delta:+.1f}% vs baseline"
+
+
+def format_metrics(row):
+    """metrics 행을 헤더 st.metric 표시 문자열로 변환"""
+    p = row['capacity_p']
+    if pd.isna(p):
+        confidence = 'No data'
+    elif p < 0.01:
+        confidence = 'High Confidence'
+    elif p < 0.05:
+        confidence = 'Medium Confidence'
+    else:
+        confidence = 'Low Confidence'
+    first_cycle = row['first_anomaly_cycle']
+    return {
+        'capacity_corr': f"{row['capacity_corr']:+.3f}" if not pd.isna(row['capacity_corr']) else "N/A",
+        'rohmic_corr': f"{row['rohmic_corr']:+.3f}" if not pd.isna(row['rohmic_corr']) else "N/A",
+        'anomaly_cycle': f"Cycle {int(first_cycle)}" if not pd.isna(first_cycle) else "None",
+        'capacity_delta': _format_delta(row['model_type'], row['capacity_delta_pct']),
+        'rohmic_delta': _format_delta(row['model_type'], row['rohmic_delta_pct']),
+        'p_value': _format_p(p) if not pd.isna(p) else "N/A",
+        'confidence': confidence
+    }
+
+
+@cached_artifact("battery_metrics", battery_metrics_paths)
+def compute_battery_metrics(battery_id, preprocessing):
+    """metrics.csv에 없는 배터리의 두 모델 메트릭 (baseline 계산을 위해 함께 계산, 입력 파일이 바뀔 때만 다시 계산)"""
+    return compute_metrics([(battery_id, m, preprocessing) for m in MODEL_TYPES.values()])
+
+
+def get_metrics(model_type, preprocessing, battery_id):
+    """모델/전처리/배터리에 따른 헤더 메트릭 (metrics.csv 조회, 없으면 해당 배터리만 계산)"""
+    key = (battery_id, model_type, preprocessing)
+    try:
+        row = load_metrics_table().get(key)
+    except FileNotFoundError:
+        row = None
+
+    if row is None:
+        table = compute_battery_metrics(battery_id, preprocessing)
+        matches = table[table['model_type'] == model_type].to_dict('records')
+        if not matches:
+            return dict(EMPTY_METRICS)
+        row = matches[0]
+
+    return format_metrics(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="헤더 메트릭 테이블 생성")
+    parser.add_argument('command', choices=['build'])
+    parser.parse_args()
+
+    table = build_metrics_table()
+    print(f"{len(table)}개 조합 계산 완료 → {metrics_path()}")
+    if not table.empty:
+        print(table.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""핫패스 계측 — 단계별 실행 시간, 읽은 bytes, 로드한 행 수
+
+    with span("render.overview"):            # 컨텍스트 매니저
+        ...
+    @timed("figure.build")                   # 데코레이터
+    def build(): ...
+
+기록은 프로세스 전역 통계(단계별 최근 PERF_SAMPLE_WINDOW개는 p50/p95 계산용, 횟수/시간/bytes/행 수는
+누적)와 현재 rerun 기록(스레드별 최근 PERF_RUN_MAX_ENTRIES개, 사이드바 Performance 패널용)에 함께 쌓인다.
+PERF_LOG_PATH 환경변수가 있으면 기록마다 JSON 한 줄을 추가하고,
+prometheus_text()는 Prometheus text 형식 요약을 반환한다.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+PERF_SAMPLE_WINDOW = 1000
+# rerun 기록 최대 항목 수 (live fragment처럼 begin_run 없이 반복 실행돼도 무한히 늘지 않도록)
+PERF_RUN_MAX_ENTRIES = 500
+PERF_LOG_ENV = "PERF_LOG_PATH"
+
+_samples = defaultdict(lambda: deque(maxlen=PERF_SAMPLE_WINDOW))
+_totals = defaultdict(lambda: {'total_count': 0, 'total_seconds': 0.0, 'bytes': 0, 'rows': 0})
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def count_rows(value):
+    """로더 반환값의 행 수 (DataFrame, (DataFrame, 메타데이터), 결과 dict)"""
+    if hasattr(value, 'shape') and len(getattr(value, 'shape', ())):
+        return int(value.shape[0])
+    if isinstance(value, tuple) and value:
+        return count_rows(value[0])
+    if hasattr(value, 'keys') and 'scores' in value:
+        return len(value['scores'])
+    return 0
+
+
+def record(stage, seconds, nbytes=0, rows=0, **labels):
+    """단계 하나의 측정값 기록"""
+    entry = {'stage': stage, 'seconds': seconds, 'bytes': int(nbytes), 'rows': int(rows), **labels}
+    with _lock:
+        _samples[stage].append(seconds)
+        _totals[stage]['total_count'] += 1
+        _totals[stage]['total_seconds'] += seconds
+        _totals[stage]['bytes'] += entry['bytes']
+        _totals[stage]['rows'] += entry['rows']
+    run = getattr(_local, 'run', None)
+    if run is not None:
+        run.append(entry)
+
+    log_path = os.environ.get(PERF_LOG_ENV)
+    if log_path:
+        line = json.dumps(dict(entry, ts=time.time())) + '\n'
+        with _lock, open(log_path, 'a') as f:
+            f.write(line)
+    return entry
+
+
+@contextmanager
+def span(stage, **labels):
+    """블록 실행 시간 기록 — yield된 dict에 bytes/rows/레이블을 채울 수 있음"""
+    info = dict(labels)
+    started = time.perf_counter()
+    try:
+        yield info
+    finally:
+        elapsed = time.perf_counter() - started
+        nbytes, rows = info.pop('bytes', 0), info.pop('rows', 0)
+        record(stage, elapsed, nbytes, rows, **info)
+
+
+def timed(stage):
+    """함수 실행 시간 기록 데코레이터 (반환값의 행 수 포함)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage) as info:
+                value = func(*args, **kwargs)
+                info['rows'] = count_rows(value)
+                return value
+        return wrapper
+    return decorator
+
+
+def begin_run():
+    """현재 스레드(세션 스크립트 실행 또는 fragment rerun)의 기록 시작"""
+    _local.run = deque(maxlen=PERF_RUN_MAX_ENTRIES)
+
+
+def end_run():
+    """현재 rerun 기록 반환 후 종료"""
+    run = getattr(_local, 'run', None) or []
+    _local.run = None
+    return list(run)
+
+
+def current_run():
+    return list(getattr(_local, 'run', None) or [])
+
+
+def stage_stats():
+    """단계별 통계 — count/p50/p95/mean(초)은 최근 PERF_SAMPLE_WINDOW개 기준,
+    total_count/total_seconds/bytes/rows는 프로세스 시작 이후 누적"""
+    with _lock:
+        snapshot = {stage: (np.array(samples), dict(_totals[stage])) for stage, samples in _samples.items()}
+    stats = {}
+    for stage, (samples, totals) in sorted(snapshot.items()):
+        if not len(samples):
+            continue
+        p50, p95 = np.percentile(samples, [50, 95])
+        stats[stage] = {
+            'count': len(samples),
+            'p50': float(p50),
+            'p95': float(p95),
+            'mean': float(samples.mean()),
+            **totals,
+        }
+    return stats
+
+
+def reset_stats():
+    with _lock:
+        _samples.clear()
+        _totals.clear()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def prometheus_text(prefix="dashboard_stage"):
+    """단계 통계를 Prometheus text exposition 형식으로"""
+    lines = [
+        f"# HELP {prefix}_seconds Wall time per dashboard stage (quantiles over the recent window).",
+        f"# TYPE {prefix}_seconds summary",
+    ]
+    stats = stage_stats()
+    for stage, s in stats.items():
+        label = f'stage="{_escape(stage)}"'
+        lines.append(f'{prefix}_seconds{{{label},quantile="0.5"}} {s["p50"]:.6f}')
+        lines.append(f'{prefix}_seconds{{{label},quantile="0.95"}} {s["p95"]:.6f}')
+        # _sum/_count는 Prometheus rate()가 쓰는 누적값이어야 함 (최근 구간 값은 줄어들 수 있음)
+        lines.append(f'{prefix}_seconds_sum{{{label}}} {s["total_seconds"]:.6f}')
+        lines.append(f'{prefix}_seconds_count{{{label}}} {s["total_count"]}')
+    lines += [f"# HELP {prefix}_bytes_total Bytes read per stage.", f"# TYPE {prefix}_bytes_total counter"]
+    lines += [f'{prefix}_bytes_total{{stage="{_escape(stage)}"}} {s["bytes"]}' for stage, s in stats.items()]
+    lines += [f"# HELP {prefix}_rows_total Rows loaded per stage.", f"# TYPE {prefix}_rows_total counter"]
+    lines += [f'{prefix}_rows_total{{stage="{_escape(stage)}"}} {s["rows"]}' for stage, s in stats.items()]
+    return '\n'.join(lines) + '\n'
+
+
+def jsonl_text(entries):
+    """기록 목록을 JSON lines 문자열로"""
+    return ''.join(json.dumps(e) + '\n' for e in entries)
+
+
+def plotly_chart(fig, **kwargs):
+    """st.plotly_chart + 직렬화/전송 시간 기록"""
+    import streamlit as st
+
+    with span("chart.plotly"):
+        return st.plotly_chart(fig, **kwargs)
@@ -0,0 +1,109 @@
+"""Anomaly Transformer 결과를 메모리 매핑 가능한 배열로 저장/로드
+
+pickle(`test_results_*.pkl`, {'cycle_scores': {cycle: score}, 'threshold': float})을
+아래 두 파일로 대체한다.
+    test_results_*.npy   cycle 오름차순 structured array (cycle int64, score float64)
+    test_results_*.json  {'threshold': float, 'n_cycles': int, 'version': 1}
+
+사용법 (dashboard/ 에서):
+    python -m utils.results_store migrate [dataset_dir]
+"""
+import argparse
+import glob
+import json
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+RESULTS_DTYPE = np.dtype([('cycle', '<i8'), ('score', '<f8')])
+FORMAT_VERSION = 1
+
+
+def store_paths(pkl_path):
+    """pickle 경로에 대응하는 (npy, json) 경로"""
+    base = Path(pkl_path).with_suffix('')
+    return str(base) + '.npy', str(base) + '.json'
+
+
+def to_arrays(cycle_scores):
+    """{cycle: score} dict를 cycle 오름차순 structured array로 변환"""
+    records = np.empty(len(cycle_scores), dtype=RESULTS_DTYPE)
+    records['cycle'] = np.fromiter(cycle_scores.keys(), dtype='<i8', count=len(cycle_scores))
+    records['score'] = np.fromiter(cycle_scores.values(), dtype='<f8', count=len(cycle_scores))
+    records.sort(order='cycle', kind='stable')
+    return records
+
+
+def save_results(npy_path, json_path, records, threshold):
+    """structured array와 threshold를 원자적으로 저장"""
+    for path, write in (
+        (npy_path, lambda f: np.save(f, records, allow_pickle=False)),
+        (json_path, lambda f: f.write(json.dumps({
+            'threshold': float(threshold),
+            'n_cycles': int(len(records)),
+            'version': FORMAT_VERSION,
+        }).encode())),
+    ):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+
+def as_results(records, threshold):
+    """로더 반환 형식 — cycles/scores는 records의 zero-copy view"""
+    return {
+        'cycles': records['cycle'],
+        'scores': records['score'],
+        'threshold': float(threshold),
+    }
+
+
+def load_results(npy_path, json_path):
+    """메모리 매핑으로 결과 로드 (pickle 사용 안 함)"""
+    records = np.load(npy_path, mmap_mode='r', allow_pickle=False)
+    if records.dtype != RESULTS_DTYPE:
+        raise ValueError(f"지원하지 않는 결과 형식입니다: {npy_path} ({records.dtype})")
+    with open(json_path) as f:
+        meta = json.load(f)
+    return as_results(records, meta['threshold'])
+
+
+def load_pickle_results(pkl_path):
+    """기존 pickle 결과를 같은 배열 형식으로 로드 (신뢰할 수 있는 파일만 사용)"""
+    with open(pkl_path, 'rb') as f:
+        raw = pickle.load(f)
+    return as_results(to_arrays(raw['cycle_scores']), raw['threshold'])
+
+
+def migrate_pickle(pkl_path, force=False):
+    """pickle 결과 하나를 npy/json으로 변환 (변환했으면 True)"""
+    npy_path, json_path = store_paths(pkl_path)
+    if not force and os.path.exists(npy_path) and os.path.exists(json_path) \
+            and os.path.getmtime(npy_path) >= os.path.getmtime(pkl_path):
+        return False
+    with open(pkl_path, 'rb') as f:
+        raw = pickle.load(f)
+    save_results(npy_path, json_path, to_arrays(raw['cycle_scores']), raw['threshold'])
+    return True
+
+
+def main():
+    default_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dataset')
+    parser = argparse.ArgumentParser(description="test_results_*.pkl → npy/json 변환")
+    parser.add_argument('command', choices=['migrate'])
+    parser.add_argument('dataset_dir', nargs='?', default=default_dir)
+    parser.add_argument('--force', action='store_true', help="이미 변환된 파일도 다시 변환")
+    args = parser.parse_args()
+
+    pkl_paths = sorted(glob.glob(os.path.join(args.dataset_dir, 'tab2', 'test_results_*.pkl')))
+    migrated = [p for p in pkl_paths if migrate_pickle(p, force=args.force)]
+    print(f"{len(migrated)}/{len(pkl_paths)}개 파일 변환 완료")
+    for path in migrated:
+        print(f"  {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,527 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+# 동기화 설정
+MANIFEST_NAME = ".manifest.json"
+# 마지막 전체 동기화 시각 (원격의 새/변경 객체를 다시 확인하는 주기 판단용)
+SYNC_STATE_NAME = ".sync_state.json"
+SYNC_MAX_AGE = 24 * 3600  # 초
+MAX_WORKERS = 8
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5  # 초, 재시도마다 2배
+# 이보다 큰 객체는 byte range로 나눠 병렬로 받고 .part 파일에서 이어받기
+MULTIPART_THRESHOLD = 64 * 1024 * 1024
+PART_SIZE = 16 * 1024 * 1024
+PART_WORKERS = 4
+READ_CHUNK = 1 << 20
+PART_SUFFIX = ".part"
+PROGRESS_SUFFIX = ".part.json"
+# ETag가 본문 MD5가 아닌 서버 측 암호화 방식 (SSE-C는 SSECustomerAlgorithm으로 확인)
+NON_MD5_SSE = ('aws:kms', 'aws:kms:dsse')
+
+# key별 single-flight 잠금 (동시 세션이 같은 객체를 두 번 받지 않도록)
+_key_locks = {}
+_key_locks_guard = threading.Lock()
+_manifest_lock = threading.Lock()
+
+
+def load_manifest(local_dir):
+    """로컬 manifest 로드 ({key: {'size', 'etag'[, 'incomplete']}})
+
+    다운로드에 실패한 key는 'incomplete': True로 남겨 다음 동기화에서 다시 받는다.
+    """
+    path = Path(local_dir) / MANIFEST_NAME
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(local_dir, manifest):
+    """manifest를 임시 파일에 쓴 뒤 원자적으로 교체"""
+    path = Path(local_dir) / MANIFEST_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    with os.fdopen(fd, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    _publish(tmp_path, path)
+
+
+def _publish(tmp_path, path):
+    """mkstemp(0600) 임시 파일을 일반 권한으로 바꾼 뒤 원자적으로 rename"""
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+
+def list_remote(client, bucket, prefix):
+    """페이지 단위로 S3 목록 조회 ({상대 key: {'key', 'size', 'etag'}})"""
+    remote = {}
+    paginator = client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            s3_key = obj['Key']
+            if s3_key.endswith('/'):  # 폴더는 스킵
+                continue
+            remote[s3_key[len(prefix):]] = {
+                'key': s3_key,
+                'size': obj['Size'],
+                'etag': obj.get('ETag', '').strip('"'),
+            }
+    return remote
+
+
+def plan_sync(remote, manifest, local_dir):
+    """다운로드가 필요한 (상대 key, 객체 정보) 목록 (manifest를 갱신할 수 있음)"""
+    todo = []
+    for rel_key, obj in remote.items():
+        local_path = Path(local_dir) / rel_key
+        entry = manifest.get(rel_key)
+        if entry is None and _matches_etag(local_path, obj):
+            # manifest 도입 이전에 받은 파일은 ETag가 같으면 그대로 사용
+            entry = manifest[rel_key] = {'size': obj['size'], 'etag': obj['etag']}
+        if (
+            entry is None
+            or entry.get('incomplete')
+            or entry.get('etag') != obj['etag']
+            or entry.get('size') != obj['size']
+            or not local_path.exists()
+            or local_path.stat().st_size != obj['size']
+        ):
+            todo.append((rel_key, obj))
+    return todo
+
+
+def is_not_found(error):
+    """botocore ClientError(404/NoSuchKey) 또는 FileNotFoundError 여부"""
+    if isinstance(error, FileNotFoundError):
+        return True
+    code = getattr(error, 'response', {}).get('Error', {}).get('Code')
+    return code in ('404', 'NoSuchKey', 'NotFound')
+
+
+def _md5_digests(path, part_size=None):
+    """파일 MD5 (part_size 지정 시 part_size 단위 조각별 MD5 목록)"""
+    digests, md5, filled = [], hashlib.md5(), 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK), b''):
+            while chunk:
+                take = len(chunk) if part_size is None else min(len(chunk), part_size - filled)
+                md5.update(chunk[:take])
+                chunk, filled = chunk[take:], filled + take
+                if part_size is not None and filled == part_size:
+                    digests.append(md5.digest())
+                    md5, filled = hashlib.md5(), 0
+    if part_size is None:
+        return md5.hexdigest()
+    if filled or not digests:
+        digests.append(md5.digest())
+    return digests
+
+
+def etag_matches(path, etag, size=None):
+    """로컬 파일이 S3 ETag와 일치하는지 (True/False, 검증할 수 없는 ETag이면 None)
+
+    단일 파트 ETag는 MD5, 멀티파트 ETag("md5-N")는 파트 MD5들의 MD5이다.
+    멀티파트는 업로드 파트 크기를 알 수 없으므로 흔한 크기(8 MiB 배수) 후보로 확인하고,
+    맞는 후보가 없으면 파트 크기를 모르는 것일 수 있으므로 불일치가 아닌 None을 반환한다.
+    """
+    if not etag:
+        return None
+    if '-' not in etag:
+        return _md5_digests(path) == etag
+    _, _, count = etag.rpartition('-')
+    if not count.isdigit() or int(count) < 1:
+        return None
+    size = os.path.getsize(path) if size is None else size
+    mib = 1024 * 1024
+    # 파트 수가 N이 되는 8 MiB 배수 후보 + 1 MiB 단위로 올림한 균등 분할 크기
+    candidates = {-(-size // int(count) // mib) * mib}
+    candidates |= {step * 8 * mib for step in range(1, 65)}
+    candidates = sorted(c for c in candidates if c > 0 and -(-size // c) == int(count))
+    for part_size in candidates:
+        combined = hashlib.md5(b''.join(_md5_digests(path, part_size))).hexdigest()
+        if f"{combined}-{count}" == etag:
+            return True
+    return None
+
+
+def verifiable_etag(head):
+    """head_object 응답의 ETag 중 MD5 검증에 쓸 수 있는 값 (SSE-KMS / SSE-C 객체는 None)"""
+    if head.get('ServerSideEncryption') in NON_MD5_SSE or head.get('SSECustomerAlgorithm'):
+        return None
+    return head.get('ETag', '').strip('"') or None
+
+
+def _matches_etag(local_path, obj):
+    """로컬 파일의 MD5가 (단일 파트) ETag와 같은지 확인"""
+    if '-' in obj['etag'] or not local_path.exists() or local_path.stat().st_size != obj['size']:
+        return False
+    return etag_matches(local_path, obj['etag']) is True
+
+
+def _verify(path, s3_key, size, etag):
+    """크기와 ETag 확인 (불일치 시 IOError)"""
+    actual = os.path.getsize(path)
+    if size is not None and actual != size:
+        raise IOError(f"크기 불일치: {s3_key} ({actual} != {size} bytes)")
+    if etag_matches(path, etag, actual) is False:
+        raise IOError(f"체크섬 불일치: {s3_key} (ETag {etag})")
+    return actual
+
+
+def _load_progress(progress_path, size, etag, part_size):
+    """이어받기 진행 상태 (완료된 파트 번호 집합) — 객체나 파트 크기가 바뀌었으면 빈 집합"""
+    try:
+        with open(progress_path) as f:
+            progress = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return set()
+    if (progress.get('size'), progress.get('etag'), progress.get('part_size')) != (size, etag, part_size):
+        return set()
+    return set(progress.get('done', []))
+
+
+def _save_progress(progress_path, size, etag, part_size, done):
+    fd, tmp_path = tempfile.mkstemp(dir=progress_path.parent, prefix=f".{progress_path.name}.", suffix=".tmp")
+    with os.fdopen(fd, 'w') as f:
+        json.dump({'size': size, 'etag': etag, 'part_size': part_size, 'done': sorted(done)}, f)
+    os.replace(tmp_path, progress_path)
+
+
+def _download_range(client, bucket, s3_key, part_path, start, end, retries):
+    """[start, end] byte range를 .part 파일의 같은 위치에 기록 (실패 시 이 범위만 재시도)"""
+    for attempt in range(retries + 1):
+        try:
+            body = client.get_object(Bucket=bucket, Key=s3_key, Range=f"bytes={start}-{end}")['Body']
+            offset = start
+            with open(part_path, 'r+b') as f:
+                f.seek(start)
+                for chunk in iter(lambda: body.read(READ_CHUNK), b''):
+                    f.write(chunk)
+                    offset += len(chunk)
+            if offset != end + 1:
+                raise IOError(f"range 응답 길이 불일치: {s3_key} bytes={start}-{end} ({offset - start} bytes)")
+            return end + 1 - start
+        except Exception as e:
+            if is_not_found(e) or attempt == retries:
+                raise
+            time.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+
+def download_ranged(client, bucket, s3_key, local_path, size, etag=None, part_size=PART_SIZE,
+                    max_workers=PART_WORKERS, retries=MAX_RETRIES):
+    """큰 객체를 byte range 병렬 다운로드 → 검증 → 원자적 rename
+
+    {파일}.part에 받고, 완료된 파트 번호를 {파일}.part.json에 기록한다. 중단된 뒤 다시 호출하면
+    남은 파트만 받는다. 크기/ETag 검증에 실패하면 .part를 지우고 IOError를 발생시킨다.
+    """
+    local_path = Path(local_path)
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = local_path.with_name(local_path.name + PART_SUFFIX)
+    progress_path = local_path.with_name(local_path.name + PROGRESS_SUFFIX)
+
+    done = _load_progress(progress_path, size, etag, part_size)
+    if not done or not part_path.exists() or part_path.stat().st_size != size:
+        done = set()
+        with open(part_path, 'wb') as f:
+            f.truncate(size)
+        _save_progress(progress_path, size, etag, part_size, done)
+
+    ranges = {i: (start, min(start + part_size, size) - 1) for i, start in enumerate(range(0, size, part_size))}
+    todo = [i for i in ranges if i not in done]
+    progress_lock = threading.Lock()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo) or 1))) as pool:
+        futures = {pool.submit(_download_range, client, bucket, s3_key, part_path, *ranges[i], retries): i
+                   for i in todo}
+        for future in as_completed(futures):
+            future.result()  # 실패한 파트가 있으면 진행 상태를 남긴 채 예외 전달
+            with progress_lock:
+                done.add(futures[future])
+                _save_progress(progress_path, size, etag, part_size, done)
+
+    try:
+        actual = _verify(part_path, s3_key, size, etag)
+    except IOError:
+        part_path.unlink(missing_ok=True)
+        progress_path.unlink(missing_ok=True)
+        raise
+    _publish(part_path, local_path)
+    progress_path.unlink(missing_ok=True)
+    return actual
+
+
+def download_object(client, bucket, s3_key, local_path, size=None, etag=None, retries=MAX_RETRIES):
+    """임시 파일로 받은 뒤 크기/ETag 확인 후 rename (실패 시 재시도)
+
+    MULTIPART_THRESHOLD보다 큰 객체는 download_ranged로 나눠 받고 중단된 지점부터 이어받는다.
+    """
+    local_path = Path(local_path)
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+
+    for attempt in range(retries + 1):
+        if size is not None and size > MULTIPART_THRESHOLD and hasattr(client, 'get_object'):
+            try:
+                return download_ranged(client, bucket, s3_key, local_path, size, etag, retries=retries)
+            except Exception as e:
+                if is_not_found(e):
+                    raise FileNotFoundError(f"S3 객체를 찾을 수 없습니다: {bucket}/{s3_key}") from e
+                if attempt == retries:
+                    raise
+                time.sleep(RETRY_BACKOFF * (2 ** attempt))
+            continue
+
+        fd, tmp_path = tempfile.mkstemp(dir=local_path.parent, prefix=f".{local_path.name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            client.download_file(bucket, s3_key, tmp_path)
+            actual = _verify(tmp_path, s3_key, size, etag)
+            _publish(tmp_path, local_path)
+            return actual
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if is_not_found(e):
+                raise FileNotFoundError(f"S3 객체를 찾을 수 없습니다: {bucket}/{s3_key}") from e
+            if attempt == retries:
+                raise
+            time.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+
+def _download_listed(client, bucket, obj, local_path):
+    """목록의 객체 하나 다운로드 — 암호화 방식은 목록에 없으므로 head로 확인해 ETag 검증 여부 결정"""
+    etag = obj['etag']
+    if etag and hasattr(client, 'head_object') and verifiable_etag(
+            client.head_object(Bucket=bucket, Key=obj['key'])) is None:
+        etag = None
+    return download_object(client, bucket, obj['key'], local_path, obj['size'], etag)
+
+
+def sync_prefix(client, bucket, prefix, local_dir, max_workers=MAX_WORKERS):
+    """manifest와 S3 목록을 비교해 변경/누락된 객체만 병렬 다운로드
+
+    결과 통계 dict를 반환한다 (throughput은 MB/s).
+    """
+    started = time.perf_counter()
+    local_dir = Path(local_dir)
+    local_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = load_manifest(local_dir)
+    remote = list_remote(client, bucket, prefix)
+    todo = plan_sync(remote, manifest, local_dir)
+
+    downloaded, failed, total_bytes = 0, [], 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_download_listed, client, bucket, obj, local_dir / rel_key): (rel_key, obj)
+            for rel_key, obj in todo
+        }
+        for future in as_completed(futures):
+            rel_key, obj = futures[future]
+            try:
+                nbytes = future.result()
+            except Exception as e:
+                failed.append((rel_key, str(e)))
+                manifest[rel_key] = {'size': obj['size'], 'etag': obj['etag'], 'incomplete': True}
+                continue
+            manifest[rel_key] = {'size': obj['size'], 'etag': obj['etag']}
+            downloaded += 1
+            total_bytes += nbytes
+
+    # 원격에서 삭제된 key는 manifest에서 제거
+    manifest = {k: v for k, v in manifest.items() if k in remote}
+    with _manifest_lock:
+        save_manifest(local_dir, manifest)
+    _save_sync_state(local_dir)
+
+    elapsed = time.perf_counter() - started
+    return {
+        'listed': len(remote),
+        'downloaded': downloaded,
+        'skipped': len(remote) - len(todo),
+        'failed': failed,
+        'bytes': total_bytes,
+        'seconds': elapsed,
+        'throughput_mbps': total_bytes / 1e6 / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def fetch_object(client, bucket, prefix, local_dir, rel_key):
+    """객체 하나를 필요할 때만 받아오기 (이미 있으면 네트워크 없이 반환)"""
+    local_path = Path(local_dir) / rel_key
+    if local_path.exists():
+        return local_path
+
+    with _key_locks_guard:
+        lock = _key_locks.setdefault(rel_key, threading.Lock())
+
+    with lock:
+        # 잠금을 기다리는 동안 다른 세션이 이미 받았을 수 있음
+        if local_path.exists():
+            return local_path
+
+        s3_key = prefix + rel_key
+        try:
+            head = client.head_object(Bucket=bucket, Key=s3_key)
+        except Exception as e:
+            if is_not_found(e):
+                raise FileNotFoundError(f"파일을 찾을 수 없습니다: {local_path}") from e
+            raise
+        size = head['ContentLength']
+        etag = head.get('ETag', '').strip('"')
+        download_object(client, bucket, s3_key, local_path, size, verifiable_etag(head))
+
+        with _manifest_lock:
+            manifest = load_manifest(local_dir)
+            manifest[rel_key] = {'size': size, 'etag': etag}
+            save_manifest(local_dir, manifest)
+    return local_path
+
+
+def _save_sync_state(local_dir):
+    path = Path(local_dir) / SYNC_STATE_NAME
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    with os.fdopen(fd, 'w') as f:
+        json.dump({'synced_at': time.time()}, f)
+    _publish(tmp_path, path)
+
+
+def last_synced(local_dir):
+    """마지막 전체 동기화 시각 (epoch 초, 기록이 없으면 None)"""
+    try:
+        with open(Path(local_dir) / SYNC_STATE_NAME) as f:
+            return float(json.load(f)['synced_at'])
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def is_synced(local_dir, max_age=SYNC_MAX_AGE):
+    """manifest의 파일이 모두 완전히 받아져 있고 전체 동기화가 max_age초 이내인지 확인 (네트워크 없이)
+
+    다운로드에 실패한 key(incomplete)가 남아 있거나 동기화가 오래되면 False를 반환해
+    다음 시작 시 sync_prefix가 실패한 파일과 원격의 새/변경 객체를 다시 확인하게 한다.
+    """
+    manifest = load_manifest(local_dir)
+    if not manifest:
+        return False
+    synced_at = last_synced(local_dir)
+    if max_age is not None and (synced_at is None or time.time() - synced_at > max_age):
+        return False
+    for rel_key, entry in manifest.items():
+        if entry.get('incomplete'):
+            return False
+        path = Path(local_dir) / rel_key
+        if not path.exists() or path.stat().st_size != entry['size']:
+            return False
+    return True
+
+
+class _LocalBody:
+    """get_object 응답 Body (fail_at bytes를 읽은 뒤 연결 끊김을 흉내냄)"""
+
+    def __init__(self, data, fail_at=None):
+        self._data = data
+        self._pos = 0
+        self._fail_at = fail_at
+
+    def read(self, amt=None):
+        end = len(self._data) if amt is None else min(len(self._data), self._pos + amt)
+        if self._fail_at is not None and end > self._fail_at:
+            if self._pos >= self._fail_at:
+                raise ConnectionError("injected failure: connection reset")
+            end = self._fail_at
+        chunk = self._data[self._pos:end]
+        self._pos = end
+        return chunk
+
+
+class LocalDirClient:
+    """로컬 디렉토리를 S3처럼 다루는 최소 클라이언트 (오프라인 개발/테스트용)
+
+    root/<bucket>/<key> 구조를 사용한다.
+    장애 주입: fail_every=N이면 N번째 get_object마다 응답 중간에 연결이 끊기고,
+    corrupt_keys에 있는 key는 내용의 첫 byte를 바꿔 반환한다 (체크섬 검증 확인용).
+    kms_keys에 있는 key는 SSE-KMS 객체처럼 MD5가 아닌 ETag를 반환한다.
+    """
+
+    def __init__(self, root, page_size=1000, fail_every=0, corrupt_keys=(), kms_keys=()):
+        self.root = Path(root)
+        self.page_size = page_size
+        self.fail_every = fail_every
+        self.corrupt_keys = set(corrupt_keys)
+        self.kms_keys = set(kms_keys)
+        self.get_calls = 0
+        self._calls_lock = threading.Lock()
+
+    def _path(self, bucket, key):
+        return self.root / bucket / key
+
+    def _etag(self, bucket, key):
+        with open(self._path(bucket, key), 'rb') as f:
+            digest = hashlib.md5(f.read())
+        if key in self.kms_keys:
+            digest = hashlib.md5(digest.digest() + b'kms')
+        return f'"{digest.hexdigest()}"'
+
+    def get_paginator(self, operation):
+        if operation != 'list_objects_v2':
+            raise ValueError(f"지원하지 않는 operation: {operation}")
+        return self
+
+    def paginate(self, Bucket, Prefix=''):
+        bucket_dir = self.root / Bucket
+        keys = sorted(
+            p.relative_to(bucket_dir).as_posix()
+            for p in bucket_dir.rglob('*') if p.is_file()
+        )
+        keys = [k for k in keys if k.startswith(Prefix)]
+        for i in range(0, max(len(keys), 1), self.page_size):
+            contents = []
+            for key in keys[i:i + self.page_size]:
+                path = self._path(Bucket, key)
+                contents.append({'Key': key, 'Size': path.stat().st_size, 'ETag': self._etag(Bucket, key)})
+            yield {'Contents': contents}
+
+    def head_object(self, Bucket, Key):
+        path = self._path(Bucket, Key)
+        if not path.is_file():
+            raise FileNotFoundError(f"{Bucket}/{Key}")
+        head = {'ContentLength': path.stat().st_size, 'ETag': self._etag(Bucket, Key)}
+        if Key in self.kms_keys:
+            head['ServerSideEncryption'] = 'aws:kms'
+        return head
+
+    def _read(self, Bucket, Key, start=0, end=None):
+        path = self._path(Bucket, Key)
+        if not path.is_file():
+            raise FileNotFoundError(f"{Bucket}/{Key}")
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = f.read() if end is None else f.read(end + 1 - start)
+        if Key in self.corrupt_keys and start == 0 and data:
+            data = bytes([data[0] ^ 0xFF]) + data[1:]
+        return data
+
+    def get_object(self, Bucket, Key, Range=None):
+        """Range="bytes=start-end" 지원 (끝 포함)"""
+        start, end = 0, None
+        if Range:
+            first, _, last = Range.removeprefix('bytes=').partition('-')
+            start, end = int(first), int(last) if last else None
+        data = self._read(Bucket, Key, start, end)
+
+        with self._calls_lock:
+            self.get_calls += 1
+            fail = self.fail_every and self.get_calls % self.fail_every == 0
+        return {'Body': _LocalBody(data, len(data) // 2 if fail else None), 'ContentLength': len(data)}
+
+    def download_file(self, Bucket, Key, Filename):
+        with open(Filename, 'wb') as f:
+            f.write(self._read(Bucket, Key))
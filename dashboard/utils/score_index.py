@@ -0,0 +1,100 @@
+"""사이클 점수 정렬 인덱스 — threshold what-if 질의용
+
+(배터리, 모델, 전처리)마다 점수를 한 번 정렬해 캐시해 두고, threshold를 바꿀 때는
+이진 탐색(searchsorted)만으로 "t, 1.5t를 넘는 사이클 수/목록"을 답한다.
+"""
+import numpy as np
+
+from utils.cache import cached_artifact
+from utils.dataloader import (
+    anomaly_results_paths,
+    load_anomaly_results,
+    load_lof_cycle_summary,
+    lof_cycle_summary_paths,
+)
+from utils.decimate import decimate
+
+# 위험도 코드 (get_risk_level과 같은 경계: > 1.5t Critical, > t Warning)
+NORMAL, WARNING, CRITICAL = 0, 1, 2
+CRITICAL_FACTOR = 1.5
+
+
+def build_score_index(cycles, scores, threshold):
+    """cycle 오름차순 배열 + 점수 오름차순 정렬 순서"""
+    cycles = np.asarray(cycles)
+    scores = np.asarray(scores, dtype=float)
+    by_cycle = np.argsort(cycles, kind='stable')
+    cycles, scores = cycles[by_cycle], scores[by_cycle]
+    # 점수 오름차순, 동점은 뒤 cycle 먼저 → 뒤집으면 점수 내림차순 + 동점은 앞선 cycle 우선
+    order = np.lexsort((-np.arange(len(scores)), scores))
+    return {
+        'cycles': cycles,
+        'scores': scores,
+        'order': order,
+        'sorted_scores': scores[order],
+        'threshold': float(threshold),
+    }
+
+
+def score_index_paths(battery_id, model_type, preprocessing):
+    if model_type == "Anomaly Transformer":
+        return anomaly_results_paths(battery_id, model_type, preprocessing)
+    return lof_cycle_summary_paths(battery_id, preprocessing)
+
+
+@cached_artifact("score_index", score_index_paths)
+def load_score_index(battery_id, model_type, preprocessing):
+    """모델 결과로 점수 인덱스 생성 (파일이 바뀔 때만 다시 정렬)"""
+    if model_type == "Anomaly Transformer":
+        results = load_anomaly_results(battery_id, model_type, preprocessing)
+        return build_score_index(results['cycles'], results['scores'], results['threshold'])
+    cycle_summary, threshold = load_lof_cycle_summary(battery_id, preprocessing, columns=('cycle_idx', 'mean_score'))
+    return build_score_index(cycle_summary['cycle_idx'], cycle_summary['mean_score'], threshold)
+
+
+def count_above(index, t):
+    """점수가 t를 넘는 사이클 수 (O(log n))"""
+    sorted_scores = index['sorted_scores']
+    return len(sorted_scores) - int(np.searchsorted(sorted_scores, t, side='right'))
+
+
+def cycles_above(index, t, limit=None):
+    """점수가 t를 넘는 (cycle 배열, 점수 배열) — 점수 내림차순, limit개까지"""
+    start = int(np.searchsorted(index['sorted_scores'], t, side='right'))
+    positions = index['order'][start:][::-1]
+    if limit is not None:
+        positions = positions[:limit]
+    return index['cycles'][positions], index['scores'][positions]
+
+
+def top_k(index, k=5):
+    """점수 상위 k개 위치 (partition, 동점은 앞선 cycle 우선)"""
+    scores = index['scores']
+    k = min(k, len(scores))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    # k번째 점수와 같은 동점을 모두 후보로 둬야 앞선 cycle을 고를 수 있음 (argpartition은 동점 중 임의로 고름)
+    kth = -np.partition(-scores, k - 1)[k - 1]
+    candidates = np.flatnonzero(scores >= kth)
+    return candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+
+
+def risk_levels(scores, t):
+    """점수 배열의 위험도 코드 (벡터화)"""
+    scores = np.asarray(scores, dtype=float)
+    return (scores > t).astype(np.int8) + (scores > t * CRITICAL_FACTOR)
+
+
+def threshold_summary(index, t):
+    """what-if threshold t에 대한 Warning 이상/Critical 사이클 수"""
+    return {
+        'threshold': float(t),
+        'above': count_above(index, t),
+        'critical': count_above(index, t * CRITICAL_FACTOR),
+        'total': len(index['scores']),
+    }
+
+
+def plot_positions(index, point_budget):
+    """그래프에 표시할 위치 (point budget 초과 시 Top 5는 남기고 줄임)"""
+    return decimate(index['cycles'], index['scores'], point_budget, keep=top_k(index, 5))
@@ -0,0 +1,194 @@
+"""계속 행이 추가되는 CSV 아티팩트를 byte offset 기준으로 읽는 tail 리더
+
+처음에는 파일 전체를 읽고, 이후 poll()은 마지막으로 읽은 위치 뒤에 추가된
+완전한 줄만 파싱한다. 파일이 교체/절단되면 전체를 다시 읽는다.
+누적 행은 컬럼별로 미리 잡아 둔(2배씩 늘어나는) numpy 버퍼에 쌓고, 그래프용 축소
+인덱스와 상위 점수 행도 새 행만 보고 갱신하므로 poll 비용이 전체 행 수에 비례하지 않는다.
+"""
+import io
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.columnar import COLUMNAR_SUFFIX, read_table
+from utils.dataloader import discharge_summary_paths, ensure_local, fetch_table, lof_cycle_summary_paths
+from utils.decimate import DEFAULT_POINT_BUDGET, StreamingLTTB
+
+# live 모드 갱신 주기 (초)
+LIVE_REFRESH_SECONDS = 5
+# 컬럼 버퍼 초기 크기 (행)
+INITIAL_CAPACITY = 1024
+
+
+class TableTail:
+    """추가된 행만 읽어 컬럼별 버퍼에 누적하는 tail 리더"""
+
+    def __init__(self, path, columns=None):
+        self.path = str(path)
+        self.columns = list(columns) if columns is not None else None
+        self._file_id = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._header = None
+        self._offset = 0
+        self._buffers = {}
+        self._n = 0
+        # (x, y, point budget) → StreamingLTTB, (컬럼, k) → 상위 k행 위치
+        self._decimators = {}
+        self._top = {}
+
+    def __len__(self):
+        return self._n
+
+    def _append(self, new_rows):
+        """새 행을 컬럼 버퍼 끝에 복사 (용량이 모자라거나 dtype이 넓어질 때만 재할당)"""
+        needed = self._n + len(new_rows)
+        for name in new_rows.columns:
+            values = new_rows[name].to_numpy()
+            buffer = self._buffers.get(name)
+            if buffer is None:
+                buffer = np.empty(max(needed, INITIAL_CAPACITY), dtype=values.dtype)
+            dtype = np.result_type(buffer.dtype, values.dtype)
+            if needed > len(buffer) or dtype != buffer.dtype:
+                grown = np.empty(max(needed, 2 * len(buffer)), dtype=dtype)
+                grown[:self._n] = buffer[:self._n]
+                buffer = grown
+            buffer[self._n:needed] = values
+            self._buffers[name] = buffer
+        self._n = needed
+
+    def column(self, name):
+        """누적 컬럼 배열 (복사 없는 view)"""
+        return self._buffers[name][:self._n]
+
+    def take(self, positions):
+        """지정한 위치의 행만 담은 DataFrame"""
+        if not self._buffers:
+            return pd.DataFrame(columns=self.columns or self._header or [])
+        return pd.DataFrame({name: buffer[positions] for name, buffer in self._buffers.items()},
+                            columns=list(self._buffers))
+
+    def _reload_columnar(self, stat):
+        """Parquet은 append가 불가능하므로 변경 시 전체 다시 읽기"""
+        file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if file_id == self._file_id:
+            return self.take(slice(0, 0))
+        old_len = self._n
+        frame = read_table(self.path, self.columns)
+        self._reset()
+        self._append(frame)
+        self._file_id = file_id
+        return frame.iloc[old_len:]
+
+    def poll(self):
+        """새로 추가된 행 DataFrame 반환 (누적 결과는 column() / take() / sample())"""
+        with self._lock:
+            stat = os.stat(self.path)
+            if self.path.endswith(COLUMNAR_SUFFIX):
+                return self._reload_columnar(stat)
+
+            # 파일 교체(inode 변경) 또는 절단 → 처음부터 다시
+            if self._file_id != stat.st_ino or stat.st_size < self._offset:
+                self._reset()
+                self._file_id = stat.st_ino
+
+            if stat.st_size == self._offset:
+                return self.take(slice(0, 0))
+
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                chunk = f.read(stat.st_size - self._offset)
+
+            # 쓰는 중인 마지막 줄은 다음 poll에서 읽음
+            end = chunk.rfind(b'\n') + 1
+            data = chunk[:end]
+
+            if self._header is None:
+                # 헤더 줄이 아직 다 쓰이지 않았으면 다음 poll까지 대기
+                if end == 0:
+                    return self.take(slice(0, 0))
+                header_end = data.find(b'\n') + 1
+                self._header = pd.read_csv(io.BytesIO(data[:header_end]), nrows=0).columns.tolist()
+                data = data[header_end:]
+            self._offset += end
+
+            usecols = None
+            if self.columns is not None:
+                usecols = [c for c in self._header if c in self.columns]
+            if data.strip():
+                new_rows = pd.read_csv(io.BytesIO(data), header=None, names=self._header, usecols=usecols)
+            else:
+                new_rows = pd.DataFrame(columns=usecols or self._header)
+            if len(new_rows):
+                self._append(new_rows)
+            return new_rows
+
+    def sample(self, x, ys, point_budget=DEFAULT_POINT_BUDGET, top=None, k=5):
+        """그래프용 행만 담은 DataFrame
+
+        y 컬럼마다 누적 버퍼에 LTTB를 적용해 고른 위치의 합집합 (+ top 컬럼 값 상위 k행).
+        새 행이 있을 때만 메모리 버퍼를 한 번 훑고, figure에는 point budget 안의 행만 담는다.
+        """
+        with self._lock:
+            if not self._n:
+                return self.take(slice(0, 0))
+            xs = self.column(x)
+            keep = [self._decimator(x, y, point_budget).update(xs, self.column(y)) for y in ys]
+            if top is not None:
+                keep.append(self._update_top(top, k))
+            return self.take(np.unique(np.concatenate(keep)))
+
+    def _decimator(self, x, y, point_budget):
+        key = (x, y, point_budget)
+        if key not in self._decimators:
+            self._decimators[key] = StreamingLTTB(point_budget)
+        return self._decimators[key]
+
+    def _update_top(self, name, k):
+        """이전 상위 k행 + 새 행 중 상위 k행 위치 (동점은 앞선 행 우선, 전체 stable 정렬과 같은 결과)"""
+        prev, seen = self._top.get((name, k), (np.empty(0, dtype=np.int64), 0))
+        candidates = np.concatenate([prev, np.arange(seen, self._n, dtype=np.int64)])
+        values = self.column(name)[candidates].astype(float)
+        top_pos = np.sort(candidates[np.argsort(-values, kind='stable')[:k]])
+        self._top[(name, k)] = (top_pos, self._n)
+        return top_pos
+
+
+# 프로세스 전역 tail (같은 파일을 보는 세션들이 공유)
+_tails = {}
+_tails_lock = threading.Lock()
+
+
+def get_tail(path, columns=None):
+    """(경로, 컬럼)별 공유 TableTail"""
+    key = (str(path), tuple(columns) if columns is not None else None)
+    with _tails_lock:
+        tail = _tails.get(key)
+        if tail is None:
+            tail = _tails[key] = TableTail(path, columns)
+        return tail
+
+
+def tail_discharge_summary(battery_id, columns=None):
+    """방전 요약의 (TableTail, 이번에 추가된 행)"""
+    tail = get_tail(fetch_table(discharge_summary_paths(battery_id)[0]), columns)
+    new_rows = tail.poll()
+    return tail, new_rows
+
+
+def tail_lof_cycle_summary(battery_id, preprocessing, columns=None):
+    """LOF 사이클 요약의 (TableTail, 이번에 추가된 행, threshold)"""
+    summary_path, metadata_path = lof_cycle_summary_paths(battery_id, preprocessing)
+    ensure_local(metadata_path)
+    tail = get_tail(fetch_table(summary_path), columns)
+    new_rows = tail.poll()
+
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+
+    return tail, new_rows, metadata['threshold']
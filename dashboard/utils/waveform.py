@@ -0,0 +1,198 @@
+"""사이클별 원시 방전 파형 저장소 (메모리 매핑)
+
+배터리마다 dataset/waveform/ 아래 세 파일:
+    {battery}_waveform.npy        (전체 샘플 수, 채널 수) float32 — 모든 방전 사이클을 이어 붙인 배열
+    {battery}_waveform_index.npy  cycle 오름차순 structured array (cycle, start, length)
+    {battery}_waveform.json       {'channels': [...], 'n_cycles': int, 'version': 2}
+사이클 하나를 읽을 때는 인덱스에서 (start, length)를 찾아 memmap의 해당 구간만 복사하므로
+배터리 전체 원시 이력을 메모리에 올리지 않는다.
+
+cycle 번호는 점수 아티팩트, 방전 요약(mat_extract)과 같은 .mat 'cycle' 목록 위치(0부터)다.
+(version 1 저장소는 1부터 시작하는 방전 순번이라 번호가 맞지 않으므로 다시 생성해야 한다)
+
+사용법 (dashboard/ 에서):
+    python -m utils.waveform build RAW_DIR [--out DATASET_DIR] [--workers 4]
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.cache import cached_artifact
+from utils.dataloader import ensure_local, get_dataset_dir
+from utils.perf import span
+
+CHANNELS = ('time', 'voltage', 'current', 'temperature')
+# .mat 방전 데이터 필드 → 채널
+MAT_FIELDS = {
+    'time': 'Time',
+    'voltage': 'Voltage_measured',
+    'current': 'Current_measured',
+    'temperature': 'Temperature_measured',
+}
+INDEX_DTYPE = np.dtype([('cycle', '<i8'), ('start', '<i8'), ('length', '<i8')])
+SAMPLE_DTYPE = np.float32
+FORMAT_VERSION = 2
+WAVEFORM_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def waveform_paths(battery_id, dataset_dir=None):
+    """(샘플 npy, 인덱스 npy, 메타 json) 경로"""
+    base = os.path.join(dataset_dir or get_dataset_dir(), 'waveform', f'{battery_id}_waveform')
+    return [base + '.npy', base + '_index.npy', base + '.json']
+
+
+# 원격에도 없는 것으로 확인된 배터리 (매 rerun마다 S3에 묻지 않도록)
+_missing_stores = set()
+
+
+def has_waveforms(battery_id):
+    """파형 저장소 사용 가능 여부 (로컬에 없으면 ensure_local로 받아옴)"""
+    if battery_id in _missing_stores:
+        return False
+    samples_path, index_path, meta_path = waveform_paths(battery_id)
+    try:
+        # 메타는 마지막에 쓰이므로 먼저 확인해 완성된 저장소만 받아옴
+        ensure_local(meta_path)
+        ensure_local(samples_path, index_path)
+    except Exception:
+        # 원격에도 없거나 S3를 쓸 수 없음 (오프라인/boto3·credentials 없음) — 드릴다운만 숨김
+        _missing_stores.add(battery_id)
+        return False
+    return all(os.path.exists(path) for path in (samples_path, index_path, meta_path))
+
+
+def _save(path, write):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def write_store(battery_id, cycles, waveforms, dataset_dir=None):
+    """사이클별 (샘플 수, 채널 수) 배열 목록을 연속 배열 + 오프셋 인덱스로 원자적 저장"""
+    samples_path, index_path, meta_path = waveform_paths(battery_id, dataset_dir)
+    os.makedirs(os.path.dirname(samples_path), exist_ok=True)
+
+    lengths = np.array([len(w) for w in waveforms], dtype=np.int64)
+    index = np.empty(len(waveforms), dtype=INDEX_DTYPE)
+    index['cycle'] = np.asarray(cycles, dtype=np.int64)
+    index['start'] = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(lengths) else []
+    index['length'] = lengths
+    index.sort(order='cycle', kind='stable')
+
+    samples = (np.concatenate(waveforms).astype(SAMPLE_DTYPE, copy=False) if waveforms
+               else np.empty((0, len(CHANNELS)), dtype=SAMPLE_DTYPE))
+    # 샘플/인덱스를 먼저 쓰고 메타를 마지막에 써서 완성된 저장소만 has_waveforms()에 잡힘
+    _save(samples_path, lambda f: np.save(f, samples, allow_pickle=False))
+    _save(index_path, lambda f: np.save(f, index, allow_pickle=False))
+    _save(meta_path, lambda f: f.write(json.dumps({
+        'channels': list(CHANNELS),
+        'n_cycles': int(len(index)),
+        'version': FORMAT_VERSION,
+    }).encode()))
+    return len(index), int(lengths.sum())
+
+
+def discharge_waveforms(cycles):
+    """.mat 사이클 목록에서 (원시 cycle 인덱스 배열, 사이클별 (샘플 수, 채널 수) 배열 목록)"""
+    from utils.mat_extract import discharge_cycles
+
+    cycle_idx, discharges = discharge_cycles(cycles)
+    waveforms = [
+        np.column_stack([np.atleast_1d(np.asarray(d[MAT_FIELDS[ch]], dtype=float)) for ch in CHANNELS])
+        for d in discharges
+    ]
+    return cycle_idx, waveforms
+
+
+def build_battery(mat_path, dataset_dir):
+    """.mat 하나의 방전 파형 저장소 생성, (battery_id, 사이클 수, 샘플 수) 반환"""
+    from utils.mat_extract import load_cycles
+
+    battery_id = os.path.splitext(os.path.basename(mat_path))[0]
+    cycles, waveforms = discharge_waveforms(load_cycles(mat_path))
+    return (battery_id, *write_store(battery_id, cycles, waveforms, dataset_dir))
+
+
+def build_all(raw_dir, dataset_dir=None, max_workers=WAVEFORM_MAX_WORKERS):
+    """raw_dir의 모든 .mat을 배터리별 프로세스로 병렬 변환"""
+    dataset_dir = str(dataset_dir or get_dataset_dir())
+    mat_paths = sorted(glob.glob(os.path.join(raw_dir, '*.mat')))
+    if not mat_paths:
+        return []
+    workers = max(1, min(max_workers, len(mat_paths)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(build_battery, mat_paths, [dataset_dir] * len(mat_paths)))
+
+
+@cached_artifact("waveform_store", waveform_paths)
+def load_waveform_store(battery_id):
+    """{'index', 'samples' (memmap), 'channels'} — 샘플은 페이지 캐시로만 공유되고 힙에 올리지 않음"""
+    samples_path, index_path, meta_path = waveform_paths(battery_id)
+    ensure_local(meta_path, samples_path, index_path)
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION:
+        raise ValueError(f"파형 저장소 버전이 맞지 않습니다: {meta_path} (version {meta.get('version')}). "
+                         "`python -m utils.waveform build RAW_DIR`로 다시 생성해주세요.")
+    index = np.load(index_path, allow_pickle=False)
+    if index.dtype != INDEX_DTYPE:
+        raise ValueError(f"지원하지 않는 파형 인덱스 형식입니다: {index_path} ({index.dtype})")
+    return {
+        'index': index,
+        'samples': np.load(samples_path, mmap_mode='r', allow_pickle=False),
+        'channels': tuple(meta['channels']),
+    }
+
+
+def stored_cycles(store):
+    return store['index']['cycle']
+
+
+def load_cycle(battery_id, cycle):
+    """사이클 하나의 {채널: 배열} (인덱스 이진 탐색 + memmap 구간 복사)"""
+    store = load_waveform_store(battery_id)
+    index = store['index']
+    pos = int(np.searchsorted(index['cycle'], cycle))
+    if pos >= len(index) or index['cycle'][pos] != cycle:
+        raise KeyError(f"{battery_id}: cycle {cycle}의 파형이 없습니다.")
+
+    start, length = int(index['start'][pos]), int(index['length'][pos])
+    with span("waveform.cycle", bytes=length * store['samples'].shape[1] * store['samples'].itemsize, rows=length):
+        block = np.array(store['samples'][start:start + length])
+    return {name: block[:, i] for i, name in enumerate(store['channels'])}
+
+
+def reference_cycle(score_index, store):
+    """비교 기준 정상 사이클 — 파형이 있는 사이클 중 이상 점수가 가장 낮은 사이클
+
+    점수 사이클과 파형 사이클이 하나도 겹치지 않으면(번호 체계가 다르면) None.
+    """
+    ranked = score_index['cycles'][score_index['order']]
+    present = np.isin(ranked, stored_cycles(store))
+    return int(ranked[np.argmax(present)]) if present.any() else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사이클별 원시 방전 파형 저장소")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help=".mat 원시 데이터에서 파형 저장소 생성")
+    build.add_argument('raw_dir', help="{battery}.mat 파일 디렉토리")
+    build.add_argument('--out', help="dataset 디렉토리 (기본: 대시보드 dataset/)")
+    build.add_argument('--workers', type=int, default=WAVEFORM_MAX_WORKERS)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = build_all(args.raw_dir, args.out, args.workers)
+    for battery_id, n_cycles, n_samples in results:
+        print(f"{battery_id}: {n_cycles}개 방전 사이클, {n_samples:,}개 샘플")
+    print(f"{len(results)}개 배터리 처리 ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()